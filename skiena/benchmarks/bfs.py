@@ -0,0 +1,38 @@
+"""BFS on a large sparse graph with Graph and CSRGraph
+run from the skiena directory: python -m benchmarks.bfs"""
+import argparse
+import random
+import time
+
+from graph import Vertex, Edge, Graph, CSRGraph
+
+
+def random_edges(vertices, nb_edges, seed=0):
+    rand = random.Random(seed)
+    nb_vertices = len(vertices)
+    # a path makes the graph connected, then random edges are added
+    edges = [Edge(head=vertices[i], tail=vertices[i + 1]) for i in range(nb_vertices - 1)]
+    for i in range(nb_edges - len(edges)):
+        edges.append(Edge(head=vertices[rand.randrange(nb_vertices)],
+                          tail=vertices[rand.randrange(nb_vertices)]))
+    return edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--edges', type=int, default=300000)
+    args = parser.parse_args()
+
+    vertices = [Vertex() for i in range(args.vertices)]
+    edges = random_edges(vertices, args.edges)
+    print(f'n={args.vertices} m={args.edges} (undirected)')
+    for graph_class in (Graph, CSRGraph):
+        graph = graph_class(vertices=vertices, edges=edges, directed=False)
+        start = time.perf_counter()
+        graph.bfs(start=vertices[0])
+        print(f'{graph_class.__name__:10} bfs {time.perf_counter() - start:8.3f} s')
+
+
+if __name__ == '__main__':
+    main()
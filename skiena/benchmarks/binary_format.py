@@ -0,0 +1,42 @@
+"""startup time: CSRGraph.load with and without mmap vs building from edges
+run from the skiena directory: python -m benchmarks.binary_format"""
+import argparse
+import os
+import tempfile
+
+from graph import Vertex, Edge, CSRGraph
+
+from .builder import edge_stream
+from .csr_graph import measure_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--edges', type=int, default=1000000)
+    args = parser.parse_args()
+    n, m = args.vertices, args.edges
+
+    vertices = [Vertex() for i in range(n)]
+    edges = [Edge(head=vertices[u], tail=vertices[v], weight=w) for u, v, w in edge_stream(n, m)]
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=False)
+    print(f'n={n} m={m} (undirected, weighted)')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'graph.bin')
+        print(f'{"save":36} {measure_time(lambda: graph.save(path)):8.3f} s')
+        print(f'file size: {os.path.getsize(path) / 2 ** 20:.1f} MiB')
+        for name, load in (
+                ('CSRGraph(vertices, edges)', lambda: CSRGraph(vertices=vertices, edges=edges)),
+                ('CSRGraph.load(use_mmap=False)', lambda: CSRGraph.load(path, use_mmap=False)),
+                ('CSRGraph.load(use_mmap=True)', lambda: CSRGraph.load(path, use_mmap=True)),
+                ('CSRGraph.load(mmap, vertices)', lambda: CSRGraph.load(path, vertices=vertices))):
+            print(f'{name:36} {measure_time(load):8.3f} s')
+        loaded = CSRGraph.load(path)
+        for name, bfs in (('bfs on arrays', lambda: graph.bfs(start=vertices[0], materialize=False)),
+                          ('bfs on mmap', lambda: loaded.bfs(start=loaded.vertex(0), materialize=False))):
+            print(f'{name:36} {measure_time(bfs):8.3f} s')
+        del loaded
+
+
+if __name__ == '__main__':
+    main()
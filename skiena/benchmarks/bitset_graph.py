@@ -0,0 +1,61 @@
+"""BitsetGraph vs CSRGraph on a dense random graph: memory, BFS and
+neighbour intersection
+run from the skiena directory: python -m benchmarks.bitset_graph"""
+import argparse
+import random
+import tracemalloc
+from array import array
+
+from graph import GraphBuilder
+
+from .csr_graph import measure_time
+
+
+def dense_builder(nb_vertices, density, seed=0) -> GraphBuilder:
+    rand = random.Random(seed)
+    builder = GraphBuilder(directed=False)
+    for key in range(nb_vertices):
+        builder.add_vertex(key)
+    heads, tails = array('i'), array('i')
+    for head in range(nb_vertices):
+        for tail in range(head + 1, nb_vertices):
+            if rand.random() < density:
+                heads.append(head)
+                tails.append(tail)
+    builder.extend(heads=heads, tails=tails)
+    return builder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=3000)
+    parser.add_argument('--density', type=float, default=0.25)
+    parser.add_argument('--pairs', type=int, default=20000)
+    args = parser.parse_args()
+    n = args.vertices
+    rand = random.Random(1)
+    pairs = [(rand.randrange(n), rand.randrange(n)) for i in range(args.pairs)]
+    print(f'n={n} density={args.density} (undirected)')
+    print(f'{"":10} {"MiB":>8} {"bfs s":>8} {"intersections s":>16}')
+    for implementation in ('csr', 'bitset'):
+        builder = dense_builder(n, args.density)
+        tracemalloc.start()
+        graph = builder.build(implementation=implementation)
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = graph.vertex(0)
+        bfs = measure_time(lambda: graph.bfs(start=start, materialize=False))
+        if implementation == 'csr':
+            offsets, targets = graph.offsets, graph.targets
+            neighbours = [set(targets[offsets[i]:offsets[i + 1]]) for i in range(n)]
+            intersections = measure_time(lambda: [len(neighbours[u] & neighbours[v]) for u, v in pairs])
+            del neighbours
+        else:
+            rows = graph.rows
+            intersections = measure_time(lambda: [(rows[u] & rows[v]).bit_count() for u, v in pairs])
+        print(f'{implementation:10} {allocated / 2 ** 20:8.1f} {bfs:8.3f} {intersections:16.3f}')
+        del graph
+
+
+if __name__ == '__main__':
+    main()
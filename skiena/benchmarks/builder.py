@@ -0,0 +1,57 @@
+"""peak and final memory: GraphBuilder vs building from Vertex/Edge lists
+run from the skiena directory: python -m benchmarks.builder"""
+import argparse
+import random
+import tracemalloc
+
+from graph import Vertex, Edge, Graph, CSRGraph, GraphBuilder
+
+
+def edge_stream(nb_vertices, nb_edges, seed=0):
+    rand = random.Random(seed)
+    for i in range(nb_edges):
+        yield rand.randrange(nb_vertices), rand.randrange(nb_vertices), rand.random()
+
+
+def from_lists(graph_class, nb_vertices, nb_edges):
+    vertices = [Vertex() for i in range(nb_vertices)]
+    edges = [Edge(head=vertices[u], tail=vertices[v], weight=w)
+             for u, v, w in edge_stream(nb_vertices, nb_edges)]
+    return graph_class(vertices=vertices, edges=edges, directed=False)
+
+
+def from_builder(implementation, nb_vertices, nb_edges):
+    builder = GraphBuilder(directed=False)
+    builder.add_edges(edge_stream(nb_vertices, nb_edges))
+    return builder.build(implementation=implementation)
+
+
+def measure(build) -> (int, int):
+    """returns the peak and final bytes allocated by build"""
+    tracemalloc.start()
+    graph = build()
+    final, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+    return peak, final
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--edges', type=int, default=1000000)
+    args = parser.parse_args()
+    n, m = args.vertices, args.edges
+    print(f'n={n} m={m} (undirected, weighted) - bytes per edge')
+    print(f'{"":36} {"peak":>8} {"final":>8}')
+    for name, build in (
+            ('lists -> Graph', lambda: from_lists(Graph, n, m)),
+            ('lists -> CSRGraph', lambda: from_lists(CSRGraph, n, m)),
+            ('GraphBuilder -> CSRGraph', lambda: from_builder('csr', n, m)),
+            ('GraphBuilder -> Graph', lambda: from_builder('adjacency_list', n, m))):
+        peak, final = measure(build)
+        print(f'{name:36} {peak / m:8.1f} {final / m:8.1f}')
+
+
+if __name__ == '__main__':
+    main()
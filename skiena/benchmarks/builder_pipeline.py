@@ -0,0 +1,43 @@
+"""GraphBuilder on an edge feed with parallel edges and self-loops: raw
+build vs the sort, reduce and self-loop drop pipeline, then one BFS
+run from the skiena directory: python -m benchmarks.builder_pipeline"""
+import argparse
+import random
+
+from graph import GraphBuilder
+
+from .csr_graph import measure_time
+
+
+def noisy_stream(nb_vertices, nb_edges, seed=0):
+    """each edge comes about 3 times, with about 1% of self-loops"""
+    rand = random.Random(seed)
+    for i in range(nb_edges):
+        u = rand.randrange(nb_vertices)
+        v = u if rand.random() < 0.01 else (u * 7919 + rand.randrange(nb_edges // (3 * nb_vertices) + 1)) % nb_vertices
+        yield u, v, rand.random()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=50000)
+    parser.add_argument('--edges', type=int, default=500000)
+    args = parser.parse_args()
+    edges = list(noisy_stream(args.vertices, args.edges))
+    print(f'n={args.vertices} m={args.edges} (directed, weighted)')
+    print(f'{"":22} {"implementation":>15} {"build s":>8} {"edgenodes":>10} {"bfs s":>8}')
+    for name, options in (('raw', {}), ('min-reduced', dict(deduplicate=True, reducer=min, drop_self_loops=True))):
+        for implementation in ('csr', 'adjacency_list'):
+            def build():
+                builder = GraphBuilder(directed=True, **options)
+                builder.add_edges(edges)
+                return builder.build(implementation=implementation)
+
+            elapsed = measure_time(build, repeat=1)
+            graph = build()
+            bfs = measure_time(lambda: graph.bfs(start=graph.vertex(0), materialize=False))
+            print(f'{name:22} {implementation:>15} {elapsed:8.3f} {graph.nb_edges:10} {bfs:8.3f}')
+
+
+if __name__ == '__main__':
+    main()
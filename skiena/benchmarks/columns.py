@@ -0,0 +1,46 @@
+"""edge attributes read and updated through the edgenodes vs through the
+columns of Graph.edge_columns()
+run from the skiena directory: python -m benchmarks.columns"""
+import argparse
+
+from graph import Graph
+from graph.minimum_spanning_tree import run_kruskal_algorithm
+
+from .builder import from_lists
+from .csr_graph import measure_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=20000)
+    parser.add_argument('--edges', type=int, default=100000)
+    args = parser.parse_args()
+    graph = from_lists(Graph, args.vertices, args.edges)
+    adjacency_lists = graph.adjacency_lists
+    print(f'n={args.vertices} m={args.edges} (undirected)')
+
+    def sum_edgenodes():
+        return sum(e.weight for v in adjacency_lists for e in adjacency_lists[v].edgenodes)
+
+    def scale_edgenodes():
+        for v in adjacency_lists:
+            for e in adjacency_lists[v].edgenodes:
+                # the mates share the edge: each edge is scaled twice
+                e.weight *= 1.0
+
+    columns = graph.edge_columns()
+    print(f'{"":26} {"edgenodes s":>12} {"columns s":>10}')
+    rows = (
+        ('sum of the weights', sum_edgenodes, lambda: sum(columns['weight'])),
+        ('scale the weights', scale_edgenodes, lambda: columns.scale('weight', 1.0)),
+    )
+    for name, edgenodes, column in rows:
+        print(f'{name:26} {measure_time(edgenodes):12.3f} {measure_time(column):10.3f}')
+    # the cost of the copies, paid once by algorithms reading fresh weights
+    load_store = measure_time(lambda: (columns.load('weight'), columns.store('weight')))
+    print(f'{"load + store the weights":26} {"":12} {load_store:10.3f}')
+    print(f'{"kruskal":26} {"":12} {measure_time(lambda: run_kruskal_algorithm(graph=graph)):10.3f}')
+
+
+if __name__ == '__main__':
+    main()
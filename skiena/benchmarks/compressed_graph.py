@@ -0,0 +1,65 @@
+"""CompressedGraph vs CSRGraph and Graph: adjacency bytes and BFS time, on a
+random graph and on a grid, before and after RCM reordering
+run from the skiena directory: python -m benchmarks.compressed_graph"""
+import argparse
+
+from graph import Graph, GraphBuilder, CompressedGraph
+from graph.reordering import reorder
+
+from .builder import edge_stream
+from .csr_graph import measure_time
+
+
+def grid_edges(side):
+    for row in range(side):
+        for column in range(side):
+            if column + 1 < side:
+                yield row * side + column, row * side + column + 1
+            if row + 1 < side:
+                yield row * side + column, (row + 1) * side + column
+
+
+def build(edges, implementation):
+    builder = GraphBuilder(directed=False)
+    builder.add_edges(edges)
+    return builder.build(implementation=implementation)
+
+
+def csr_bytes(graph) -> int:
+    return sum(values.itemsize * len(values) for values in (graph.offsets, graph.targets))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--edges', type=int, default=500000)
+    parser.add_argument('--side', type=int, default=300)
+    args = parser.parse_args()
+    # the edges of the streams are weighted: edges without weights are
+    # compared, as a CompressedGraph keeps none
+    graphs = (
+        (f'random n={args.vertices} m={args.edges}',
+         lambda: ((u, v) for u, v, w in edge_stream(args.vertices, args.edges))),
+        (f'grid {args.side}x{args.side}', lambda: grid_edges(args.side)),
+    )
+    for name, edges in graphs:
+        print(name)
+        print(f'{"":22} {"bytes/edgenode":>15} {"bfs s":>8}')
+        csr_graph = build(edges(), 'csr')
+        # a shuffled order, as vertices are numbered in the order the edges come in
+        for label, graph in (('Graph', None),
+                             ('CSRGraph', csr_graph),
+                             ('CompressedGraph', CompressedGraph.from_graph(csr_graph)),
+                             ('CompressedGraph rcm', reorder(CompressedGraph.from_graph(csr_graph))[0])):
+            if graph is None:
+                size = Graph.estimate_memory(csr_graph.nb_vertices, csr_graph.nb_edges // 2)['total']
+                print(f'{label:22} {size / csr_graph.nb_edges:15.1f} {"":>8}')
+                continue
+            size = csr_bytes(graph) if label == 'CSRGraph' else graph.nb_bytes
+            start = graph.vertex(0)
+            bfs = measure_time(lambda: graph.bfs(start=start, materialize=False))
+            print(f'{label:22} {size / graph.nb_edges:15.2f} {bfs:8.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Graph vs CSRGraph: memory per edge and traversal times
+run from the skiena directory: python -m benchmarks.csr_graph"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from graph import Vertex, Edge, Graph, CSRGraph
+from graph.shortest_path import run_dijkstra_algorithm
+
+
+def random_edges(vertices, nb_edges, seed=0):
+    rand = random.Random(seed)
+    nb_vertices = len(vertices)
+    return [Edge(head=vertices[rand.randrange(nb_vertices)],
+                 tail=vertices[rand.randrange(nb_vertices)],
+                 weight=rand.random())
+            for i in range(nb_edges)]
+
+
+def measure_memory(graph_class, vertices, edges) -> (object, int):
+    """returns the graph and the bytes allocated to build it"""
+    tracemalloc.start()
+    graph = graph_class(vertices=vertices, edges=edges, directed=False)
+    allocated, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graph, allocated
+
+
+def measure_time(function, repeat=3) -> float:
+    """returns the best time out of repeat runs"""
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=5000)
+    parser.add_argument('--edges', type=int, default=50000)
+    args = parser.parse_args()
+
+    vertices = [Vertex() for i in range(args.vertices)]
+    edges = random_edges(vertices, args.edges)
+    print(f'n={args.vertices} m={args.edges} (undirected)')
+    print(f'{"":10} {"bytes/edge":>12} {"bfs (s)":>10} {"dijkstra (s)":>14}')
+    for graph_class in (Graph, CSRGraph):
+        graph, allocated = measure_memory(graph_class, vertices, edges)
+        bfs_time = measure_time(lambda: graph.bfs(start=vertices[0]))
+        dijkstra_time = measure_time(lambda: run_dijkstra_algorithm(graph=graph, source=vertices[0]),
+                                     repeat=1)
+        print(f'{graph_class.__name__:10} {allocated / args.edges:12.1f} '
+              f'{bfs_time:10.3f} {dijkstra_time:14.3f}')
+
+
+if __name__ == '__main__':
+    main()
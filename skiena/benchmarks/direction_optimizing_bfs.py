@@ -0,0 +1,52 @@
+"""queue-based BFS vs direction-optimizing BFS on power-law graphs
+run from the skiena directory: python -m benchmarks.direction_optimizing_bfs"""
+import argparse
+import random
+
+from graph import Vertex, Edge, Graph, CSRGraph
+
+from .csr_graph import measure_time
+
+
+def power_law_edges(vertices, degree, seed=0):
+    """Barabasi-Albert preferential attachment: each new vertex is linked
+    to degree vertices picked with a probability proportional to their degree"""
+    rand = random.Random(seed)
+    edges = []
+    # each vertex appears once per edge end: picking uniformly in it is picking by degree
+    endpoints = list(vertices[:degree])
+    for vertex in vertices[degree:]:
+        tails = {rand.choice(endpoints) for i in range(degree)}
+        for tail in tails:
+            edges.append(Edge(head=vertex, tail=tail))
+            endpoints.extend((vertex, tail))
+    return edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--degree', type=int, default=8)
+    args = parser.parse_args()
+
+    vertices = [Vertex() for i in range(args.vertices)]
+    edges = power_law_edges(vertices, args.degree)
+    print(f'n={args.vertices} m={len(edges)} (undirected, power-law)')
+    graph = Graph(vertices=vertices, edges=edges, directed=False)
+    csr_graph = CSRGraph.from_graph(graph)
+    csr_graph.reverse_arrays()  # built once, not timed
+    start = vertices[-1]
+    timings = [
+        ('Graph.bfs (doubly linked list queue)',
+         lambda: graph.bfs(start=start, materialize=False)),
+        ('CSRGraph.bfs (array queue)',
+         lambda: csr_graph.bfs(start=start, materialize=False)),
+        ('CSRGraph.direction_optimizing_bfs',
+         lambda: csr_graph.direction_optimizing_bfs(start=start)),
+    ]
+    for name, function in timings:
+        print(f'{name:40} {measure_time(function):8.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""read_dimacs vs a per-line loader building Vertex/Edge lists
+run from the skiena directory: python -m benchmarks.formats"""
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+from graph import Vertex, Edge, CSRGraph
+from graph.formats import read_dimacs, write_dimacs
+
+from .builder import edge_stream
+from .csr_graph import measure_time
+
+
+def read_per_line(path):
+    with open(path) as f:
+        for line in f:
+            tokens = line.split()
+            if tokens[0] == 'p':
+                vertices = [Vertex() for i in range(int(tokens[2]))]
+                edges = []
+            elif tokens[0] == 'a':
+                edges.append(Edge(head=vertices[int(tokens[1]) - 1],
+                                  tail=vertices[int(tokens[2]) - 1],
+                                  weight=float(tokens[3])))
+    return CSRGraph(vertices=vertices, edges=edges, directed=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--edges', type=int, default=1000000)
+    args = parser.parse_args()
+    n, m = args.vertices, args.edges
+    vertices = [Vertex() for i in range(n)]
+    graph = CSRGraph(vertices=vertices, directed=True,
+                     edges=[Edge(head=vertices[u], tail=vertices[v], weight=int(100 * w))
+                            for u, v, w in edge_stream(n, m)])
+    print(f'n={n} m={m} (DIMACS sp)')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'graph.gr')
+        print(f'{"write_dimacs":24} {measure_time(lambda: write_dimacs(path, graph), repeat=1):8.3f} s')
+        for name, read in (('per-line Vertex/Edge', lambda: read_per_line(path)),
+                           ('read_dimacs', lambda: read_dimacs(path))):
+            elapsed = measure_time(read, repeat=1)
+            tracemalloc.start()
+            read()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f'{name:24} {elapsed:8.3f} s  peak {peak / m:6.1f} bytes per edge')
+
+
+if __name__ == '__main__':
+    main()
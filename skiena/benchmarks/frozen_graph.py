@@ -0,0 +1,36 @@
+"""cost of handing a graph to a worker process: pickling the Graph vs
+attaching to a FrozenGraph in shared memory, then one BFS on each
+run from the skiena directory: python -m benchmarks.frozen_graph"""
+import argparse
+import pickle
+
+from graph import Graph, FrozenGraph
+
+from .builder import from_lists
+from .csr_graph import measure_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=20000)
+    parser.add_argument('--edges', type=int, default=100000)
+    args = parser.parse_args()
+    graph = from_lists(Graph, args.vertices, args.edges)
+    print(f'n={args.vertices} m={args.edges} (undirected)')
+    data = pickle.dumps(graph)
+    print(f'{"":22} {"bytes sent":>12} {"set-up s":>10} {"bfs s":>8}')
+    loaded = pickle.loads(data)
+    bfs = measure_time(lambda: loaded.bfs(start=loaded.vertex(0), materialize=False))
+    print(f'{"pickled Graph":22} {len(data):12} {measure_time(lambda: pickle.loads(data), repeat=1):10.3f} {bfs:8.3f}')
+    freeze = measure_time(lambda: FrozenGraph.freeze(graph).close(), repeat=1)
+    with FrozenGraph.freeze(graph) as frozen:
+        spec = pickle.dumps(frozen.spec)
+        attach = measure_time(lambda: FrozenGraph.attach(pickle.loads(spec)).close())
+        with FrozenGraph.attach(pickle.loads(spec)) as attached:
+            bfs = measure_time(lambda: attached.bfs(start=attached.vertex(0), materialize=False))
+        print(f'{"attached FrozenGraph":22} {len(spec):12} {attach:10.3f} {bfs:8.3f}')
+    print(f'freeze, once: {freeze:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
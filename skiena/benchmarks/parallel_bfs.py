@@ -0,0 +1,33 @@
+"""CSRGraph.bfs vs ParallelBFS for 1 to 8 processes on a power-law graph
+run from the skiena directory: python -m benchmarks.parallel_bfs"""
+import argparse
+
+from graph import Vertex, CSRGraph
+from graph.parallel import ParallelBFS
+
+from .csr_graph import measure_time
+from .direction_optimizing_bfs import power_law_edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=200000)
+    parser.add_argument('--degree', type=int, default=8)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    vertices = [Vertex() for i in range(args.vertices)]
+    edges = power_law_edges(vertices, args.degree)
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=False)
+    print(f'n={args.vertices} m={graph.nb_edges} (power-law, edge count per direction)')
+    start = vertices[-1]
+    reference = measure_time(lambda: graph.bfs(start=start, materialize=False))
+    print(f'{"CSRGraph.bfs":24} {reference:8.3f} s')
+    for processes in args.processes:
+        with ParallelBFS(graph=graph, processes=processes) as bfs:
+            elapsed = measure_time(lambda: bfs.run(start=start))
+        print(f'{f"ParallelBFS({processes})":24} {elapsed:8.3f} s  speedup {reference / elapsed:5.2f}')
+
+
+if __name__ == '__main__':
+    main()
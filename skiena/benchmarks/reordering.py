@@ -0,0 +1,58 @@
+"""BFS and Dijkstra on a grid whose vertex ids are shuffled, before and
+after reordering
+run from the skiena directory: python -m benchmarks.reordering"""
+import argparse
+import random
+
+from graph import Vertex, Edge, Graph, CSRGraph
+from graph.reordering import reorder
+from graph.shortest_path import run_dijkstra_algorithm
+
+from .csr_graph import measure_time
+
+
+def shuffled_grid(side, seed=0):
+    """side x side grid with random weights, vertices in random order"""
+    rand = random.Random(seed)
+    vertices = [Vertex() for i in range(side * side)]
+    edges = []
+    for row in range(side):
+        for column in range(side):
+            vertex = vertices[row * side + column]
+            if column + 1 < side:
+                edges.append(Edge(vertex, vertices[row * side + column + 1], weight=rand.random()))
+            if row + 1 < side:
+                edges.append(Edge(vertex, vertices[(row + 1) * side + column], weight=rand.random()))
+    shuffled = list(vertices)
+    rand.shuffle(shuffled)
+    return shuffled, edges
+
+
+def bandwidth(graph) -> int:
+    return max(abs(graph.vertex_id(v) - graph.vertex_id(e.tail))
+               for v in graph.adjacency_lists for e in graph.adjacency_lists[v].edgenodes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    # the heap of run_dijkstra_algorithm holds at most 10000 items
+    parser.add_argument('--side', type=int, default=90)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    vertices, edges = shuffled_grid(args.side)
+    print(f'{args.side}x{args.side} grid, {len(vertices)} vertices, {len(edges)} edges')
+    print(f'{"":22} {"bandwidth":>10} {"bfs s":>8} {"dijkstra s":>11}')
+    for graph_class in (CSRGraph, Graph):
+        graph = graph_class(vertices=vertices, edges=edges, directed=False)
+        for method in (None, 'rcm', 'degree', 'bfs'):
+            reordered = reorder(graph, method=method)[0] if method is not None else graph
+            start = vertices[0]
+            bfs = measure_time(lambda: reordered.bfs(start=start, materialize=False), repeat=args.repeat)
+            dijkstra = measure_time(lambda: run_dijkstra_algorithm(graph=reordered, source=start),
+                                    repeat=args.repeat)
+            name = f'{graph_class.__name__} {method or "shuffled"}'
+            print(f'{name:22} {bandwidth(reordered):10} {bfs:8.4f} {dijkstra:11.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""bytes per vertex and per edge with and without a GraphSchema
+run from the skiena directory: python -m benchmarks.schema_memory"""
+import argparse
+import random
+import tracemalloc
+
+from graph import Vertex, Edge, Graph, GraphSchema
+
+
+def allocated_bytes(function) -> (object, int):
+    """returns the result of function and the bytes it allocated"""
+    tracemalloc.start()
+    result = function()
+    allocated, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, allocated
+
+
+def measure(vertex_class, edge_class, nb_vertices, nb_edges, schema=None) -> (float, float, float):
+    """returns bytes per vertex, per edge and per edge in adjacency lists"""
+    rand = random.Random(0)
+    vertices, vertices_bytes = allocated_bytes(
+        lambda: [vertex_class() for i in range(nb_vertices)])
+    pairs = [(rand.randrange(nb_vertices), rand.randrange(nb_vertices)) for i in range(nb_edges)]
+    edges, edges_bytes = allocated_bytes(
+        lambda: [edge_class(vertices[i], vertices[j], weight=1.0) for i, j in pairs])
+    graph, graph_bytes = allocated_bytes(
+        lambda: Graph(vertices=vertices, edges=edges, directed=False, schema=schema))
+    return vertices_bytes / nb_vertices, edges_bytes / nb_edges, graph_bytes / nb_edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=20000)
+    parser.add_argument('--edges', type=int, default=100000)
+    args = parser.parse_args()
+
+    schema = GraphSchema(edge_attributes=['weight'])
+    print(f'n={args.vertices} m={args.edges} (undirected, one weight per edge)')
+    print(f'{"":10} {"vertex":>8} {"edge":>8} {"graph/edge":>11}')
+    for name, vertex_class, edge_class, graph_schema in (
+            ('dict', Vertex, Edge, None),
+            ('schema', schema.Vertex, schema.Edge, schema)):
+        vertex_bytes, edge_bytes, graph_bytes = measure(vertex_class, edge_class,
+                                                        args.vertices, args.edges,
+                                                        schema=graph_schema)
+        print(f'{name:10} {vertex_bytes:8.1f} {edge_bytes:8.1f} {graph_bytes:11.1f}')
+
+
+if __name__ == '__main__':
+    main()
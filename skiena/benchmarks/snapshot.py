@@ -0,0 +1,41 @@
+"""Graph.snapshot and the copies made by the following writes vs a full
+copy of the graph
+run from the skiena directory: python -m benchmarks.snapshot"""
+import argparse
+import pickle
+import random
+
+from graph import Graph, Edge
+
+from .builder import from_lists
+from .csr_graph import measure_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=20000)
+    parser.add_argument('--edges', type=int, default=100000)
+    parser.add_argument('--writes', type=int, default=100)
+    args = parser.parse_args()
+    graph = from_lists(Graph, args.vertices, args.edges)
+    vertices = list(graph.adjacency_lists)
+    rand = random.Random(0)
+    print(f'n={args.vertices} m={args.edges} (undirected), {args.writes} writes')
+
+    def write():
+        for i in range(args.writes):
+            graph.add_edge(Edge(rand.choice(vertices), rand.choice(vertices), weight=1.0))
+
+    def snapshot_and_write():
+        graph.snapshot()
+        write()
+
+    print(f'{"snapshot":26} {measure_time(graph.snapshot):8.6f} s')
+    print(f'{"snapshot + writes":26} {measure_time(snapshot_and_write):8.6f} s')
+    print(f'{"writes":26} {measure_time(write):8.6f} s')
+    full_copy = measure_time(lambda: pickle.loads(pickle.dumps(graph)), repeat=1)
+    print(f'{"full copy (pickle)":26} {full_copy:8.6f} s')
+
+
+if __name__ == '__main__':
+    main()
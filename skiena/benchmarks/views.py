@@ -0,0 +1,37 @@
+"""BFS on a SubgraphView vs on the subgraph materialized first, for an
+induced subgraph and for an edge predicate
+run from the skiena directory: python -m benchmarks.views"""
+import argparse
+
+from graph import Graph
+
+from .builder import from_lists
+from .csr_graph import measure_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vertices', type=int, default=20000)
+    parser.add_argument('--edges', type=int, default=100000)
+    args = parser.parse_args()
+    graph = from_lists(Graph, args.vertices, args.edges)
+    print(f'n={args.vertices} m={args.edges} (undirected)')
+    views = (
+        ('induced, half the vertices', dict(vertex_ids=range(0, args.vertices, 2))),
+        ('weight < 0.5', dict(is_edge_processable=lambda head, edgenode: edgenode.weight < 0.5)),
+    )
+    print(f'{"":28} {"view + bfs s":>13} {"materialize + bfs s":>20}')
+    for name, kwargs in views:
+        def on_view():
+            view = graph.view(**kwargs)
+            view.bfs(start=view.vertex(0), materialize=False)
+
+        def on_materialized():
+            subgraph = graph.view(**kwargs).materialize()
+            subgraph.bfs(start=subgraph.vertex(0), materialize=False)
+
+        print(f'{name:28} {measure_time(on_view):13.3f} {measure_time(on_materialized, repeat=1):20.3f}')
+
+
+if __name__ == '__main__':
+    main()
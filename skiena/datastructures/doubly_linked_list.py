@@ -1,5 +1,7 @@
 class DoublyLinkedListNode:
     """doubly linked list node"""
+    __slots__ = ('item', 'previous', 'next')
+
     def __init__(self, item, previous=None, next=None):
         self.item = item
         self.previous = previous
@@ -22,6 +24,21 @@ class DoublyLinkedList:
     def tail(self):
         return self._nil.previous
 
+    def __getstate__(self):
+        """pickled as a flat list: pickling the chained nodes recurses once per node"""
+        return [item for item in self]
+
+    def __setstate__(self, items):
+        self.__init__()
+        for item in reversed(items):
+            self.insert(item)
+
+    def __iter__(self):
+        node = self.head
+        while node is not self._nil:
+            yield node.item
+            node = node.next
+
     def search(self, item) -> DoublyLinkedListNode:
         """search in O(n)"""
         node = self.head
@@ -31,17 +48,24 @@ class DoublyLinkedList:
             node = node.next
         raise FileNotFoundError
 
-    def insert(self, item):
-        """insert in O(1)"""
+    def insert(self, item) -> DoublyLinkedListNode:
+        """insert in O(1) - returns the node, to delete it in O(1)"""
         item_node = DoublyLinkedListNode(item=item)
         item_node.next = self._nil.next
         item_node.next.previous = item_node
         self._nil.next = item_node
         item_node.previous = self._nil
+        return item_node
 
     def delete(self, item):
         """delete in O(n)"""
-        item_node = self.search(item)
+        self.delete_node(self.search(item))
+
+    def delete_node(self, item_node: DoublyLinkedListNode):
+        """delete in O(1) given the node of the item
+        the node is unlinked: deleting it again raises a ValueError"""
+        if item_node.next is None:
+            raise ValueError('Node already deleted')
         item_node.previous.next = item_node.next
         item_node.next.previous = item_node.previous
-        del item_node
+        item_node.previous = item_node.next = None
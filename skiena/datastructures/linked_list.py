@@ -1,5 +1,7 @@
 class LinkedListNode:
     """linked list node"""
+    __slots__ = ('item', 'next')
+
     def __init__(self, item, next=None):
         self.item = item
         self.next = next
@@ -17,6 +19,20 @@ class LinkedList:
     def head(self):
         return self._nil.next
 
+    def __getstate__(self):
+        """pickled as a flat list: pickling the chained nodes recurses once per node"""
+        items = []
+        node = self.head
+        while node is not self._nil:
+            items.append(node.item)
+            node = node.next
+        return items
+
+    def __setstate__(self, items):
+        self.__init__()
+        for item in reversed(items):
+            self.insert(item)
+
     def __iter__(self):
         node = self.head
         while node.item is not None:
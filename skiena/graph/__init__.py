@@ -1,2 +1,7 @@
-from .graph import Vertex, Edge, Graph
+from .graph import Vertex, Edge, Graph, GraphSchema
+from .csr_graph import CSRGraph
+from .bitset_graph import BitsetGraph
+from .compressed_graph import CompressedGraph
+from .frozen import FrozenGraph
+from .builder import GraphBuilder
 from .exceptions import *
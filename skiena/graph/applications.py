@@ -2,53 +2,39 @@ from typing import Sequence, List
 
 from datastructures import Stack, StackEmptyError
 
-from .graph import Graph, NodeList, Vertex, Edgenode, EdgeType
+from .graph import Graph, NodeList, Vertex, Edgenode, EdgeType, SubgraphView
+from .traversal import EventType
 from .exceptions import *
 
 
-def find_connected_components(graph: Graph) -> Sequence[Graph]:
-    """BFS: finds connected components for undirected graph"""
+def find_connected_components(graph: Graph) -> Sequence[SubgraphView]:
+    """BFS: finds connected components for undirected graph
+    components are views on graph: call materialize() to get standalone graphs"""
     connected_components = []
-    vertices = [v for v in graph.adjacency_lists]
-    processed_vertices = NodeList(vertices, default=False)
-
-    def process_vertex_late(vertex: Vertex):
-        nonlocal processed_vertices
-        processed_vertices[vertex] = True
-
-    for v in vertices:
-        if not processed_vertices[v]:
-            connected_component = graph.bfs(start=v,
-                                            process_vertex_late=process_vertex_late)
-            connected_components.append(connected_component)
+    processed_vertices = bytearray(graph.nb_vertices)
+
+    for v in graph.adjacency_lists:
+        if not processed_vertices[graph.vertex_id(v)]:
+            traversal = graph.bfs(start=v, materialize=False)
+            for vertex_id in traversal.order:
+                processed_vertices[vertex_id] = True
+            connected_components.append(traversal.subgraph)
     return connected_components
 
 
 def find_cycles(graph: Graph) -> Graph:
     """DFS: returns first cycle found if any for undirected graph"""
-    vertices = [v for v in graph.adjacency_lists]
-
-    class CycleFound(Exception):
-        def __init__(self, start, end, *args, **kwargs):
-            Exception.__init__(self, *args, **kwargs)
-            self.start = start
-            self.end = end
-
-    def process_edge(head: Vertex, edgenode: Edgenode):
-        nonlocal graph
-        # check if there is a parent-child relationship
-        tail = edgenode.tail
-        if not ((graph.parent_edges[tail]
-                 and graph.parent_edges[tail].head is head)
-                or (graph.parent_edges[head]
-                    and graph.parent_edges[head].head is tail)):
-            raise CycleFound(start=tail, end=head)
-
-    for v in vertices:
-        try:
-            graph.dfs(start=v, process_edge=process_edge)
-        except CycleFound as e:
-            return graph.find_path(start=e.start, end=e.end)
+    # a single traversal keeps track of the discovered vertices
+    traversal = graph.traversal()
+    for v in graph.adjacency_lists:
+        if traversal.discovered[graph.vertex_id(v)]:
+            continue
+        for event in graph.iter_dfs(start=v, traversal=traversal):
+            # an edge back to an ancestor other than the parent closes a cycle
+            if event.eventtype is EventType.BACK_EDGE:
+                head, tail = event.vertex, event.edgenode.tail
+                if traversal.parent(head) is not tail:
+                    return graph.find_path(start=tail, end=head, traversal=traversal)
     return None
 
 
@@ -61,32 +47,26 @@ def topological_sort(graph: Graph) -> List[Vertex]:
     vertices = [v for v in graph.adjacency_lists]
 
     stack = Stack(implementation='linked_list')
-    discovered_vertices = NodeList(vertices, default=False)
-    processed_vertices = NodeList(vertices, default=False)
+    # a single traversal keeps track of the discovered/processed vertices
+    traversal = graph.traversal()
     sorted_vertices = []
 
-    def process_vertex_early(vertex: Vertex):
-        nonlocal discovered_vertices
-        discovered_vertices[vertex] = True
-
     def process_vertex_late(vertex: Vertex):
-        nonlocal stack, processed_vertices
-        processed_vertices[vertex] = True
+        nonlocal stack
         stack.push(vertex)
 
     def process_edge(head: Vertex, edgenode: Edgenode):
         # check that the edge is not a back edge
-        if edgenode.edgetype is EdgeType.BACK:
+        if traversal.edgetype is EdgeType.BACK:
             raise CycleInGraphError
 
     for v in vertices:
-        if not discovered_vertices[v]:
+        if not traversal.discovered[graph.vertex_id(v)]:
             graph.dfs(start=v,
-                      process_vertex_early=process_vertex_early,
                       process_vertex_late=process_vertex_late,
                       process_edge=process_edge,
-                      discovered_vertices=discovered_vertices,
-                      processed_vertices=processed_vertices)
+                      traversal=traversal,
+                      materialize=False)
 
     while True:
         try:
@@ -103,15 +83,16 @@ def find_strongly_connected_components(graph: Graph) -> List[List[Vertex]]:
         raise GraphDirectionTypeError
 
     vertices = [v for v in graph.adjacency_lists]
-    sscs = NodeList(vertices, default=None)
+    sscs = NodeList(graph.adjacency_lists, default=None)
     # leaders are the list of the oldest vertices to be known to be
     # in the same SSC than each vertex
-    leaders = NodeList(vertices, default=None)
+    leaders = NodeList(graph.adjacency_lists, default=None)
     for v in leaders:
         leaders[v] = v
 
-    discovered_vertices = NodeList(vertices, default=False)
-    processed_vertices = NodeList(vertices, default=False)
+    # a single traversal keeps track of the discovered/processed vertices
+    # and of the entry times, across DFS calls
+    traversal = graph.traversal()
 
     stack = Stack(implementation='linked_list')
 
@@ -134,10 +115,9 @@ def find_strongly_connected_components(graph: Graph) -> List[List[Vertex]]:
                 if v is vertex:
                     break
                 sscs[v] = sscs_found
-        parent_edge = graph.parent_edges[vertex]
-        if parent_edge:
-            parent = parent_edge.head
-            if leaders[vertex].entry_time < leaders[parent].entry_time:
+        parent = traversal.parent(vertex)
+        if parent is not None:
+            if traversal.entry_time(leaders[vertex]) < traversal.entry_time(leaders[parent]):
                 leaders[parent] = leaders[vertex]
 
     def process_edge(head: Vertex, edgenode: Edgenode):
@@ -145,28 +125,28 @@ def find_strongly_connected_components(graph: Graph) -> List[List[Vertex]]:
         tail = edgenode.tail
         # forward edges do not contribute to SSC
         # a back edge makes a SSC
-        if edgenode.edgetype is EdgeType.BACK:
+        if traversal.edgetype is EdgeType.BACK:
             # tail is in the same SSC than head
             # check if it is older than currrent leaders[head]
-            if tail.entry_time < leaders[head].entry_time:
+            if traversal.entry_time(tail) < traversal.entry_time(leaders[head]):
                 leaders[head] = tail
         # for cross edges:
         # - either there is already a fully-formed SSC found
         # then it means it is one-way only
         # - or 
-        elif edgenode.edgetype is EdgeType.CROSS:
+        elif traversal.edgetype is EdgeType.CROSS:
             if sscs[tail] is None:  # SSC not assigned yet
-                if tail.entry_time < leaders[head].entry_time:
+                if traversal.entry_time(tail) < traversal.entry_time(leaders[head]):
                     leaders[head] = tail
 
     for v in vertices:
-        if not discovered_vertices[v]:
+        if not traversal.discovered[graph.vertex_id(v)]:
             graph.dfs(start=v,
                       process_vertex_early=process_vertex_early,
                       process_vertex_late=process_vertex_late,
                       process_edge=process_edge,
-                      discovered_vertices=discovered_vertices,
-                      processed_vertices=processed_vertices)
+                      traversal=traversal,
+                      materialize=False)
 
     ssc_list = [[] for i in range(sscs_found)]
     for v in sscs:
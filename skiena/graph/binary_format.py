@@ -0,0 +1,91 @@
+"""binary CSR file format
+- header: magic, format version, flags, nb of vertices, nb of edges
+- offsets: nb_vertices + 1 int64
+- targets: nb_edges int32, padded to a multiple of 8 bytes
+- weights: nb_edges float64, if any
+arrays are stored in native byte order: they can be memory-mapped as is"""
+import mmap
+import struct
+import sys
+from array import array
+from typing import Sequence
+
+MAGIC = b'SKGR'
+VERSION = 1
+HEADER = struct.Struct('<4sIIQQ4x')  # 32 bytes: the arrays are 8-byte aligned
+DIRECTED, WEIGHTED, BIG_ENDIAN = 1, 2, 4
+
+
+def _padding(nbytes: int) -> int:
+    return -nbytes % 8
+
+
+def write_arrays(path: str,
+                 offsets: Sequence[int],
+                 targets: Sequence[int],
+                 weights: Sequence[float]=None,
+                 directed: bool=False):
+    """O(n + m) - arrays are written in bulk, with no per-item conversion
+    when they already are arrays of the right typecode"""
+    offsets, targets = _typed('q', offsets), _typed('i', targets)
+    flags = DIRECTED * directed | WEIGHTED * (weights is not None) | BIG_ENDIAN * (sys.byteorder == 'big')
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, len(offsets) - 1, len(targets)))
+        offsets.tofile(f)
+        targets.tofile(f)
+        f.write(bytes(_padding(len(targets) * targets.itemsize)))
+        if weights is not None:
+            _typed('d', weights).tofile(f)
+
+
+def _typed(typecode: str, values: Sequence) -> array:
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    typed = array(typecode)
+    if isinstance(values, memoryview) and values.format == typecode:
+        # e.g. the arrays of a memory-mapped graph: copied in bulk
+        typed.frombytes(values)
+    else:
+        typed.extend(values)
+    return typed
+
+
+def read_arrays(path: str, use_mmap: bool=True) -> (dict, Sequence[int], Sequence[int], Sequence[float]):
+    """returns the header as a dict, and the offsets, targets and weights
+    - use_mmap=True: O(1), the arrays are read-only memoryviews on the mapped
+    file, loaded on demand and shared with the other processes mapping it
+    - use_mmap=False: O(n + m), the arrays are read into arrays
+    files written with the other byte order are read and swapped, never mapped"""
+    with open(path, 'rb') as f:
+        magic, version, flags, nb_vertices, nb_edges = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a binary graph file')
+        if version != VERSION:
+            raise ValueError(f'Unsupported binary graph format version {version}')
+        header = {'nb_vertices': nb_vertices,
+                  'nb_edges': nb_edges,
+                  'directed': bool(flags & DIRECTED)}
+        swapped = bool(flags & BIG_ENDIAN) != (sys.byteorder == 'big')
+        sections = [('q', nb_vertices + 1), ('i', nb_edges)]
+        if flags & WEIGHTED:
+            sections.append(('d', nb_edges))
+        if use_mmap and not swapped:
+            # the mapping stays open as long as the views on it are referenced
+            buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            arrays, position = [], HEADER.size
+            for typecode, length in sections:
+                nbytes = length * array(typecode).itemsize
+                arrays.append(buffer[position:position + nbytes].cast(typecode))
+                position += nbytes + _padding(nbytes)
+        else:
+            arrays = []
+            for typecode, length in sections:
+                values = array(typecode)
+                values.fromfile(f, length)
+                if swapped:
+                    values.byteswap()
+                arrays.append(values)
+                f.read(_padding(length * values.itemsize))
+    offsets, targets = arrays[0], arrays[1]
+    weights = arrays[2] if len(arrays) > 2 else None
+    return header, offsets, targets, weights
@@ -0,0 +1,281 @@
+from array import array
+from typing import Sequence, Callable, Any, Hashable, Iterator, List
+
+from .graph import Vertex, Edge, SubgraphView, _key_ids
+from .csr_graph import CSREdgenode
+from .traversal import Traversal
+
+# int.bit_count is Python 3.10+
+_bit_count = getattr(int, 'bit_count', None) or (lambda bits: bin(bits).count('1'))
+
+
+def _bit_indices(bits: int) -> Iterator[int]:
+    """indices of the set bits in increasing order - the bits are scanned
+    as a string in C, not shifted one at a time"""
+    digits = bin(bits)[:1:-1]  # digit i is bit i
+    index = digits.find('1')
+    while index >= 0:
+        yield index
+        index = digits.find('1', index + 1)
+
+
+def _rows(nb_vertices: int, heads: Sequence[int], tails: Sequence[int], directed: bool) -> List[int]:
+    """rows of the edges heads[i] -> tails[i] in O(n² / 8 + m): the bits
+    are set in bytearrays, then each row is turned into an int once"""
+    nb_bytes = (nb_vertices + 7) // 8
+    bitmaps = [bytearray(nb_bytes) for i in range(nb_vertices)]
+    for head, tail in zip(heads, tails):
+        bitmaps[head][tail >> 3] |= 1 << (tail & 7)
+        if not directed:
+            bitmaps[tail][head >> 3] |= 1 << (head & 7)
+    return [int.from_bytes(bitmap, 'little') for bitmap in bitmaps]
+
+
+class BitsetAdjacencyList:
+    """view on the row of one vertex"""
+    __slots__ = ('head', '_graph', '_index')
+
+    def __init__(self, graph, index: int):
+        self.head = graph._vertices[index]
+        self._graph = graph
+        self._index = index
+
+    @property
+    def degree(self) -> int:
+        return _bit_count(self._graph.rows[self._index])
+
+    @property
+    def edgenodes(self):
+        vertices = self._graph._vertices
+        for index in _bit_indices(self._graph.rows[self._index]):
+            yield CSREdgenode(tail=vertices[index])
+
+
+class BitsetNodeList:
+    """vertex -> adjacency list view"""
+    def __init__(self, graph):
+        self._graph = graph
+
+    @property
+    def indices(self) -> dict:
+        return self._graph._indices
+
+    @property
+    def vertices(self) -> Sequence[Vertex]:
+        return self._graph._vertices
+
+    def __getitem__(self, key: Vertex) -> BitsetAdjacencyList:
+        return BitsetAdjacencyList(graph=self._graph, index=self._graph._indices[key])
+
+    def __contains__(self, key: Vertex) -> bool:
+        return key in self._graph._indices
+
+    def __iter__(self):
+        for v in self._graph._vertices:
+            yield v
+
+    def __len__(self) -> int:
+        return self._graph.nb_vertices
+
+
+class BitsetParentEdges:
+    """vertex -> parent edge view on the parents array of a traversal"""
+    def __init__(self, graph, parents: array=None):
+        self._graph = graph
+        self.parents = parents if parents is not None else array('q', [-1]) * graph.nb_vertices
+
+    def __getitem__(self, key: Vertex) -> Edge:
+        parent = self.parents[self._graph._indices[key]]
+        if parent < 0:
+            return None
+        return CSREdgenode(tail=key).to_edge(head=self._graph._vertices[parent])
+
+    def __contains__(self, key: Vertex) -> bool:
+        return key in self._graph._indices
+
+    def __iter__(self):
+        for v in self._graph._vertices:
+            yield v
+
+
+class BitsetTraversal(Traversal):
+    """the parent edgenodes are built from the parents"""
+    def parent_edgenode(self, vertex) -> CSREdgenode:
+        return CSREdgenode(tail=vertex) if self.parents[self.graph.vertex_id(vertex)] >= 0 else None
+
+
+class BitsetGraph:
+    """adjacency matrix stored as packed bitsets, for dense graphs
+    the row of the vertex of id i is an int whose bit j is set if there is
+    an edge from i to j: bitwise operations on rows run word by word in C
+    - n² / 8 bytes whatever the nb of edges: smaller than adjacency lists
+    beyond a density of about 1 / (8 * bytes per edgenode)
+    - only the structure is kept: no edge attributes, parallel edges merge
+    - adjacency_lists build one edgenode per access, there is no dfs"""
+    def __init__(self,
+                 vertices: Sequence[Vertex],
+                 edges: Sequence[Edge],
+                 directed: bool=False,
+                 keys: Sequence[Hashable]=None):
+        vertices = list(vertices)
+        indices = {v: i for i, v in enumerate(vertices)}
+        rows = _rows(len(vertices),
+                     heads=[indices[edge.head] for edge in edges],
+                     tails=[indices[edge.tail] for edge in edges],
+                     directed=directed)
+        self._initialize(vertices, rows, directed, indices)
+        self.key_ids = _key_ids(keys, self.nb_vertices)
+
+    @classmethod
+    def from_rows(cls,
+                  vertices: Sequence[Vertex],
+                  rows: Sequence[int],
+                  directed: bool=False,
+                  keys: Sequence[Hashable]=None):
+        """O(n) - rows are given as ints, e.g. computed by thresholding a
+        similarity matrix; undirected graphs need symmetric rows"""
+        graph = cls.__new__(cls)
+        vertices = list(vertices)
+        if len(rows) != len(vertices):
+            raise ValueError(f'{len(rows)} rows given for {len(vertices)} vertices')
+        if any(row >> len(vertices) for row in rows):
+            raise ValueError('Bit beyond the last vertex')
+        graph._initialize(vertices, list(rows), directed)
+        graph.key_ids = _key_ids(keys, graph.nb_vertices)
+        return graph
+
+    @classmethod
+    def from_graph(cls, graph):
+        """convert a graph in O(n + m)"""
+        vertices = list(graph.adjacency_lists)
+        indices = {v: i for i, v in enumerate(vertices)}
+        heads, tails = array('i'), array('i')
+        for head, vertex in enumerate(vertices):
+            for edgenode in graph.adjacency_lists[vertex].edgenodes:
+                heads.append(head)
+                tails.append(indices[edgenode.tail])
+        graph_copy = cls.__new__(cls)
+        # undirected edges are listed from both ends already
+        graph_copy._initialize(vertices, _rows(len(vertices), heads, tails, directed=True),
+                               graph.directed, indices)
+        graph_copy.key_ids = dict(graph.key_ids)
+        return graph_copy
+
+    def _initialize(self, vertices, rows, directed, indices=None):
+        self._vertices = vertices
+        self._indices = indices if indices is not None else {v: i for i, v in enumerate(vertices)}
+        self.rows = rows
+        self.nb_vertices = len(vertices)
+        self.directed = directed
+        self.adjacency_lists = BitsetNodeList(graph=self)
+        self.parent_edges = BitsetParentEdges(graph=self)
+
+    @property
+    def nb_edges(self) -> int:
+        """O(n² / 64) - undirected edges count twice, but self-loops once"""
+        return sum(_bit_count(row) for row in self.rows)
+
+    def vertex_id(self, vertex: Vertex) -> int:
+        """O(1)"""
+        return self._indices[vertex]
+
+    def vertex(self, vertex_id: int) -> Vertex:
+        """O(1)"""
+        return self._vertices[vertex_id]
+
+    def key_id(self, key: Hashable) -> int:
+        """O(1) - id of the vertex of given external key"""
+        return self.key_ids[key]
+
+    def has_edge(self, head: Vertex, tail: Vertex) -> bool:
+        """O(1)"""
+        return bool(self.rows[self._indices[head]] >> self._indices[tail] & 1)
+
+    def degree(self, vertex: Vertex) -> int:
+        """O(n / 64) - out-degree if directed"""
+        return _bit_count(self.rows[self._indices[vertex]])
+
+    def common_neighbours(self, vertex: Vertex, other_vertex: Vertex) -> List[Vertex]:
+        """O(n / 64 + nb of common neighbours)"""
+        common = self.rows[self._indices[vertex]] & self.rows[self._indices[other_vertex]]
+        return [self._vertices[i] for i in _bit_indices(common)]
+
+    def nb_common_neighbours(self, vertex: Vertex, other_vertex: Vertex) -> int:
+        """O(n / 64) - a single AND and popcount"""
+        return _bit_count(self.rows[self._indices[vertex]] & self.rows[self._indices[other_vertex]])
+
+    def _subgraph(self, indices: Sequence[int]):
+        """graph induced by the vertices of given indices"""
+        rows = self.rows
+        if len(indices) == self.nb_vertices and all(i == index for i, index in enumerate(indices)):
+            sub_rows = list(rows)
+        else:
+            new_indices = array('q', [-1]) * self.nb_vertices
+            for new_index, index in enumerate(indices):
+                new_indices[index] = new_index
+            mask = bytearray((self.nb_vertices + 7) // 8)
+            for index in indices:
+                mask[index >> 3] |= 1 << (index & 7)
+            mask = int.from_bytes(mask, 'little')
+            heads, tails = array('i'), array('i')
+            for new_index, index in enumerate(indices):
+                for tail in _bit_indices(rows[index] & mask):
+                    heads.append(new_index)
+                    tails.append(new_indices[tail])
+            sub_rows = _rows(len(indices), heads, tails, directed=True)
+        return BitsetGraph.from_rows(vertices=[self._vertices[i] for i in indices],
+                                     rows=sub_rows,
+                                     directed=self.directed)
+
+    def view(self, vertex_ids: Sequence[int]=None, is_edge_processable: Callable[[Vertex, Any], bool]=None):
+        """O(1), O(k) given k vertex ids - see SubgraphView"""
+        return SubgraphView(graph=self, vertex_ids=vertex_ids, is_edge_processable=is_edge_processable)
+
+    def traversal(self, start: Vertex=None) -> BitsetTraversal:
+        """a new per-call traversal context on this graph"""
+        return BitsetTraversal(graph=self, start=start)
+
+    def bfs(self,
+            start: Vertex,
+            process_vertex_early: Callable[[Vertex], Any]=None,
+            process_vertex_late: Callable[[Vertex], Any]=None,
+            materialize: bool=True):
+        """word-parallel Breadth-First Search in O(n² / 64)
+        each vertex of the frontier claims its undiscovered neighbours at
+        once: the AND of its row with the undiscovered vertices
+        - a dense graph is traversed without scanning its edges one by one,
+        so there are no edge callbacks
+        - returns the subgraph of processed vertices, or the traversal with
+        materialize=False, as CSRGraph.bfs"""
+        vertices, rows = self._vertices, self.rows
+        traversal = self.traversal(start=start)
+        visited, discovered, parents, order = (traversal.visited, traversal.discovered,
+                                               traversal.parents, traversal.order)
+        if materialize:
+            # the view shares the parents of the traversal
+            self.parent_edges = BitsetParentEdges(graph=self, parents=parents)
+
+        start_index = self._indices[start]
+        undiscovered = ((1 << self.nb_vertices) - 1) ^ (1 << start_index)
+        discovered[start_index] = True
+        order.append(start_index)
+        first = 0
+        while first < len(order):
+            index = order[first]
+            first += 1
+            visited[index] = 1
+            vertex = vertices[index]
+            if process_vertex_early is not None:
+                process_vertex_early(vertex)
+            claimed = rows[index] & undiscovered
+            if claimed:
+                undiscovered ^= claimed
+                for next_index in _bit_indices(claimed):
+                    discovered[next_index] = True
+                    parents[next_index] = index
+                    order.append(next_index)
+            if process_vertex_late is not None:
+                process_vertex_late(vertex)
+        if not materialize:
+            return traversal
+        return self._subgraph(sorted(order))
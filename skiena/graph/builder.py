@@ -0,0 +1,213 @@
+from array import array
+from itertools import islice
+from math import nan
+from typing import Iterable, Hashable, Callable
+
+from sorting import countsort_order
+
+from .graph import Vertex, Edge, Graph
+from .csr_graph import CSRGraph
+from .bitset_graph import BitsetGraph, _rows
+from .compressed_graph import CompressedGraph
+
+
+def _compress(nb_vertices: int, heads: array, tails: array, weights: array, directed: bool):
+    """counting sort of the edges by head in O(n + m)
+    returns the CSR arrays (offsets, targets, weights) - undirected edges
+    are stored in both directions"""
+    offsets = array('q', [0]) * (nb_vertices + 1)
+    for head in heads:
+        offsets[head + 1] += 1
+    if not directed:
+        for tail in tails:
+            offsets[tail + 1] += 1
+    for i in range(nb_vertices):
+        offsets[i + 1] += offsets[i]
+    nb_edges = offsets[nb_vertices]
+    targets = array('i', [0]) * nb_edges
+    target_weights = array('d', [nan]) * nb_edges if weights is not None else None
+    next_positions = offsets[:-1]
+    for i in range(len(heads)):
+        head, tail = heads[i], tails[i]
+        for start, end in ((head, tail), (tail, head)) if not directed else ((head, tail),):
+            position = next_positions[start]
+            targets[position] = end
+            if weights is not None:
+                target_weights[position] = weights[i]
+            next_positions[start] += 1
+    return offsets, targets, target_weights
+
+
+def _grouped_offsets(nb_vertices: int, heads: array) -> array:
+    """offsets of the edges already sorted by head, in O(n + m)"""
+    offsets = array('q', [0]) * (nb_vertices + 1)
+    for head in heads:
+        offsets[head + 1] += 1
+    for i in range(nb_vertices):
+        offsets[i + 1] += offsets[i]
+    return offsets
+
+
+class GraphBuilder:
+    """builds a graph from a stream of (u, v) or (u, v, weight) tuples
+    u and v are vertex keys: a vertex is created for each new key, and
+    the graph is given the keys (graph.key_id(key))
+    - the edges are consumed chunk_size at a time, and kept in typed arrays
+    of 16 bytes per edge until build()
+    - with deduplicate=True, parallel edges are collapsed into one: the
+    first one, or one whose weight is reduced from theirs, e.g.
+    reducer=min for shortest paths, reducer=operator.add to sum capacities
+    - edges without weight are left out of the reduction
+    - with drop_self_loops=True, the edges from a vertex to itself are dropped"""
+    def __init__(self,
+                 directed: bool=False,
+                 deduplicate: bool=False,
+                 chunk_size: int=8192,
+                 vertex_factory: Callable[[], Vertex]=Vertex,
+                 reducer: Callable[[float, float], float]=None,
+                 drop_self_loops: bool=False):
+        self.directed = directed
+        self.deduplicate = deduplicate
+        self.reducer = reducer
+        self.drop_self_loops = drop_self_loops
+        self.chunk_size = chunk_size
+        self.vertex_factory = vertex_factory
+        self._reset()
+
+    def _reset(self):
+        self.vertices = []
+        self.keys = []
+        self._ids = {}
+        self._heads = array('i')
+        self._tails = array('i')
+        self._weights = None  # allocated at the first weight
+
+    @property
+    def nb_edges(self) -> int:
+        return len(self._heads)
+
+    def add_vertex(self, key: Hashable) -> int:
+        """O(1) - returns the id of the vertex of given key, created if new"""
+        vertex_id = self._ids.get(key)
+        if vertex_id is None:
+            vertex_id = self._ids[key] = len(self.vertices)
+            self.vertices.append(self.vertex_factory())
+            self.keys.append(key)
+        return vertex_id
+
+    def add_edges(self, edges: Iterable[tuple]):
+        """consumes the edges chunk by chunk: at most chunk_size tuples
+        are held at once"""
+        edges = iter(edges)
+        while True:
+            chunk = list(islice(edges, self.chunk_size))
+            if not chunk:
+                break
+            self._add_chunk(chunk)
+
+    def _add_chunk(self, chunk: list):
+        add_vertex, heads, tails = self.add_vertex, self._heads, self._tails
+        for edge in chunk:
+            weight = edge[2] if len(edge) > 2 else None
+            if weight is not None and self._weights is None:
+                self._weights = array('d', [nan]) * len(heads)
+            heads.append(add_vertex(edge[0]))
+            tails.append(add_vertex(edge[1]))
+            if self._weights is not None:
+                self._weights.append(weight if weight is not None else nan)
+
+    def extend(self, heads: Iterable[int], tails: Iterable[int], weights: Iterable[float]=None):
+        """O(k) - adds k edges between the vertices of given ids (see add_vertex)
+        in bulk, with no tuple per edge"""
+        heads, tails = array('i', heads), array('i', tails)
+        if len(heads) != len(tails):
+            raise ValueError('heads and tails have different lengths')
+        if heads and (min(min(heads), min(tails)) < 0 or max(max(heads), max(tails)) >= len(self.vertices)):
+            raise ValueError('Unknown vertex id')
+        if weights is not None:
+            weights = array('d', weights)
+            if len(weights) != len(heads):
+                raise ValueError('heads and weights have different lengths')
+            if self._weights is None:
+                self._weights = array('d', [nan]) * len(self._heads)
+            self._weights.extend(weights)
+        elif self._weights is not None:
+            self._weights.extend(array('d', [nan]) * len(heads))
+        self._heads.extend(heads)
+        self._tails.extend(tails)
+
+    def _sort(self):
+        """sorts the edges by (head, tail) in O(n + m) - a radix sort of two
+        counting sort passes, by tail then by head - then collapses the runs
+        of parallel edges and drops the self-loops in one scan"""
+        heads, tails, weights = self._heads, self._tails, self._weights
+        if not self.directed:
+            # an undirected edge is the same in both directions
+            for i in range(len(heads)):
+                if heads[i] > tails[i]:
+                    heads[i], tails[i] = tails[i], heads[i]
+        nb_vertices = len(self.vertices)
+        order = countsort_order(heads, nb_vertices, positions=countsort_order(tails, nb_vertices))
+        self._heads = sorted_heads = array('i')
+        self._tails = sorted_tails = array('i')
+        self._weights = sorted_weights = array('d') if weights is not None else None
+        deduplicate, reducer, drop_self_loops = self.deduplicate, self.reducer, self.drop_self_loops
+        last_head = last_tail = -1
+        for i in order:
+            head, tail = heads[i], tails[i]
+            if drop_self_loops and head == tail:
+                continue
+            if deduplicate and head == last_head and tail == last_tail:
+                if reducer is not None and weights is not None and weights[i] == weights[i]:
+                    # nan means no weight
+                    weight = sorted_weights[-1]
+                    sorted_weights[-1] = reducer(weight, weights[i]) if weight == weight else weights[i]
+                continue
+            sorted_heads.append(head)
+            sorted_tails.append(tail)
+            if weights is not None:
+                sorted_weights.append(weights[i])
+            last_head, last_tail = head, tail
+
+    def build(self, implementation: str='csr'):
+        """O(n + m) - the builder is emptied
+        with deduplicate or drop_self_loops, the edges are sorted by (head,
+        tail) first, and are then stored in this order
+        implementation:
+        - 'csr': returns a CSRGraph, built from the arrays
+        - 'adjacency_list': returns a Graph, whose edges are added one at a time
+        - 'bitset': returns a BitsetGraph, for dense graphs - weights are dropped
+        - 'compressed': returns a CompressedGraph, read-only - weights are dropped"""
+        is_sorted = self.deduplicate or self.drop_self_loops
+        if is_sorted:
+            self._sort()
+        heads, tails, weights = self._heads, self._tails, self._weights
+        vertices, keys, directed = self.vertices, self.keys, self.directed
+        self._reset()
+        if implementation == 'csr':
+            if is_sorted and directed:
+                # grouped by head already: the tails are the targets
+                offsets, targets = _grouped_offsets(len(vertices), heads), tails
+            else:
+                offsets, targets, weights = _compress(len(vertices), heads, tails, weights, directed)
+            # the staging arrays are released before the graph is set up
+            del heads, tails
+            return CSRGraph.from_arrays(vertices=vertices, offsets=offsets, targets=targets,
+                                        weights=weights, directed=directed, keys=keys)
+        elif implementation == 'adjacency_list':
+            graph = Graph(vertices=vertices, edges=[], directed=directed, keys=keys)
+            for i in range(len(heads)):
+                weight = weights[i] if weights is not None else nan
+                graph.add_edge(Edge(head=vertices[heads[i]], tail=vertices[tails[i]],
+                                    weight=weight if weight == weight else None))  # nan means no weight
+            return graph
+        elif implementation == 'compressed':
+            offsets, targets, weights = _compress(len(vertices), heads, tails, None, directed)
+            del heads, tails
+            return CompressedGraph.from_arrays(vertices=vertices, offsets=offsets, targets=targets,
+                                               directed=directed, keys=keys)
+        elif implementation == 'bitset':
+            return BitsetGraph.from_rows(vertices=vertices, rows=_rows(len(vertices), heads, tails, directed),
+                                         directed=directed, keys=keys)
+        else:
+            raise ValueError(f'Unknown implementation {implementation}')
@@ -0,0 +1,107 @@
+from array import array
+from itertools import repeat
+from math import nan
+from operator import mul
+from typing import Sequence, Iterator
+
+
+def _value(item, name: str) -> float:
+    value = getattr(item, name, None)
+    return value if value is not None else nan
+
+
+class Columns:
+    """columnar copy of numeric attributes of items: one array('d') per
+    attribute name, whose value i is the attribute of items[i] - nan if
+    the item has none
+    - a column is read and updated in bulk, without touching the items
+    - load(name) gathers the column from the items, store(name) writes it
+    back: attribute writes on the items are only seen by the next load"""
+    def __init__(self, items: Sequence):
+        self.items = items
+        self._columns = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __getitem__(self, name: str) -> array:
+        """O(1) - the column is loaded at first access"""
+        column = self._columns.get(name)
+        return column if column is not None else self.load(name)
+
+    def __setitem__(self, name: str, values: Sequence[float]):
+        """O(k) - the column is replaced by the values, not stored"""
+        values = array('d', values)
+        if len(values) != len(self.items):
+            raise ValueError(f'{len(values)} values given for {len(self.items)} items')
+        self._set(name, values)
+
+    def _set(self, name: str, values: array):
+        # updated in place: the arrays already handed out see the values
+        column = self._columns.get(name)
+        if column is None:
+            self._columns[name] = values
+        else:
+            column[:] = values
+
+    def load(self, name: str) -> array:
+        """O(k) - gathers the column from the items"""
+        self._set(name, array('d', [_value(item, name) for item in self.items]))
+        return self._columns[name]
+
+    def store(self, name: str):
+        """O(k) - writes the column back on the items, but its nan values"""
+        for item, value in zip(self.items, self._columns[name]):
+            if value == value:
+                setattr(item, name, value)
+
+    def fill(self, name: str, value: float):
+        """O(k) in C - e.g. resets all the flows"""
+        self._set(name, array('d', [value]) * len(self.items))
+
+    def scale(self, name: str, factor: float):
+        """O(k) in C - multiplies the column by factor"""
+        self._set(name, array('d', map(mul, self[name], repeat(factor))))
+
+
+class EdgeColumns(Columns):
+    """columns of the edges of a graph, with the vertex ids of their ends
+    the edge i goes from the vertex of id heads[i] to the one of id
+    tails[i], both ways if the graph is undirected
+    items are the edgenodes holding the attributes: one per edge of an
+    undirected Graph, whose edgenodes share their edge, else one per edgenode"""
+    def __init__(self, items: Sequence, heads: array, tails: array, directed: bool):
+        Columns.__init__(self, items=items)
+        self.heads = heads
+        self.tails = tails
+        self.directed = directed
+
+    @classmethod
+    def from_graph(cls, graph):
+        """O(n + m) - on any graph with adjacency lists"""
+        indices = graph.adjacency_lists.indices
+        items, heads, tails = [], array('i'), array('i')
+        shared = set()
+        for vertex in graph.adjacency_lists:
+            head = indices[vertex]
+            for edgenode in graph.adjacency_lists[vertex].edgenodes:
+                edge = getattr(edgenode, 'edge', None)
+                if edge is not None and not graph.directed:
+                    if id(edge) in shared:
+                        continue
+                    shared.add(id(edge))
+                items.append(edgenode)
+                heads.append(head)
+                tails.append(indices[edgenode.tail])
+        return cls(items=items, heads=heads, tails=tails, directed=graph.directed)
+
+
+def edge_columns(graph) -> EdgeColumns:
+    """the columns cached by graph if it has some, else new ones"""
+    return graph.edge_columns() if hasattr(graph, 'edge_columns') else EdgeColumns.from_graph(graph)
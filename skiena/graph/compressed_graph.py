@@ -0,0 +1,354 @@
+from array import array
+from itertools import accumulate
+from typing import Sequence, Callable, Any, Hashable, List
+
+from .graph import Vertex, Edge, EdgeType, NodeList, SubgraphView, _key_ids, _vertex_flags, _edgetype
+from .csr_graph import CSRGraph, CSREdgenode
+from .bitset_graph import BitsetParentEdges, BitsetTraversal
+
+
+def _encode(data: bytearray, head: int, tails: List[int]):
+    """appends the sorted tails as varints: the first one as its zigzag
+    encoded distance to head, the next ones as gaps to the previous one"""
+    previous = head
+    for i, tail in enumerate(tails):
+        gap = tail - previous
+        if i == 0:
+            gap = gap << 1 if gap >= 0 else (-gap << 1) - 1  # zigzag
+        previous = tail
+        # 7 bits per byte, the high bit set on all but the last byte
+        while gap >= 0x80:
+            data.append(gap & 0x7f | 0x80)
+            gap >>= 7
+        data.append(gap)
+
+
+def _varints(chunk: bytes) -> List[int]:
+    values, value, shift = [], 0, 0
+    for byte in chunk:
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value, shift = 0, 0
+    return values
+
+
+def _decode(data: bytes, start: int, end: int, head: int) -> List[int]:
+    """tails encoded in data[start:end] by _encode"""
+    chunk = data[start:end]
+    if not chunk:
+        return []
+    # the gaps below 128 take one byte: if all do, the bytes are the gaps,
+    # which max checks in C
+    gaps = list(chunk) if max(chunk) < 0x80 else _varints(chunk)
+    first = gaps[0]
+    gaps[0] = head + (first >> 1 if not first & 1 else -((first + 1) >> 1))
+    return list(accumulate(gaps))
+
+
+class CompressedAdjacencyList:
+    """view on the edges leaving one vertex, decoded at each access"""
+    __slots__ = ('head', '_graph', '_index')
+
+    def __init__(self, graph, index: int):
+        self.head = graph._vertices[index]
+        self._graph = graph
+        self._index = index
+
+    @property
+    def degree(self) -> int:
+        return len(self._graph.neighbour_ids(self._index))
+
+    @property
+    def edgenodes(self):
+        vertices = self._graph._vertices
+        for index in self._graph.neighbour_ids(self._index):
+            yield CSREdgenode(tail=vertices[index])
+
+
+class CompressedNodeList:
+    """vertex -> adjacency list view"""
+    def __init__(self, graph):
+        self._graph = graph
+
+    @property
+    def indices(self) -> dict:
+        return self._graph._indices
+
+    @property
+    def vertices(self) -> Sequence[Vertex]:
+        return self._graph._vertices
+
+    def __getitem__(self, key: Vertex) -> CompressedAdjacencyList:
+        return CompressedAdjacencyList(graph=self._graph, index=self._graph._indices[key])
+
+    def __contains__(self, key: Vertex) -> bool:
+        return key in self._graph._indices
+
+    def __iter__(self):
+        for v in self._graph._vertices:
+            yield v
+
+    def __len__(self) -> int:
+        return self._graph.nb_vertices
+
+
+class CompressedGraph:
+    """read-only graph whose adjacency is gap-encoded in a single bytes buffer
+    the tails of the edges leaving the vertex of index i are sorted, then
+    stored as varints in data[offsets[i]:offsets[i+1]]: the first one as
+    its distance to i, the next ones as the gaps between consecutive tails
+    - about 1 to 2 bytes per edgenode when the neighbours have close ids
+    (see graph.reordering), against 4 for the targets of a CSRGraph
+    - the lists are decoded on the fly by bfs and dfs, one list per vertex
+    - only the structure is kept: no edge attributes
+    - as for BitsetGraph, parent edges and edgenodes are rebuilt from the
+    parents of the traversals"""
+    def __init__(self,
+                 vertices: Sequence[Vertex],
+                 edges: Sequence[Edge],
+                 directed: bool=False,
+                 keys: Sequence[Hashable]=None):
+        vertices = list(vertices)
+        indices = {v: i for i, v in enumerate(vertices)}
+        tails = [[] for v in vertices]
+        for edge in edges:
+            head, tail = indices[edge.head], indices[edge.tail]
+            tails[head].append(tail)
+            if not directed:
+                tails[tail].append(head)
+        self._initialize(vertices, *self._encode_lists(tails), directed, indices)
+        self.key_ids = _key_ids(keys, self.nb_vertices)
+
+    @classmethod
+    def from_arrays(cls,
+                    vertices: Sequence[Vertex],
+                    offsets: Sequence[int],
+                    targets: Sequence[int],
+                    directed: bool=False,
+                    keys: Sequence[Hashable]=None):
+        """encode the CSR arrays of a CSRGraph in O(n + m log(max degree))"""
+        graph = cls.__new__(cls)
+        vertices = list(vertices)
+        tails = [targets[offsets[i]:offsets[i + 1]] for i in range(len(vertices))]
+        graph._initialize(vertices, *cls._encode_lists(tails), directed)
+        graph.key_ids = _key_ids(keys, graph.nb_vertices)
+        return graph
+
+    @classmethod
+    def from_graph(cls, graph):
+        """convert a graph in O(n + m log(max degree))"""
+        if isinstance(graph, CSRGraph):
+            graph_copy = cls.from_arrays(vertices=graph.adjacency_lists.vertices, offsets=graph.offsets,
+                                         targets=graph.targets, directed=graph.directed)
+        else:
+            vertices = list(graph.adjacency_lists)
+            indices = {v: i for i, v in enumerate(vertices)}
+            tails = [[indices[edgenode.tail] for edgenode in graph.adjacency_lists[vertex].edgenodes]
+                     for vertex in vertices]
+            graph_copy = cls.__new__(cls)
+            graph_copy._initialize(vertices, *cls._encode_lists(tails), graph.directed, indices)
+        graph_copy.key_ids = dict(graph.key_ids)
+        return graph_copy
+
+    @staticmethod
+    def _encode_lists(tails: Sequence[Sequence[int]]) -> (bytes, array, int):
+        """returns data, offsets and the nb of edgenodes"""
+        data = bytearray()
+        offsets = array('q', [0])
+        for head, head_tails in enumerate(tails):
+            _encode(data, head, sorted(head_tails))
+            offsets.append(len(data))
+        if len(data) < 1 << 32:
+            offsets = array('I', offsets)  # 4 bytes per vertex instead of 8
+        return bytes(data), offsets, sum(len(head_tails) for head_tails in tails)
+
+    def _initialize(self, vertices, data, offsets, nb_edges, directed, indices=None):
+        self._vertices = vertices
+        self._indices = indices if indices is not None else {v: i for i, v in enumerate(vertices)}
+        self.data = data
+        self.offsets = offsets
+        self.nb_vertices = len(vertices)
+        self.nb_edges = nb_edges
+        self.directed = directed
+        self.adjacency_lists = CompressedNodeList(graph=self)
+        self.parent_edges = BitsetParentEdges(graph=self)
+
+    @property
+    def nb_bytes(self) -> int:
+        """size of the adjacency: data and offsets"""
+        return len(self.data) + self.offsets.itemsize * len(self.offsets)
+
+    def vertex_id(self, vertex: Vertex) -> int:
+        """O(1)"""
+        return self._indices[vertex]
+
+    def vertex(self, vertex_id: int) -> Vertex:
+        """O(1)"""
+        return self._vertices[vertex_id]
+
+    def key_id(self, key: Hashable) -> int:
+        """O(1) - id of the vertex of given external key"""
+        return self.key_ids[key]
+
+    def neighbour_ids(self, vertex_id: int) -> List[int]:
+        """O(degree) - sorted ids of the tails of the edges leaving the vertex"""
+        return _decode(self.data, self.offsets[vertex_id], self.offsets[vertex_id + 1], vertex_id)
+
+    def degree(self, vertex: Vertex) -> int:
+        """O(degree) - out-degree if directed"""
+        return self.adjacency_lists[vertex].degree
+
+    def _vertex_flags(self, vertex_flags: NodeList=None, default=None):
+        if vertex_flags is None and default is None:
+            return bytearray(self.nb_vertices)
+        return _vertex_flags(vertex_flags=vertex_flags, indices=self._indices,
+                             vertices=self._vertices, default=default)
+
+    def _subgraph(self, indices: Sequence[int]):
+        """graph induced by the vertices of given indices"""
+        new_indices = array('q', [-1]) * self.nb_vertices
+        for new_index, index in enumerate(indices):
+            new_indices[index] = new_index
+        tails = [[new_indices[tail] for tail in self.neighbour_ids(index) if new_indices[tail] >= 0]
+                 for index in indices]
+        graph = CompressedGraph.__new__(CompressedGraph)
+        graph._initialize([self._vertices[i] for i in indices], *self._encode_lists(tails), self.directed)
+        graph.key_ids = {}
+        return graph
+
+    def view(self, vertex_ids: Sequence[int]=None, is_edge_processable: Callable[[Vertex, Any], bool]=None):
+        """O(1), O(k) given k vertex ids - see SubgraphView"""
+        return SubgraphView(graph=self, vertex_ids=vertex_ids, is_edge_processable=is_edge_processable)
+
+    def traversal(self, start: Vertex=None) -> BitsetTraversal:
+        """a new per-call traversal context on this graph"""
+        return BitsetTraversal(graph=self, start=start)
+
+    def bfs(self,
+            start: Vertex,
+            process_vertex_early: Callable[[Vertex], Any]=None,
+            process_vertex_late: Callable[[Vertex], Any]=None,
+            process_edge: Callable[[Vertex, CSREdgenode], Any]=None,
+            discovered_vertices: NodeList=None,
+            processed_vertices: NodeList=None,
+            materialize: bool=True):
+        """Breadth-First Search, decoding the list of each processed vertex once
+        returns the subgraph of processed vertices, or the traversal with
+        materialize=False, as CSRGraph.bfs"""
+        vertices, data, offsets = self._vertices, self.data, self.offsets
+        directed = self.directed
+        traversal = self.traversal(start=start)
+        visited, parents = traversal.visited, traversal.parents
+        if materialize:
+            # the view shares the parents of the traversal
+            self.parent_edges = BitsetParentEdges(graph=self, parents=parents)
+        discovered = self._vertex_flags(discovered_vertices)
+        processed = self._vertex_flags(processed_vertices)
+
+        start_index = self._indices[start]
+        discovered[start_index] = True
+        queue = traversal.order
+        queue.append(start_index)
+        first = 0
+        while first < len(queue):
+            index = queue[first]
+            first += 1
+            processed[index] = True
+            visited[index] = 1
+            vertex = vertices[index]
+            if process_vertex_early is not None:
+                process_vertex_early(vertex)
+            for next_index in _decode(data, offsets[index], offsets[index + 1], index):
+                if process_edge is not None and (not processed[next_index] or directed):
+                    process_edge(vertex, CSREdgenode(tail=vertices[next_index]))
+                if not discovered[next_index]:
+                    discovered[next_index] = True
+                    parents[next_index] = index
+                    queue.append(next_index)
+            if process_vertex_late is not None:
+                process_vertex_late(vertex)
+        if not materialize:
+            return traversal
+        if processed_vertices is None:
+            return self._subgraph(sorted(queue))
+        return self._subgraph([i for i in range(self.nb_vertices) if processed[i]])
+
+    def dfs(self,
+            start: Vertex,
+            process_vertex_early: Callable[[Vertex], Any]=None,
+            process_vertex_late: Callable[[Vertex], Any]=None,
+            process_edge: Callable[[Vertex, CSREdgenode], Any]=None,
+            discovered_vertices: NodeList=None,
+            processed_vertices: NodeList=None,
+            traversal: BitsetTraversal=None,
+            materialize: bool=True) -> BitsetTraversal:
+        """Depth-First Search, as CSRGraph.dfs
+        the list of a vertex is decoded when the vertex is entered, and
+        dropped when it exits: at most one list per vertex of the stack is
+        held decoded"""
+        vertices, data, offsets = self._vertices, self.data, self.offsets
+        directed = self.directed
+        traversal = self.traversal(start=start) if traversal is None else traversal
+        parents, order = traversal.parents, traversal.order
+        entry_times, exit_times = traversal.entry_times, traversal.exit_times
+        if materialize:
+            self.parent_edges = BitsetParentEdges(graph=self, parents=parents)
+        discovered = self._vertex_flags(discovered_vertices, default=traversal.discovered)
+        processed = self._vertex_flags(processed_vertices, default=traversal.visited)
+        # decoded list and position of the next edge to explore of each vertex in the stack
+        tails, cursors = {}, {}
+
+        start_index = self._indices[start]
+        discovered[start_index] = True
+        traversal.discovered[start_index] = True
+        stack = [start_index]
+        while stack:
+            index = stack.pop()
+            vertex = vertices[index]
+            if entry_times[index] < 0:
+                entry_times[index] = traversal.time
+                if materialize:
+                    vertex.entry_time = traversal.time
+                traversal.time += 1
+                order.append(index)
+                tails[index] = _decode(data, offsets[index], offsets[index + 1], index)
+                cursors[index] = 0
+                if process_vertex_early is not None:
+                    process_vertex_early(vertex)
+            index_tails, position = tails[index], cursors[index]
+            while position < len(index_tails):
+                next_index = index_tails[position]
+                position += 1
+                if not discovered[next_index]:
+                    discovered[next_index] = True
+                    traversal.discovered[next_index] = True
+                    parents[next_index] = index
+                    if process_edge is not None:
+                        traversal.edgetype = EdgeType.TREE
+                        edgenode = CSREdgenode(tail=vertices[next_index])
+                        edgenode.edgetype = EdgeType.TREE
+                        process_edge(vertex, edgenode)
+                    cursors[index] = position
+                    stack.append(index)
+                    stack.append(next_index)
+                    break
+                elif not processed[next_index] or directed:
+                    if process_edge is not None:
+                        traversal.edgetype = _edgetype(entry_times, index, next_index, processed)
+                        edgenode = CSREdgenode(tail=vertices[next_index])
+                        edgenode.edgetype = traversal.edgetype
+                        process_edge(vertex, edgenode)
+            else:
+                del tails[index], cursors[index]
+                if process_vertex_late is not None:
+                    process_vertex_late(vertex)
+                processed[index] = True
+                traversal.visited[index] = 1
+                exit_times[index] = traversal.time
+                if materialize:
+                    vertex.exit_time = traversal.time
+                traversal.time += 1
+        return traversal
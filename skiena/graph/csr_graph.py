@@ -0,0 +1,675 @@
+from array import array
+from math import nan
+from typing import Sequence, Callable, Any, Hashable, Iterator
+
+from .graph import (Vertex, Edge, EdgeType, NodeList, SubgraphView, EDGE_EVENTS,
+                    _key_ids, _vertex_flags, _edgetype)
+from .traversal import Traversal, EventType, Event, Path, bidirectional_bfs
+from .exceptions import PathError
+from . import binary_format
+
+
+class CSREdgenode:
+    """edgenode built on the fly from the CSR arrays"""
+    __slots__ = ('tail', 'weight', 'edgetype')
+
+    def __init__(self, tail: Vertex, weight: float=None):
+        self.tail = tail
+        self.weight = weight
+        self.edgetype = None
+
+    def to_edge(self, head: Vertex) -> Edge:
+        return Edge(head=head,
+                    tail=self.tail,
+                    weight=self.weight,
+                    edgetype=self.edgetype,
+                    edgenode=self)
+
+
+class CSRAdjacencyList:
+    """view on the edges leaving one vertex"""
+    __slots__ = ('head', '_graph', '_index')
+
+    def __init__(self, graph, index: int):
+        self.head = graph._vertices[index]
+        self._graph = graph
+        self._index = index
+
+    @property
+    def degree(self) -> int:
+        offsets = self._graph.offsets
+        return offsets[self._index + 1] - offsets[self._index]
+
+    @property
+    def edgenodes(self):
+        graph = self._graph
+        for position in range(graph.offsets[self._index], graph.offsets[self._index + 1]):
+            yield graph._edgenode(position)
+
+
+class CSRNodeList:
+    """vertex -> adjacency list view"""
+    def __init__(self, graph):
+        self._graph = graph
+
+    @property
+    def indices(self) -> dict:
+        return self._graph._indices
+
+    @property
+    def vertices(self) -> Sequence[Vertex]:
+        return self._graph._vertices
+
+    def __getitem__(self, key: Vertex) -> CSRAdjacencyList:
+        return CSRAdjacencyList(graph=self._graph,
+                                index=self._graph._indices[key])
+
+    def __contains__(self, key: Vertex) -> bool:
+        return key in self._graph._indices
+
+    def __iter__(self):
+        for v in self._graph._vertices:
+            yield v
+
+    def __len__(self) -> int:
+        return self._graph.nb_vertices
+
+
+class CSRParentEdges:
+    """vertex -> parent edge view on the parent arrays of a traversal"""
+    def __init__(self, graph, parents: array=None, positions: array=None):
+        self._graph = graph
+        self.parents = parents if parents is not None else array('q', [-1]) * graph.nb_vertices
+        # position of the parent edge in the targets array
+        self.positions = positions if positions is not None else array('q', [-1]) * graph.nb_vertices
+
+    def __getitem__(self, key: Vertex) -> Edge:
+        index = self._graph._indices[key]
+        parent = self.parents[index]
+        if parent < 0:
+            return None
+        return self._graph._edgenode(self.positions[index]).to_edge(head=self._graph._vertices[parent])
+
+    def __contains__(self, key: Vertex) -> bool:
+        return key in self._graph._indices
+
+    def __iter__(self):
+        for v in self._graph._vertices:
+            yield v
+
+
+class CSRTraversal(Traversal):
+    """parent_edgenodes holds the positions of the parent edges in the
+    targets array: edgenodes are only built by parent_edgenode()"""
+    def __init__(self, graph, start=None):
+        Traversal.__init__(self, graph=graph, start=start)
+        self.parent_edgenodes = array('q', [-1]) * graph.nb_vertices
+
+    def parent_edgenode(self, vertex) -> CSREdgenode:
+        position = self.parent_edgenodes[self.graph.vertex_id(vertex)]
+        return self.graph._edgenode(position) if position >= 0 else None
+
+
+class CSRGraph:
+    """Compressed Sparse Row-based
+    vertex ids are the compact indices 0..n-1 used in the arrays
+    the edges leaving the vertex of index i are stored in
+    targets[offsets[i]:offsets[i+1]] and weights[offsets[i]:offsets[i+1]]
+    - only the weight attribute of the edges is kept
+    - bfs and dfs run on the arrays, but adjacency_lists and parent_edges
+    build one edgenode/edge per access: algorithms scanning edgenodes
+    (shortest paths, spanning trees) allocate one object per edge per scan"""
+    def __init__(self,
+                 vertices: Sequence[Vertex],
+                 edges: Sequence[Edge],
+                 directed: bool=False,
+                 keys: Sequence[Hashable]=None):
+        vertices = list(vertices)
+        indices = {v: i for i, v in enumerate(vertices)}
+        nb_vertices = len(vertices)
+        # count the edges leaving each vertex, then turn counts into offsets
+        offsets = array('q', [0]) * (nb_vertices + 1)
+        for edge in edges:
+            offsets[indices[edge.head] + 1] += 1
+            if not directed:
+                offsets[indices[edge.tail] + 1] += 1
+        for i in range(nb_vertices):
+            offsets[i + 1] += offsets[i]
+        # fill targets and weights in O(n + m)
+        nb_edges = offsets[nb_vertices]
+        has_weights = any(getattr(edge, 'weight', None) is not None for edge in edges)
+        targets = array('i', [0]) * nb_edges
+        weights = array('d', [nan]) * nb_edges if has_weights else None
+        next_positions = offsets[:-1]
+        for edge in edges:
+            head, tail = indices[edge.head], indices[edge.tail]
+            weight = getattr(edge, 'weight', None)
+            for start, end in ((head, tail), (tail, head)) if not directed else ((head, tail),):
+                position = next_positions[start]
+                targets[position] = end
+                if weight is not None:
+                    weights[position] = weight
+                next_positions[start] += 1
+        self._initialize(vertices, offsets, targets, weights, directed, indices)
+        self.key_ids = _key_ids(keys, nb_vertices)
+
+    @classmethod
+    def from_arrays(cls,
+                    vertices: Sequence[Vertex],
+                    offsets: Sequence[int],
+                    targets: Sequence[int],
+                    weights: Sequence[float]=None,
+                    directed: bool=False,
+                    keys: Sequence[Hashable]=None):
+        """build a graph from already compressed arrays in O(n)"""
+        graph = cls.__new__(cls)
+        graph._initialize(list(vertices), offsets, targets, weights, directed)
+        graph.key_ids = _key_ids(keys, graph.nb_vertices)
+        return graph
+
+    @classmethod
+    def from_graph(cls, graph):
+        """convert an adjacency list-based graph in O(n + m)"""
+        vertices = [v for v in graph.adjacency_lists]
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('d')
+        has_weights = False
+        indices = {v: i for i, v in enumerate(vertices)}
+        for vertex in vertices:
+            for edgenode in graph.adjacency_lists[vertex].edgenodes:
+                targets.append(indices[edgenode.tail])
+                weight = getattr(edgenode, 'weight', None)
+                has_weights = has_weights or weight is not None
+                weights.append(weight if weight is not None else nan)
+            offsets.append(len(targets))
+        graph_copy = cls.__new__(cls)
+        graph_copy._initialize(vertices, offsets, targets, weights if has_weights else None,
+                               graph.directed, indices)
+        graph_copy.key_ids = dict(graph.key_ids)
+        return graph_copy
+
+    @classmethod
+    def load(cls,
+             path: str,
+             use_mmap: bool=True,
+             vertices: Sequence[Vertex]=None,
+             keys: Sequence[Hashable]=None):
+        """graph saved with save(): the arrays are not parsed
+        - use_mmap=True: the arrays are memoryviews on the memory-mapped file,
+        paged in on first access and shared by the processes loading it:
+        the cost left is the O(n) set-up of the vertices
+        - vertices: the vertices of ids 0..n-1, new Vertex() by default"""
+        header, offsets, targets, weights = binary_format.read_arrays(path, use_mmap=use_mmap)
+        if vertices is None:
+            vertices = [Vertex() for i in range(header['nb_vertices'])]
+        elif len(vertices) != header['nb_vertices']:
+            raise ValueError(f'{path} has {header["nb_vertices"]} vertices, {len(vertices)} given')
+        return cls.from_arrays(vertices=vertices, offsets=offsets, targets=targets,
+                               weights=weights, directed=header['directed'], keys=keys)
+
+    def save(self, path: str):
+        """O(n + m) - writes the arrays in the binary format of graph.binary_format
+        vertices and keys are not saved: pass them back to load if needed"""
+        binary_format.write_arrays(path, offsets=self.offsets, targets=self.targets,
+                                   weights=self.weights, directed=self.directed)
+
+    def _initialize(self, vertices, offsets, targets, weights, directed, indices=None):
+        self._vertices = vertices
+        self._indices = indices if indices is not None else {v: i for i, v in enumerate(vertices)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.nb_vertices = len(vertices)
+        self.nb_edges = len(targets)
+        self.directed = directed
+        self.adjacency_lists = CSRNodeList(graph=self)
+        self.parent_edges = CSRParentEdges(graph=self)
+        self._reverse = None
+
+    def vertex_id(self, vertex: Vertex) -> int:
+        """O(1)"""
+        return self._indices[vertex]
+
+    def vertex(self, vertex_id: int) -> Vertex:
+        """O(1)"""
+        return self._vertices[vertex_id]
+
+    def key_id(self, key: Hashable) -> int:
+        """O(1) - id of the vertex of given external key"""
+        return self.key_ids[key]
+
+    def reverse_arrays(self) -> (array, array, array):
+        """O(n + m) at first call, then cached - the graph is read-only
+        returns the CSR of the incoming edges (offsets, sources, positions):
+        the edges entering the vertex of index i come from
+        sources[offsets[i]:offsets[i+1]], and are stored in the targets
+        array at positions[offsets[i]:offsets[i+1]]"""
+        if self._reverse is None:
+            nb_vertices, targets = self.nb_vertices, self.targets
+            offsets = array('q', [0]) * (nb_vertices + 1)
+            for target in targets:
+                offsets[target + 1] += 1
+            for i in range(nb_vertices):
+                offsets[i + 1] += offsets[i]
+            sources = array('i', [0]) * self.nb_edges
+            positions = array('q', [0]) * self.nb_edges
+            next_positions = offsets[:-1]
+            for source in range(nb_vertices):
+                for position in range(self.offsets[source], self.offsets[source + 1]):
+                    target = targets[position]
+                    sources[next_positions[target]] = source
+                    positions[next_positions[target]] = position
+                    next_positions[target] += 1
+            self._reverse = (offsets, sources, positions)
+        return self._reverse
+
+    def in_degree(self, vertex: Vertex) -> int:
+        """O(1) - of a directed graph, read from reverse_arrays()"""
+        index = self._indices[vertex]
+        offsets = self.reverse_arrays()[0] if self.directed else self.offsets
+        return offsets[index + 1] - offsets[index]
+
+    def _edgenode(self, position: int) -> CSREdgenode:
+        weight = self.weights[position] if self.weights is not None else None
+        return CSREdgenode(tail=self._vertices[self.targets[position]],
+                           weight=weight if weight == weight else None)  # nan means no weight
+
+    def _vertex_flags(self, vertex_flags: NodeList=None, default=None):
+        if vertex_flags is None and default is None:
+            return bytearray(self.nb_vertices)
+        return _vertex_flags(vertex_flags=vertex_flags, indices=self._indices,
+                             vertices=self._vertices, default=default)
+
+    def _subgraph(self, indices: Sequence[int]):
+        """graph induced by the vertices of given indices"""
+        new_indices = array('q', [-1]) * self.nb_vertices
+        for new_index, index in enumerate(indices):
+            new_indices[index] = new_index
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('d') if self.weights is not None else None
+        for index in indices:
+            for position in range(self.offsets[index], self.offsets[index + 1]):
+                tail = new_indices[self.targets[position]]
+                if tail >= 0:
+                    targets.append(tail)
+                    if weights is not None:
+                        weights.append(self.weights[position])
+            offsets.append(len(targets))
+        return CSRGraph.from_arrays(vertices=[self._vertices[i] for i in indices],
+                                    offsets=offsets,
+                                    targets=targets,
+                                    weights=weights,
+                                    directed=self.directed)
+
+    def view(self, vertex_ids: Sequence[int]=None, is_edge_processable: Callable[[Vertex, Any], bool]=None):
+        """O(1), O(k) given k vertex ids - see SubgraphView"""
+        return SubgraphView(graph=self, vertex_ids=vertex_ids, is_edge_processable=is_edge_processable)
+
+    def traversal(self, start: Vertex=None) -> CSRTraversal:
+        """a new per-call traversal context on this graph"""
+        return CSRTraversal(graph=self, start=start)
+
+    def shortest_unweighted_path(self, start: Vertex, end: Vertex) -> Path:
+        """bidirectional BFS: only the vertices around start and end are visited
+        returns the vertices and the edges of a path with the fewest edges
+        - for directed graphs, the backward search runs on reverse_arrays()
+        raises a PathError if end can not be reached"""
+        offsets, targets = self.offsets, self.targets
+
+        # edges are given as (head, tail, position): position is -1 for the
+        # edges of undirected graphs found backwards, i.e. from their tail
+        def successors(index: int):
+            for position in range(offsets[index], offsets[index + 1]):
+                yield targets[position], (index, targets[position], position)
+
+        def predecessors(index: int):
+            if self.directed:
+                reverse_offsets, sources, positions = self.reverse_arrays()
+                for reverse_position in range(reverse_offsets[index], reverse_offsets[index + 1]):
+                    yield sources[reverse_position], (sources[reverse_position], index, positions[reverse_position])
+            else:
+                for position in range(offsets[index], offsets[index + 1]):
+                    yield targets[position], (targets[position], index, -1)
+
+        def to_edge(head: int, tail: int, position: int) -> Edge:
+            if position < 0:
+                position = next(p for p in range(offsets[head], offsets[head + 1]) if targets[p] == tail)
+            return self._edgenode(position).to_edge(head=self._vertices[head])
+
+        path = bidirectional_bfs(start=self._indices[start], end=self._indices[end],
+                                 successors=successors, predecessors=predecessors)
+        if path is None:
+            raise PathError(f'No path found between {start} and {end}')
+        indices, edges = path
+        return Path(vertices=[self._vertices[i] for i in indices],
+                    edges=[to_edge(*edge) for edge in edges])
+
+    def find_path(self, start: Vertex, end: Vertex, traversal: Traversal=None):
+        """return the path from start to end vertices as a graph
+        parents are read from traversal if given, else from parent_edges"""
+        parent_edge = traversal.parent_edge if traversal is not None else self.parent_edges.__getitem__
+        vertices = []
+        edges = []
+        for i in range(self.nb_vertices):
+            vertices.append(end)
+            if end is start:
+                break
+            edge = parent_edge(end)
+            if edge:
+                edges.append(edge)
+                end = edge.head
+            else:
+                raise Exception(f'No path found between {start} and {end}')
+        else:
+            raise Exception(f'No path found between {start} and {end}')
+        vertices.reverse()
+        edges.reverse()
+        return CSRGraph(vertices=vertices, edges=edges, directed=True)
+
+    def bfs(self,
+            start: Vertex,
+            process_vertex_early: Callable[[Vertex], Any]=None,
+            process_vertex_late: Callable[[Vertex], Any]=None,
+            process_edge: Callable[[Vertex, CSREdgenode], Any]=None,
+            discovered_vertices: NodeList=None,
+            processed_vertices: NodeList=None,
+            is_edge_processable: Callable[[Vertex, CSREdgenode], bool]=None,
+            materialize: bool=True):
+        """Breadth-First Search
+        returns the graph of processed vertices - one single connected component
+        - unlike Graph.bfs, undirected edges are not connected twice again:
+        the subgraph keeps the same edgenodes as this graph, so its nb_edges
+        is half the one of the graph returned by Graph.bfs
+        - with materialize=False, returns a Traversal instead: parent_edges is
+        left untouched and no subgraph is built"""
+        vertices, offsets, targets = self._vertices, self.offsets, self.targets
+        directed = self.directed
+        traversal = self.traversal(start=start)
+        visited, parents, positions = traversal.visited, traversal.parents, traversal.parent_edgenodes
+        if materialize:
+            # reinit parents - the view shares the arrays of the traversal
+            self.parent_edges = CSRParentEdges(graph=self, parents=parents, positions=positions)
+        discovered = self._vertex_flags(discovered_vertices)  # added to queue
+        processed = self._vertex_flags(processed_vertices)  # processed and out of queue
+        # edgenodes are only built if a callback needs them
+        with_edgenodes = process_edge is not None or is_edge_processable is not None
+
+        start_index = self._indices[start]
+        discovered[start_index] = True
+        # the queue is the array of discovered vertices and a read index
+        queue = traversal.order
+        queue.append(start_index)
+        first = 0
+        while first < len(queue):
+            index = queue[first]
+            first += 1
+            processed[index] = True
+            visited[index] = 1
+            vertex = vertices[index]
+            if process_vertex_early is not None:
+                process_vertex_early(vertex)
+            for position in range(offsets[index], offsets[index + 1]):
+                next_index = targets[position]
+                if with_edgenodes:
+                    edgenode = self._edgenode(position)
+                    if is_edge_processable is not None and not is_edge_processable(vertex, edgenode):
+                        continue
+                    if process_edge is not None and (not processed[next_index] or directed):
+                        process_edge(vertex, edgenode)
+                if not discovered[next_index]:
+                    discovered[next_index] = True
+                    parents[next_index] = index
+                    positions[next_index] = position
+                    queue.append(next_index)
+            if process_vertex_late is not None:
+                process_vertex_late(vertex)
+        if not materialize:
+            return traversal
+        if processed_vertices is None:
+            return self._subgraph(sorted(queue))
+        return self._subgraph([i for i in range(self.nb_vertices) if processed[i]])
+
+    def dfs(self,
+            start: Vertex,
+            process_vertex_early: Callable[[Vertex], Any]=None,
+            process_vertex_late: Callable[[Vertex], Any]=None,
+            process_edge: Callable[[Vertex, CSREdgenode], Any]=None,
+            discovered_vertices: NodeList=None,
+            processed_vertices: NodeList=None,
+            traversal: CSRTraversal=None,
+            materialize: bool=True) -> CSRTraversal:
+        """Depth-First Search
+        returns entry and exit times for each vertex
+        - a vertex v1 is an ancestor of vertex v2 if the time interval of v2 is
+        nested in the one of v1
+        - the nb of descendants of a vertex v1 is half its time interval
+        times, parents and edge types are kept in the returned traversal,
+        given one to share it with the callbacks or across calls
+        - with materialize=True, they are also written on the vertices
+        and in parent_edges
+        - with materialize=False, the graph is left untouched"""
+        vertices, offsets, targets = self._vertices, self.offsets, self.targets
+        directed = self.directed
+        traversal = self.traversal(start=start) if traversal is None else traversal
+        parents, positions, order = traversal.parents, traversal.parent_edgenodes, traversal.order
+        entry_times, exit_times = traversal.entry_times, traversal.exit_times
+        if materialize:
+            # reinit parents - the view shares the arrays of the traversal
+            self.parent_edges = CSRParentEdges(graph=self, parents=parents, positions=positions)
+        discovered = self._vertex_flags(discovered_vertices, default=traversal.discovered)  # added to stack
+        processed = self._vertex_flags(processed_vertices, default=traversal.visited)  # processed and out of stack
+        # position of the next edge to explore for each vertex in the stack
+        cursors = array('q', [0]) * self.nb_vertices
+
+        start_index = self._indices[start]
+        discovered[start_index] = True
+        traversal.discovered[start_index] = True
+        stack = [start_index]
+        while stack:
+            index = stack.pop()
+            vertex = vertices[index]
+            if entry_times[index] < 0:
+                entry_times[index] = traversal.time
+                if materialize:
+                    vertex.entry_time = traversal.time
+                traversal.time += 1
+                order.append(index)
+                cursors[index] = offsets[index]
+                if process_vertex_early is not None:
+                    process_vertex_early(vertex)
+            position, end = cursors[index], offsets[index + 1]
+            while position < end:
+                next_index = targets[position]
+                position += 1
+                # if undiscovered vertex: add it to stack
+                if not discovered[next_index]:
+                    discovered[next_index] = True
+                    traversal.discovered[next_index] = True
+                    parents[next_index] = index
+                    positions[next_index] = position - 1
+                    if process_edge is not None:
+                        traversal.edgetype = EdgeType.TREE
+                        edgenode = self._edgenode(position - 1)
+                        edgenode.edgetype = EdgeType.TREE
+                        process_edge(vertex, edgenode)
+                    cursors[index] = position
+                    stack.append(index)
+                    stack.append(next_index)
+                    break
+                # back, forward or cross edge: the parent of next_vertex is already known
+                elif not processed[next_index] or directed:
+                    if process_edge is not None:
+                        traversal.edgetype = _edgetype(entry_times, index, next_index, processed)
+                        # the edgenode is built for this call only
+                        edgenode = self._edgenode(position - 1)
+                        edgenode.edgetype = traversal.edgetype
+                        process_edge(vertex, edgenode)
+            else:
+                # all edges explored
+                if process_vertex_late is not None:
+                    process_vertex_late(vertex)
+                processed[index] = True
+                traversal.visited[index] = 1
+                exit_times[index] = traversal.time
+                if materialize:
+                    vertex.exit_time = traversal.time
+                traversal.time += 1
+        return traversal
+
+    def iter_bfs(self, start: Vertex, traversal: CSRTraversal=None, edges: bool=True) -> Iterator[Event]:
+        """Breadth-First Search as a stream of events: the consumer may stop at any point
+        - DISCOVER and FINISH for each vertex, in BFS order
+        - TREE_EDGE and NON_TREE_EDGE for the edges bfs would process, unless edges=False:
+        edgenodes are only built for these events
+        the state is only kept in traversal, as with bfs(materialize=False)"""
+        vertices, offsets, targets = self._vertices, self.offsets, self.targets
+        directed = self.directed
+        traversal = self.traversal(start=start) if traversal is None else traversal
+        discovered, processed = traversal.discovered, traversal.visited
+        parents, positions = traversal.parents, traversal.parent_edgenodes
+        # the queue is the processing order and a read index
+        queue = traversal.order
+        first = len(queue)
+        discovered[self._indices[start]] = True
+        queue.append(self._indices[start])
+        while first < len(queue):
+            index = queue[first]
+            first += 1
+            vertex = vertices[index]
+            processed[index] = True
+            yield Event(EventType.DISCOVER, vertex)
+            for position in range(offsets[index], offsets[index + 1]):
+                next_index = targets[position]
+                if not discovered[next_index]:
+                    discovered[next_index] = True
+                    parents[next_index] = index
+                    positions[next_index] = position
+                    queue.append(next_index)
+                    if edges:
+                        yield Event(EventType.TREE_EDGE, vertex, self._edgenode(position))
+                elif edges and (not processed[next_index] or directed):
+                    yield Event(EventType.NON_TREE_EDGE, vertex, self._edgenode(position))
+            yield Event(EventType.FINISH, vertex)
+
+    def iter_dfs(self, start: Vertex, traversal: CSRTraversal=None, edges: bool=True) -> Iterator[Event]:
+        """Depth-First Search as a stream of events: the consumer may stop at any point
+        - DISCOVER at entry time and FINISH at exit time of each vertex
+        - TREE_EDGE, BACK_EDGE, FORWARD_EDGE and CROSS_EDGE for the edges dfs
+        would process, unless edges=False: edgenodes are only built for these events
+        the state is only kept in traversal, as with dfs(materialize=False)"""
+        vertices, offsets, targets = self._vertices, self.offsets, self.targets
+        directed = self.directed
+        traversal = self.traversal(start=start) if traversal is None else traversal
+        discovered, processed = traversal.discovered, traversal.visited
+        parents, positions, order = traversal.parents, traversal.parent_edgenodes, traversal.order
+        entry_times, exit_times = traversal.entry_times, traversal.exit_times
+        # position of the next edge to explore for each vertex in the stack
+        cursors = array('q', [0]) * self.nb_vertices
+
+        start_index = self._indices[start]
+        discovered[start_index] = True
+        stack = [start_index]
+        while stack:
+            index = stack[-1]
+            vertex = vertices[index]
+            if entry_times[index] < 0:
+                entry_times[index] = traversal.time
+                traversal.time += 1
+                order.append(index)
+                cursors[index] = offsets[index]
+                yield Event(EventType.DISCOVER, vertex)
+            position, end = cursors[index], offsets[index + 1]
+            while position < end:
+                next_index = targets[position]
+                position += 1
+                if not discovered[next_index]:
+                    discovered[next_index] = True
+                    parents[next_index] = index
+                    positions[next_index] = position - 1
+                    traversal.edgetype = EdgeType.TREE
+                    cursors[index] = position
+                    stack.append(next_index)
+                    if edges:
+                        yield Event(EventType.TREE_EDGE, vertex, self._edgenode(position - 1))
+                    break
+                elif not processed[next_index] or directed:
+                    traversal.edgetype = _edgetype(entry_times, index, next_index, processed)
+                    if edges:
+                        yield Event(EDGE_EVENTS[traversal.edgetype], vertex, self._edgenode(position - 1))
+            else:
+                # all edges explored
+                stack.pop()
+                processed[index] = True
+                exit_times[index] = traversal.time
+                traversal.time += 1
+                yield Event(EventType.FINISH, vertex)
+
+    def direction_optimizing_bfs(self,
+                                 start: Vertex,
+                                 alpha: float=14,
+                                 beta: float=24) -> CSRTraversal:
+        """level-synchronous Breadth-First Search, switching between
+        top-down and bottom-up steps (Beamer et al.)
+        - top-down: the vertices of the frontier scan their edges
+        - bottom-up: the undiscovered vertices scan their incoming edges
+        until they find a parent in the frontier, which skips most of the
+        edges into already discovered vertices when the frontier is large
+        - goes bottom-up when the edges leaving the frontier outnumber the
+        edges of the undiscovered vertices / alpha, and back top-down when
+        the frontier holds less than n / beta vertices
+        returns the traversal: order is a level order, parents form a BFS tree
+        bottom-up steps use reverse_arrays(), built at first call"""
+        nb_vertices, offsets, targets = self.nb_vertices, self.offsets, self.targets
+        traversal = self.traversal(start=start)
+        visited, parents, positions, order = (traversal.visited, traversal.parents,
+                                              traversal.parent_edgenodes, traversal.order)
+        # frontier as a list of ids for top-down steps, as a bitmap for bottom-up steps
+        in_frontier = bytearray(nb_vertices)
+        start_index = self._indices[start]
+        visited[start_index] = True
+        frontier = [start_index]
+        undiscovered = None  # ids left to scan by bottom-up steps
+        undiscovered_edges = self.nb_edges - (offsets[start_index + 1] - offsets[start_index])
+        bottom_up = False
+        while frontier:
+            order.extend(frontier)
+            if not bottom_up:
+                frontier_edges = sum(offsets[i + 1] - offsets[i] for i in frontier)
+                bottom_up = frontier_edges > undiscovered_edges / alpha
+            elif len(frontier) < nb_vertices / beta:
+                bottom_up = False
+            next_frontier = []
+            if bottom_up:
+                reverse_offsets, sources, reverse_positions = self.reverse_arrays()
+                for index in frontier:
+                    in_frontier[index] = True
+                undiscovered = [i for i in (range(nb_vertices) if undiscovered is None else undiscovered)
+                                if not visited[i]]
+                for index in undiscovered:
+                    for reverse_position in range(reverse_offsets[index], reverse_offsets[index + 1]):
+                        source = sources[reverse_position]
+                        if in_frontier[source]:
+                            parents[index] = source
+                            positions[index] = reverse_positions[reverse_position]
+                            next_frontier.append(index)
+                            break
+                for index in frontier:
+                    in_frontier[index] = False
+                # vertices of the next frontier are only visited once the step is over
+                for index in next_frontier:
+                    visited[index] = True
+            else:
+                for index in frontier:
+                    for position in range(offsets[index], offsets[index + 1]):
+                        next_index = targets[position]
+                        if not visited[next_index]:
+                            visited[next_index] = True
+                            parents[next_index] = index
+                            positions[next_index] = position
+                            next_frontier.append(next_index)
+            undiscovered_edges -= sum(offsets[i + 1] - offsets[i] for i in next_frontier)
+            frontier = next_frontier
+        traversal.discovered[:] = visited
+        return traversal
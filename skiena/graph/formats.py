@@ -0,0 +1,287 @@
+"""streaming readers and writers of text graph formats
+- DIMACS shortest path (p sp) and max-flow (p max) problems
+- METIS
+- Matrix Market coordinate matrices
+vertices are given the 1-based ids of the files as keys (graph.key_id(1)
+is the id of vertex 1). files are read CHUNK_SIZE characters at a time,
+each chunk being split and converted in bulk into a GraphBuilder: no
+Vertex/Edge or tuple is created per edge"""
+from array import array
+from math import nan
+from typing import Callable, Iterator, NamedTuple, TextIO, Union
+
+from .graph import Vertex, Graph
+from .csr_graph import CSRGraph
+from .builder import GraphBuilder
+from .exceptions import GraphDirectionTypeError
+
+CHUNK_SIZE = 1 << 20
+
+
+class DimacsProblem(NamedTuple):
+    graph: Union[Graph, CSRGraph]
+    problem: str  # 'sp' or 'max'
+    source: Vertex = None
+    sink: Vertex = None
+
+
+def _chunks(f: TextIO) -> Iterator[str]:
+    """text of f CHUNK_SIZE characters at a time, cut after a line end"""
+    rest = ''
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            if rest:
+                yield rest
+            return
+        chunk = rest + chunk
+        end = chunk.rfind('\n') + 1
+        rest = chunk[end:]
+        if end:
+            yield chunk[:end]
+
+
+def _builder(nb_vertices: int, directed: bool, vertex_factory: Callable[[], Vertex]) -> GraphBuilder:
+    builder = GraphBuilder(directed=directed, vertex_factory=vertex_factory)
+    for key in range(1, nb_vertices + 1):
+        builder.add_vertex(key)
+    return builder
+
+
+def _ids(tokens: list) -> list:
+    """1-based vertex numbers to ids"""
+    return [int(token) - 1 for token in tokens]
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _adjacency(graph: Union[Graph, CSRGraph]) -> Iterator[tuple]:
+    """(head id, tail ids, weights) per vertex in id order, nan meaning no weight
+    CSRGraph arrays are sliced, not turned into edgenodes"""
+    if isinstance(graph, CSRGraph):
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        for head in range(graph.nb_vertices):
+            start, end = offsets[head], offsets[head + 1]
+            yield (head, targets[start:end],
+                   weights[start:end] if weights is not None else array('d', [nan]) * (end - start))
+    else:
+        for head in range(graph.nb_vertices):
+            edgenodes = list(graph.adjacency_lists[graph.vertex(head)].edgenodes)
+            weights = [getattr(edgenode, 'weight', None) for edgenode in edgenodes]
+            yield (head, [graph.vertex_id(edgenode.tail) for edgenode in edgenodes],
+                   [weight if weight is not None else nan for weight in weights])
+
+
+def _is_weighted(graph: Union[Graph, CSRGraph]) -> bool:
+    if isinstance(graph, CSRGraph):
+        return graph.weights is not None
+    return any(weight == weight for head, tails, weights in _adjacency(graph) for weight in weights)
+
+
+def _undirected_edges(graph: Union[Graph, CSRGraph]) -> Iterator[tuple]:
+    """(head id, tail id, weight) once per undirected edge, with head >= tail
+    a self-loop is stored twice in its adjacency list: every other is kept"""
+    for head, tails, weights in _adjacency(graph):
+        is_loop_kept = False
+        for tail, weight in zip(tails, weights):
+            if tail == head:
+                is_loop_kept = not is_loop_kept
+                if not is_loop_kept:
+                    continue
+            if head >= tail:
+                yield head, tail, weight
+
+
+def read_dimacs(path: str,
+                implementation: str='csr',
+                vertex_factory: Callable[[], Vertex]=Vertex) -> DimacsProblem:
+    """O(n + m) - directed graph of a DIMACS shortest path or max-flow problem
+    arc lengths or capacities are the edge weights: the graph can be given
+    to run_dijkstra_algorithm, and to find_network_flow with the source and sink"""
+    builder, problem, terminals = None, None, {}
+    with open(path) as f:
+        for chunk in _chunks(f):
+            lines = chunk.splitlines()
+            arcs = [line for line in lines if line.startswith('a')]
+            if len(arcs) < len(lines):
+                for line in lines:
+                    tokens = line.split()
+                    if not tokens or tokens[0] in ('a', 'c'):
+                        continue
+                    elif tokens[0] == 'p':
+                        if builder is not None or len(tokens) != 4 or tokens[1] not in ('sp', 'max'):
+                            raise ValueError(f'Invalid problem line: {line}')
+                        problem = tokens[1]
+                        builder = _builder(int(tokens[2]), directed=True, vertex_factory=vertex_factory)
+                        nb_arcs = int(tokens[3])
+                    elif tokens[0] == 'n' and problem == 'max' and tokens[2:] in (['s'], ['t']):
+                        terminals[tokens[2]] = int(tokens[1])
+                    else:
+                        raise ValueError(f'Invalid line: {line}')
+            if not arcs:
+                continue
+            if builder is None:
+                raise ValueError('Arc before the problem line')
+            tokens = ' '.join(arcs).split()
+            if len(tokens) != 4 * len(arcs):
+                raise ValueError('Invalid arc line')
+            builder.extend(heads=_ids(tokens[1::4]), tails=_ids(tokens[2::4]), weights=map(float, tokens[3::4]))
+    if builder is None:
+        raise ValueError(f'{path} has no problem line')
+    if builder.nb_edges != nb_arcs:
+        raise ValueError(f'{path} has {builder.nb_edges} arcs, {nb_arcs} expected')
+    if problem == 'max' and len(terminals) != 2:
+        raise ValueError(f'{path} lacks a source or a sink')
+    graph = builder.build(implementation=implementation)
+    source, sink = (graph.vertex(graph.key_id(terminals[terminal])) if terminal in terminals else None
+                    for terminal in ('s', 't'))
+    return DimacsProblem(graph=graph, problem=problem, source=source, sink=sink)
+
+
+def write_dimacs(path: str,
+                 graph: Union[Graph, CSRGraph],
+                 problem: str='sp',
+                 source: Vertex=None,
+                 sink: Vertex=None):
+    """O(n + m) - every edge needs a weight, its length or capacity
+    undirected edges are written as two arcs"""
+    if problem not in ('sp', 'max'):
+        raise ValueError(f'Unknown problem {problem}')
+    if problem == 'max' and (source is None or sink is None):
+        raise ValueError('A max-flow problem needs a source and a sink')
+    with open(path, 'w') as f:
+        f.write(f'p {problem} {graph.nb_vertices} {graph.nb_edges}\n')
+        if problem == 'max':
+            f.write(f'n {graph.vertex_id(source) + 1} s\nn {graph.vertex_id(sink) + 1} t\n')
+        for head, tails, weights in _adjacency(graph):
+            if any(weight != weight for weight in weights):
+                raise ValueError('DIMACS arcs need a weight')
+            f.write(''.join([f'a {head + 1} {tail + 1} {_number(weight)}\n'
+                             for tail, weight in zip(tails, weights)]))
+
+
+def read_metis(path: str,
+               implementation: str='csr',
+               vertex_factory: Callable[[], Vertex]=Vertex) -> Union[Graph, CSRGraph]:
+    """O(n + m) - undirected graph of a METIS file
+    the blank lines of the isolated vertices ending the file may be omitted
+    edge weights are kept, vertex weights are set as the weights attribute
+    of the vertices (a list of ncon values), vertex sizes are skipped"""
+    with open(path) as f:
+        line = f.readline()
+        while line.startswith('%'):
+            line = f.readline()
+        header = line.split()
+        if not 2 <= len(header) <= 4:
+            raise ValueError(f'Invalid header: {line}')
+        nb_vertices, nb_edges = int(header[0]), int(header[1])
+        has_sizes, has_vertex_weights, has_edge_weights = (
+            digit == '1' for digit in (header[2] if len(header) > 2 else '0').zfill(3))
+        nb_constraints = int(header[3]) if len(header) > 3 else int(has_vertex_weights)
+        skipped = has_sizes + nb_constraints * has_vertex_weights
+        step = 2 if has_edge_weights else 1
+        builder = _builder(nb_vertices, directed=False, vertex_factory=vertex_factory)
+        head = 0
+        for chunk in _chunks(f):
+            heads, tails, weights = [], [], [] if has_edge_weights else None
+            for line in chunk.splitlines():
+                if line.startswith('%'):
+                    continue
+                if head >= nb_vertices:
+                    if line.strip():
+                        raise ValueError(f'{path} has more than {nb_vertices} vertex lines')
+                    continue
+                tokens = line.split()
+                if has_vertex_weights:
+                    builder.vertices[head].weights = [int(token) for token in
+                                                      tokens[has_sizes:skipped]]
+                # each edge is listed by both of its vertices: kept once
+                for i in range(skipped, len(tokens), step):
+                    tail = int(tokens[i]) - 1
+                    if tail > head:
+                        heads.append(head)
+                        tails.append(tail)
+                        if has_edge_weights:
+                            weights.append(float(tokens[i + 1]))
+                head += 1
+            builder.extend(heads=heads, tails=tails, weights=weights)
+    if builder.nb_edges != nb_edges:
+        raise ValueError(f'{path} has {builder.nb_edges} edges, {nb_edges} expected')
+    return builder.build(implementation=implementation)
+
+
+def write_metis(path: str, graph: Union[Graph, CSRGraph]):
+    """O(n + m) - METIS has no self-loops: they are skipped"""
+    if graph.directed:
+        raise GraphDirectionTypeError
+    is_weighted = _is_weighted(graph)
+    nb_edges = sum(1 for head, tail, weight in _undirected_edges(graph) if head != tail)
+    with open(path, 'w') as f:
+        f.write(f'{graph.nb_vertices} {nb_edges} 1\n' if is_weighted else
+                f'{graph.nb_vertices} {nb_edges}\n')
+        for head, tails, weights in _adjacency(graph):
+            if is_weighted:
+                tokens = [f'{tail + 1} {_number(weight if weight == weight else 1)}'
+                          for tail, weight in zip(tails, weights) if tail != head]
+            else:
+                tokens = [str(tail + 1) for tail in tails if tail != head]
+            f.write(' '.join(tokens) + '\n')
+
+
+def read_matrix_market(path: str,
+                       implementation: str='csr',
+                       vertex_factory: Callable[[], Vertex]=Vertex) -> Union[Graph, CSRGraph]:
+    """O(n + m) - graph of a square coordinate matrix: entry (i, j, value) is
+    the edge i -> j of weight value (no weight for a pattern matrix)
+    - general matrix: directed graph
+    - symmetric matrix: undirected graph, of the entries of the lower triangle"""
+    with open(path) as f:
+        line = f.readline()
+        header = line.lower().split()
+        if len(header) != 5 or header[0] != '%%matrixmarket' or header[1:3] != ['matrix', 'coordinate']:
+            raise ValueError(f'Unsupported Matrix Market header: {line}')
+        field, symmetry = header[3:]
+        if field not in ('real', 'integer', 'pattern') or symmetry not in ('general', 'symmetric'):
+            raise ValueError(f'Unsupported Matrix Market matrix: {field} {symmetry}')
+        line = f.readline()
+        while line.startswith('%') or line and not line.strip():
+            line = f.readline()
+        nb_rows, nb_columns, nb_entries = (int(token) for token in line.split())
+        if nb_rows != nb_columns:
+            raise ValueError(f'{path} is not a square matrix')
+        builder = _builder(nb_rows, directed=symmetry == 'general', vertex_factory=vertex_factory)
+        stride = 2 if field == 'pattern' else 3
+        for chunk in _chunks(f):
+            tokens = chunk.split()
+            if len(tokens) % stride:
+                raise ValueError('Invalid entry line')
+            builder.extend(heads=_ids(tokens[0::stride]),
+                           tails=_ids(tokens[1::stride]),
+                           weights=map(float, tokens[2::stride]) if stride == 3 else None)
+    if builder.nb_edges != nb_entries:
+        raise ValueError(f'{path} has {builder.nb_edges} entries, {nb_entries} expected')
+    return builder.build(implementation=implementation)
+
+
+def write_matrix_market(path: str, graph: Union[Graph, CSRGraph]):
+    """O(n + m) - a directed graph is written as a general matrix, an
+    undirected graph as a symmetric one; a real matrix if weighted, a pattern one if not"""
+    is_weighted = _is_weighted(graph)
+    if graph.directed:
+        nb_entries = graph.nb_edges
+        edges = ((head, tail, weight) for head, tails, weights in _adjacency(graph)
+                 for tail, weight in zip(tails, weights))
+    else:
+        nb_entries = sum(1 for edge in _undirected_edges(graph))
+        edges = _undirected_edges(graph)
+    with open(path, 'w') as f:
+        f.write(f'%%MatrixMarket matrix coordinate {"real" if is_weighted else "pattern"} '
+                f'{"general" if graph.directed else "symmetric"}\n')
+        f.write(f'{graph.nb_vertices} {graph.nb_vertices} {nb_entries}\n')
+        if is_weighted:
+            f.writelines(f'{head + 1} {tail + 1} {_number(weight if weight == weight else 1)}\n'
+                         for head, tail, weight in edges)
+        else:
+            f.writelines(f'{head + 1} {tail + 1}\n' for head, tail, weight in edges)
@@ -0,0 +1,75 @@
+from array import array
+from typing import Sequence
+
+from .graph import Vertex
+from .csr_graph import CSRGraph
+from .shared import SharedArrays
+
+
+class FrozenGraph(CSRGraph):
+    """read-only CSRGraph whose arrays are stored in shared memory blocks,
+    for process pools: a pickled Graph sends every vertex, edge and list
+    node to each task, a frozen one only the names of its blocks
+    - FrozenGraph.freeze(graph) copies the arrays of any graph once: this
+    process owns the blocks and unlinks them on close
+    - FrozenGraph.attach(frozen.spec), in any process, maps the blocks
+    with no copy: only the vertices are built, in O(n)
+    bfs, dfs, run_dijkstra_algorithm and the applications run on it as on
+    any CSRGraph - use as a context manager, views taken on the arrays
+    must be released before close"""
+    @classmethod
+    def freeze(cls, graph):
+        """O(n + m) - graph: any graph with adjacency lists, or a CSRGraph"""
+        csr_graph = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+        arrays = {'offsets': array('q', csr_graph.offsets), 'targets': array('i', csr_graph.targets)}
+        if csr_graph.weights is not None:
+            arrays['weights'] = array('d', csr_graph.weights)
+        shared = SharedArrays(arrays=arrays)
+        keys = None
+        if csr_graph.key_ids:
+            # key of each vertex id
+            keys = [None] * csr_graph.nb_vertices
+            for key, vertex_id in csr_graph.key_ids.items():
+                keys[vertex_id] = key
+        vertices = [csr_graph.vertex(i) for i in range(csr_graph.nb_vertices)]
+        return cls._from_shared(shared, vertices, csr_graph.directed, keys)
+
+    @classmethod
+    def attach(cls, spec: dict, vertices: Sequence[Vertex]=None):
+        """O(n) - the graph frozen in another process, of given spec
+        - vertices: the vertices of ids 0..n-1, new Vertex() by default
+        the vertices are local to each process: results are exchanged as
+        vertex ids or keys"""
+        shared = SharedArrays.attach(spec['arrays'])
+        nb_vertices = len(shared['offsets']) - 1
+        if vertices is None:
+            vertices = [Vertex() for i in range(nb_vertices)]
+        elif len(vertices) != nb_vertices:
+            shared.close()
+            raise ValueError(f'frozen graph has {nb_vertices} vertices, {len(vertices)} given')
+        return cls._from_shared(shared, list(vertices), spec['directed'], spec['keys'])
+
+    @classmethod
+    def _from_shared(cls, shared: SharedArrays, vertices: list, directed: bool, keys: list):
+        graph = cls.from_arrays(vertices=vertices,
+                                offsets=shared['offsets'],
+                                targets=shared['targets'],
+                                weights=shared['weights'] if 'weights' in shared else None,
+                                directed=directed,
+                                keys=keys)
+        graph.shared = shared
+        # picklable, a few bytes plus the keys
+        graph.spec = {'arrays': shared.spec, 'directed': directed, 'keys': keys}
+        return graph
+
+    def close(self):
+        """release the arrays - and the blocks if frozen in this process"""
+        self.offsets = self.targets = self.weights = None
+        self._reverse = None
+        self.shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -1,19 +1,37 @@
-from typing import Sequence, Callable, Any
+import copy
+import pickle
+import sys
+from typing import Sequence, Callable, Any, Hashable, Iterator, List, Union
 from enum import Enum
+from itertools import count
 
-from datastructures import (LinkedList,
+from datastructures import (DoublyLinkedList,
                             Queue,
                             QueueEmptyError,
                             Stack,
                             StackEmptyError)
+from datastructures.doubly_linked_list import DoublyLinkedListNode
 
+from .traversal import Traversal, EventType, Event, Path, bidirectional_bfs
+from .columns import Columns, EdgeColumns
+from .exceptions import PathError
 
-class Vertex:
-    nb_of_instances = 0
+
+def _attributes(item) -> list:
+    """(name, value) pairs of the attributes set on a dict or __slots__-based item"""
+    if hasattr(item, '__dict__'):
+        return list(item.__dict__.items())
+    return [(name, getattr(item, name)) for name in item.__slots__ if hasattr(item, name)]
+
+
+class BaseVertex:
+    """the id is only a label for repr: graphs index their vertices
+    with their own compact ids (see Graph.vertex_id)"""
+    __slots__ = ()
+    _ids = count(1)
 
     def __init__(self, **kwargs):
-        Vertex.nb_of_instances += 1
-        self._id = Vertex.nb_of_instances
+        self._id = next(BaseVertex._ids)  # atomic, unlike incrementing a counter
         for kwarg, value in kwargs.items():
             setattr(self, kwarg, value)
 
@@ -24,11 +42,15 @@ class Vertex:
     def __repr__(self) -> str:
         vertex_repr = f'V#{self.id}'
         kwargs_repr = ' '.join([f'{kwarg}={value}'
-                                for kwarg, value in self.__dict__.items()
+                                for kwarg, value in _attributes(self)
                                 if kwarg != '_id'])
         return vertex_repr + ' ' + kwargs_repr if kwargs_repr else vertex_repr
 
 
+class Vertex(BaseVertex):
+    """accepts any attribute"""
+
+
 class EdgeType(Enum):
     TREE = 1
     BACK = 2
@@ -36,7 +58,30 @@ class EdgeType(Enum):
     CROSS = 4
 
 
-class Edge:
+# DFS event of each edge type
+EDGE_EVENTS = {
+    EdgeType.TREE: EventType.TREE_EDGE,
+    EdgeType.BACK: EventType.BACK_EDGE,
+    EdgeType.FORWARD: EventType.FORWARD_EDGE,
+    EdgeType.CROSS: EventType.CROSS_EDGE,
+}
+
+
+def _edgetype(entry_times, head_id: int, tail_id: int, processed) -> EdgeType:
+    """DFS type of an edge to an already discovered tail"""
+    # discovered but not processed
+    if not processed[tail_id]:
+        return EdgeType.BACK
+    # discovered, processed but earlier entry time
+    if entry_times[head_id] < entry_times[tail_id]:
+        return EdgeType.FORWARD
+    # discovered, processed but later entry time
+    return EdgeType.CROSS
+
+
+class BaseEdge:
+    __slots__ = ()
+
     def __init__(self, head: Vertex, tail: Vertex, weight: float=None, edgetype: EdgeType=None, **kwargs):
         self.head = head
         self.tail = tail
@@ -48,95 +93,769 @@ class Edge:
             setattr(self, kwarg, value)
 
     def __repr__(self) -> str:
-        edge_repr = repr(self.head) + ' -> ' + repr(self.tail)
+        # the edge record of an undirected Graph has no ends (see _edge_record)
+        edge_repr = repr(getattr(self, 'head', None)) + ' -> ' + repr(getattr(self, 'tail', None))
         kwargs_repr = ' '.join([f'{kwarg}={value}'
-                                for kwarg, value in self.__dict__.items()
+                                for kwarg, value in _attributes(self)
                                 if kwarg not in ['head', 'tail', 'edgenode', 'opposite']])
         return edge_repr + ' - ' + kwargs_repr if kwargs_repr else edge_repr
 
 
-class Edgenode:
-    def __init__(self, head: Vertex, edge: Edge):
-        if head is edge.head:
-            tail = edge.tail
-        elif head is edge.tail:
-            tail = edge.head
-        else:
-            raise Exception('Starting vertex not in this edge')
+class Edge(BaseEdge):
+    """accepts any attribute"""
+
+
+class BaseEdgenode:
+    __slots__ = ()
+    edge_class = Edge
+
+    def __init__(self, head: Vertex, edge: Edge, tail: Vertex=None):
+        if tail is None:
+            if head is edge.head:
+                tail = edge.tail
+            elif head is edge.tail:
+                tail = edge.head
+            else:
+                raise Exception('Starting vertex not in this edge')
         self.tail = tail
-        for kwarg, value in edge.__dict__.items():
+        for kwarg, value in _attributes(edge):
             if kwarg not in ['head', 'tail', 'edgenode']:
                 setattr(self, kwarg, value)
 
     def to_edge(self, head: Vertex):
-        return Edge(edgenode=self,
-                    head=head,
-                    **self.__dict__)
+        return self.edge_class(edgenode=self,
+                               head=head,
+                               **dict(_attributes(self)))
+
+
+class Edgenode(BaseEdgenode):
+    """accepts any attribute"""
+
+
+def _edge_attribute(name: str) -> property:
+    """attribute of a schema shared edgenode, stored on its edge"""
+    def get_attribute(edgenode):
+        return getattr(edgenode.edge, name)
+
+    def set_attribute(edgenode, value):
+        setattr(edgenode.edge, name, value)
+
+    return property(get_attribute, set_attribute)
+
+
+class BaseSharedEdgenode:
+    """edgenode of an undirected graph: the two edgenodes of an edge keep
+    only their own tail and the edge itself, whose attributes they share -
+    stored once, an attribute is updated in O(1) for both ends
+    - in a Graph, edge is the private record of the edge (see _edge_record):
+    given tail, it has no ends"""
+    __slots__ = ('tail', 'edge')
+
+    def __init__(self, head: Vertex, edge: Edge, tail: Vertex=None):
+        if tail is None:
+            if head is edge.head:
+                tail = edge.tail
+            elif head is edge.tail:
+                tail = edge.head
+            else:
+                raise Exception('Starting vertex not in this edge')
+        self.tail = tail
+        self.edge = edge
+
+    def to_edge(self, head: Vertex):
+        return type(self.edge)(edgenode=self,
+                               head=head,
+                               tail=self.tail,
+                               **{kwarg: value for kwarg, value in _attributes(self.edge)
+                                  if kwarg not in ['head', 'tail', 'edgenode']})
+
+
+class SharedEdgenode(BaseSharedEdgenode):
+    """accepts any attribute: the __dict__ is the one of the edge, with
+    plain attribute lookups - tail is a slot, hiding the tail of the edge"""
+    __slots__ = ('__dict__',)
+
+    def __init__(self, head: Vertex, edge: Edge, tail: Vertex=None):
+        super().__init__(head=head, edge=edge, tail=tail)
+        self.__dict__ = edge.__dict__
+
+    def __getstate__(self):
+        return self.tail, self.edge
+
+    def __setstate__(self, state):
+        self.tail, self.edge = state
+        self.__dict__ = self.edge.__dict__
+
+
+def _edge_record(edge: Edge) -> Edge:
+    """copy of the attributes of an undirected edge, shared by its two
+    edgenodes in one graph: the edge given is left untouched, and the ends,
+    seen the other way round by the mate, are left out"""
+    record = copy.copy(edge)
+    for name in ('head', 'tail', 'edgenode'):
+        if hasattr(record, name):
+            delattr(record, name)
+    return record
+
+
+class GraphSchema:
+    """declares the attributes of the vertices and edges of a graph
+    schema.Vertex, schema.Edge, schema.Edgenode and schema.SharedEdgenode
+    are __slots__-based:
+    no __dict__ per instance, and setting an undeclared attribute raises
+    an AttributeError
+    - the attributes set by the algorithms of this package are always declared"""
+    vertex_slots = ('_id', 'entry_time', 'exit_time', '_union_find_group')
+    edge_slots = ('head', 'tail', 'edgetype', 'edgenode')
+    edgenode_slots = ('tail', 'edgetype')
+
+    def __init__(self,
+                 vertex_attributes: Sequence[str]=(),
+                 edge_attributes: Sequence[str]=()):
+        self.vertex_attributes = tuple(vertex_attributes)
+        self.edge_attributes = tuple(edge_attributes)
+        self.Vertex = type('SchemaVertex', (BaseVertex,), {
+            '__slots__': self._slots(self.vertex_slots, self.vertex_attributes)})
+        self.Edge = type('SchemaEdge', (BaseEdge,), {
+            '__slots__': self._slots(self.edge_slots, self.edge_attributes)})
+        self.Edgenode = type('SchemaEdgenode', (BaseEdgenode,), {
+            '__slots__': self._slots(self.edgenode_slots, self.edge_attributes),
+            'edge_class': self.Edge})
+        self.SharedEdgenode = type('SchemaSharedEdgenode', (BaseSharedEdgenode,), {
+            '__slots__': (),
+            **{name: _edge_attribute(name)
+               for name in self._slots(self.edgenode_slots, self.edge_attributes) if name != 'tail'}})
+
+    @staticmethod
+    def _slots(slots: Sequence[str], attributes: Sequence[str]) -> tuple:
+        return tuple(slots) + tuple(a for a in attributes if a not in slots)
 
 
 class AdjacencyList:
+    """edgenodes are stored in a doubly linked list: connect returns the
+    list node of the edgenode, which disconnect removes in O(1)
+    - lineage is shared by the copies of the list (see Graph.snapshot)"""
+    _lineages = count()
+
     def __init__(self, head: Vertex):
         self.head = head
-        self.edgenodes = LinkedList()
+        self.edgenodes = DoublyLinkedList()
         self.degree = 0
+        self.lineage = next(AdjacencyList._lineages)
 
-    def connect(self, edge: Edge):
-        self.edgenodes.insert(Edgenode(head=self.head, edge=edge))
+    def copy(self):
+        """O(degree) - new list nodes holding the same edgenodes, in the same order"""
+        adjacency_list = AdjacencyList(head=self.head)
+        for edgenode in reversed(list(self.edgenodes)):
+            adjacency_list.edgenodes.insert(edgenode)
+        adjacency_list.degree = self.degree
+        adjacency_list.lineage = self.lineage
+        return adjacency_list
+
+    def connect(self, edge: Edge, edgenode_class: type=Edgenode, tail: Vertex=None) -> DoublyLinkedListNode:
+        """O(1) - tail: the other end, if not read from edge"""
         self.degree += 1
+        return self.edgenodes.insert(edgenode_class(head=self.head, edge=edge, tail=tail))
+
+    def disconnect(self, node: DoublyLinkedListNode):
+        """O(1)"""
+        self.edgenodes.delete_node(node)
+        self.degree -= 1
+
+    def find(self, tail: Vertex) -> DoublyLinkedListNode:
+        """O(degree) - list node of the first edgenode to tail"""
+        node = self.edgenodes.head
+        while node.item is not None:
+            if node.item.tail is tail:
+                return node
+            node = node.next
+        raise KeyError(tail)
+
+    def find_edgenode(self, edgenode) -> DoublyLinkedListNode:
+        """O(degree) - list node of the edgenode"""
+        node = self.edgenodes.head
+        while node.item is not None:
+            if node.item is edgenode:
+                return node
+            node = node.next
+        raise ValueError('Edge already removed')
+
+    def find_mate(self, edgenode) -> DoublyLinkedListNode:
+        """O(degree) - list node of the other edgenode sharing the edge of edgenode"""
+        node = self.edgenodes.head
+        while node.item is not None:
+            if node.item.edge is edgenode.edge and node.item is not edgenode:
+                return node
+            node = node.next
+        raise KeyError(edgenode.tail)
+
+
+class EdgeHandle:
+    """returned by Graph.add_edge, to remove or update the edge in O(1)"""
+    __slots__ = ('edge', 'connections')
+
+    def __init__(self, edge: Edge, connections: list):
+        self.edge = edge
+        # (adjacency list, list node) of each edgenode of the edge
+        self.connections = connections
 
 
 class NodeList:
+    """vertex -> value map stored in a list indexed by the vertex positions
+    - the vertices are given dense indices 0..n-1 in their order
+    - a NodeList built from another NodeList (e.g. graph.adjacency_lists)
+    shares its indices, so only the list of values is allocated"""
     def __init__(self, vertices: Sequence[Vertex], default=None):
-        self._dict = {v.id: default for v in vertices}
-        self._vertices = vertices
+        indices = getattr(vertices, 'indices', None)
+        if indices is None:
+            vertices = list(vertices)
+            indices = {v: i for i, v in enumerate(vertices)}
+        else:
+            vertices = vertices.vertices
+        self.indices = indices
+        self.vertices = vertices
+        self.values = [default] * len(vertices)
+
+    def index(self, key: Vertex) -> int:
+        """O(1)"""
+        return self.indices[key]
 
     def __setitem__(self, key: Vertex, value):
-        if key not in self._vertices:
-            raise KeyError(key)
-        self._dict[key.id] = value
+        """O(1)"""
+        self.values[self.indices[key]] = value
 
     def __getitem__(self, key: Vertex) -> Any:
-        if key not in self._vertices:
-            raise KeyError(key)
-        return self._dict[key.id]
+        """O(1)"""
+        return self.values[self.indices[key]]
 
     def __contains__(self, key: Vertex) -> bool:
-        return key.id in self._dict
+        return key in self.indices
 
     def __iter__(self):
-        for v in self._vertices:
+        for v in self.vertices:
             yield v
 
+    def __len__(self) -> int:
+        return len(self.vertices)
+
+
+class _NodeListFlags:
+    """index-based access to a caller-provided vertex NodeList"""
+    def __init__(self, nodelist: NodeList, vertices: Sequence[Vertex]):
+        self._nodelist = nodelist
+        self._vertices = vertices
+
+    def __getitem__(self, index: int):
+        return self._nodelist[self._vertices[index]]
+
+    def __setitem__(self, index: int, value):
+        self._nodelist[self._vertices[index]] = value
+
+
+def _vertex_flags(vertex_flags: NodeList, indices: dict, vertices: Sequence[Vertex], default):
+    """index-based flags: default if no NodeList is provided"""
+    if vertex_flags is None:
+        return default
+    # a NodeList sharing the indices of the graph is already index-based
+    if getattr(vertex_flags, 'indices', None) is indices:
+        return vertex_flags.values
+    return _NodeListFlags(nodelist=vertex_flags, vertices=vertices)
+
+
+def _key_ids(keys: Sequence[Hashable], nb_vertices: int) -> dict:
+    """external key -> vertex id"""
+    if keys is None:
+        return {}
+    if len(keys) != nb_vertices:
+        raise ValueError(f'{len(keys)} keys given for {nb_vertices} vertices')
+    return {key: i for i, key in enumerate(keys)}
+
+
+# sizes of the sample graphs of Graph.estimate_memory
+_SAMPLE_VERTICES = 1000
+_SAMPLE_EDGES = 4000
+
+# attributes referencing the vertices and edges of the graph, not values
+_REFERENCES = ('head', 'tail', 'edge', 'edgenode', 'opposite')
+
+
+class _MemorySizes:
+    """sys.getsizeof of objects, each counted once however many times it is
+    referenced - the size of a container excludes its items"""
+    def __init__(self):
+        self._seen = set()
+
+    def __call__(self, *objects) -> int:
+        size = 0
+        for o in objects:
+            if o is not None and id(o) not in self._seen:
+                self._seen.add(id(o))
+                size += sys.getsizeof(o)
+        return size
+
+    def item(self, item) -> int:
+        """the item, its __dict__ if any and its attribute values - enum
+        members and booleans are singletons, not counted"""
+        size = self(item, getattr(item, '__dict__', None))
+        for name, value in _attributes(item):
+            if name not in _REFERENCES and not isinstance(value, (Enum, bool)):
+                size += self(value)
+        return size
+
 
 class Graph:
-    """Adjancency list-based"""
+    """Adjancency list-based
+    vertices are given compact ids 0..n-1 local to the graph, in their order
+    - keys optionally gives an external key for each vertex
+    - undirected: the two edgenodes of an edge share a copy of its
+    attributes (see SharedEdgenode), directed: edgenodes copy them - the
+    edges given are never written to
+    - with a schema, edgenodes are schema.Edgenode or schema.SharedEdgenode instances
+    - version is incremented by each change of the vertices or edges:
+    NodeLists and traversals built at an earlier version are stale
+    - snapshot() returns a read-only copy in O(1), which later changes
+    made through the methods of the graph do not reach"""
     def __init__(self,
                  vertices: Sequence[Vertex],
                  edges: Sequence[Edge],
-                 directed: bool=False):
+                 directed: bool=False,
+                 keys: Sequence[Hashable]=None,
+                 schema: GraphSchema=None):
         self.nb_vertices = len(vertices)
         self.nb_edges = len(edges) if directed else 2*len(edges)
         self.directed = directed
-        # create nodelists
+        self.schema = schema
+        edgenode_class = self._edgenode_class()
+        # create nodelists - all of them share the indices of adjacency_lists
         self.adjacency_lists = NodeList(vertices=vertices)
         for vertex in vertices:
             self.adjacency_lists[vertex] = AdjacencyList(head=vertex)
-        self.parent_edges = NodeList(vertices=vertices)
+        self.parent_edges = NodeList(vertices=self.adjacency_lists)
         # build adjacency lists
         for edge in edges:
-            self.adjacency_lists[edge.head].connect(edge)
-            if not directed:
-                self.adjacency_lists[edge.tail].connect(edge)
+            if directed:
+                self.adjacency_lists[edge.head].connect(edge, edgenode_class)
+            else:
+                record = _edge_record(edge)
+                self.adjacency_lists[edge.head].connect(record, edgenode_class, tail=edge.tail)
+                self.adjacency_lists[edge.tail].connect(record, edgenode_class, tail=edge.head)
+        self.key_ids = _key_ids(keys, self.nb_vertices)
+        # key of each vertex id, to update key_ids when ids move
+        self._keys = list(keys) if keys is not None else None
+        self.version = 0
+        self._reverse = None
+        self._edge_columns = None
+        self._vertex_columns = None
+        # ids of the adjacency lists and edgenodes created since the last
+        # snapshot, which can be changed in place - None if no snapshot
+        self._owned = None
+        self._table_owned = True
+
+    def _edgenode_class(self) -> type:
+        if self.schema is not None:
+            return self.schema.Edgenode if self.directed else self.schema.SharedEdgenode
+        return Edgenode if self.directed else SharedEdgenode
+
+    def _changed(self):
+        self.version += 1
+        self._reverse = None
+        self._edge_columns = None
+        self._vertex_columns = None
+
+    def snapshot(self):
+        """O(1) - read-only view on the graph as it is: the graph and the
+        snapshot share everything, until the graph changes
+        then, the first change copies the vertex table in O(n) - lists and
+        dicts of pointers, copied in C - and each change copies the adjacency
+        lists it modifies: readers of the snapshot, e.g. on other threads,
+        keep seeing a consistent version while the graph is written
+        - edge attributes are only copied by set_edge_attributes: the ones
+        set directly on edgenodes, by EdgeColumns.store or by materialized
+        traversals reach the snapshot too
+        - edge handles returned before the snapshot still work, in
+        O(degree) once their adjacency lists are copied"""
+        snapshot = GraphSnapshot.__new__(GraphSnapshot)
+        snapshot.__dict__.update(self.__dict__)
+        # the columns are updated in place: each keeps its own
+        snapshot._edge_columns = snapshot._vertex_columns = None
+        self._owned = set()
+        self._table_owned = False
+        return snapshot
+
+    def _own_table(self):
+        """copies the vertex table shared with a snapshot"""
+        if self._table_owned:
+            return
+        adjacency_lists = NodeList(vertices=[])
+        adjacency_lists.indices = dict(self.adjacency_lists.indices)
+        adjacency_lists.vertices = list(self.adjacency_lists.vertices)
+        adjacency_lists.values = list(self.adjacency_lists.values)
+        parent_edges = NodeList(vertices=adjacency_lists)
+        parent_edges.values = list(self.parent_edges.values)
+        self.adjacency_lists, self.parent_edges = adjacency_lists, parent_edges
+        self.key_ids = dict(self.key_ids)
+        self._keys = list(self._keys) if self._keys is not None else None
+        self._table_owned = True
+
+    def _own_list(self, vertex: Vertex) -> AdjacencyList:
+        """adjacency list of the vertex, copied if shared with a snapshot"""
+        adjacency_list = self.adjacency_lists[vertex]
+        if self._owned is not None and id(adjacency_list) not in self._owned:
+            self._own_table()
+            adjacency_list = adjacency_list.copy()
+            self.adjacency_lists[vertex] = adjacency_list
+            self._owned.add(id(adjacency_list))
+        return adjacency_list
+
+    def _connection(self, adjacency_list: AdjacencyList, node: DoublyLinkedListNode) -> tuple:
+        """(adjacency list, list node) of a handle, in the current adjacency
+        list of its head: O(degree) if the list has been copied since"""
+        head = adjacency_list.head
+        # the edgenodes of a removed vertex are gone with its adjacency list
+        current = self.adjacency_lists[head] if head in self.adjacency_lists else None
+        if current is None or current.lineage != adjacency_list.lineage:
+            raise KeyError(head)
+        if current is adjacency_list:
+            if node.next is None:
+                raise ValueError('Edge already removed')
+            return current, node
+        return current, current.find_edgenode(node.item)
+
+    def _own_node(self, adjacency_list: AdjacencyList, node: DoublyLinkedListNode) -> tuple:
+        """the list node in the adjacency list, copied if shared with a snapshot"""
+        owned = self._own_list(adjacency_list.head)
+        return owned, node if owned is adjacency_list else owned.find_edgenode(node.item)
+
+    def add_vertex(self, vertex: Vertex, key: Hashable=None) -> int:
+        """O(1) amortized - returns the id of the vertex, i.e. nb_vertices - 1"""
+        if vertex in self.adjacency_lists:
+            raise ValueError(f'{vertex} already in graph')
+        self._own_table()
+        vertex_id = self.nb_vertices
+        adjacency_list = AdjacencyList(head=vertex)
+        if self._owned is not None:
+            self._owned.add(id(adjacency_list))
+        self.adjacency_lists.indices[vertex] = vertex_id
+        self.adjacency_lists.vertices.append(vertex)
+        self.adjacency_lists.values.append(adjacency_list)
+        self.parent_edges.values.append(None)
+        if key is not None or self._keys is not None:
+            self._keys = [None] * vertex_id if self._keys is None else self._keys
+            self._keys.append(key)
+            if key is not None:
+                self.key_ids[key] = vertex_id
+        self.nb_vertices += 1
+        self._changed()
+        return vertex_id
+
+    def add_edge(self, edge: Edge) -> EdgeHandle:
+        """O(1) - returns the handle to remove the edge in O(1)"""
+        edgenode_class = self._edgenode_class()
+        connections = []
+        record = edge if self.directed else _edge_record(edge)
+        ends = ((edge.head, edge.tail),) if self.directed else ((edge.head, edge.tail), (edge.tail, edge.head))
+        for head, tail in ends:
+            adjacency_list = self._own_list(head)
+            node = adjacency_list.connect(record, edgenode_class, tail=tail)
+            if self._owned is not None:
+                self._owned.add(id(node.item))
+            connections.append((adjacency_list, node))
+        self.nb_edges += len(connections)
+        self._changed()
+        return EdgeHandle(edge=edge, connections=connections)
 
-    def find_path(self, start: Vertex, end: Vertex):
-        """return the path from start to end vertices as a graph"""
+    def remove_edge(self, edge: Union[EdgeHandle, Edge]):
+        """O(1) given the handle returned by add_edge
+        O(degree of head and tail) given an edge: the first edgenode from
+        edge.head to edge.tail, and its mate if undirected, are removed"""
+        if isinstance(edge, EdgeHandle):
+            for adjacency_list, node in [self._connection(*connection) for connection in edge.connections]:
+                adjacency_list, node = self._own_node(adjacency_list, node)
+                adjacency_list.disconnect(node)
+            nb_edgenodes = len(edge.connections)
+        else:
+            ends = ((edge.head, edge.tail),) if self.directed else ((edge.head, edge.tail), (edge.tail, edge.head))
+            for head, tail in ends:
+                adjacency_list = self._own_list(head)
+                adjacency_list.disconnect(adjacency_list.find(tail))
+            nb_edgenodes = len(ends)
+        self.nb_edges -= nb_edgenodes
+        self._changed()
+
+    def remove_vertex(self, vertex: Vertex):
+        """removes the vertex and its edges - the last vertex takes its id
+        O(sum of the degrees of its neighbours) if undirected, O(n + m) if directed:
+        the edges entering the vertex have to be searched for"""
+        vertex_id = self.adjacency_lists.indices[vertex]
+        self._own_table()
+        adjacency_lists = self.adjacency_lists
+        adjacency_list = adjacency_lists[vertex]
+        nb_edgenodes = adjacency_list.degree
+        if self.directed:
+            neighbours = [a for a in adjacency_lists.values if a is not adjacency_list]
+            if self._owned is not None:
+                # only the lists changed are copied
+                neighbours = [self._own_list(a.head) for a in neighbours
+                              if any(e.tail is vertex for e in a.edgenodes)]
+        else:
+            neighbours = [self._own_list(e.tail) for e in adjacency_list.edgenodes if e.tail is not vertex]
+        for neighbour in neighbours:
+            node = neighbour.edgenodes.head
+            while node.item is not None:
+                next_node = node.next
+                if node.item.tail is vertex:
+                    neighbour.disconnect(node)
+                    nb_edgenodes += 1
+                    # undirected: one mate per edgenode of the vertex
+                    if not self.directed:
+                        break
+                node = next_node
+        # the last vertex takes the id of the removed one
+        last_id = self.nb_vertices - 1
+        last_vertex = adjacency_lists.vertices[last_id]
+        for nodelist in (adjacency_lists, self.parent_edges):
+            nodelist.values[vertex_id] = nodelist.values[last_id]
+            nodelist.values.pop()
+        adjacency_lists.vertices[vertex_id] = last_vertex
+        adjacency_lists.vertices.pop()
+        adjacency_lists.indices[last_vertex] = vertex_id
+        del adjacency_lists.indices[vertex]
+        if self._keys is not None:
+            if self._keys[vertex_id] is not None:
+                del self.key_ids[self._keys[vertex_id]]
+            self._keys[vertex_id] = self._keys[last_id]
+            self._keys.pop()
+            if vertex_id < last_id and self._keys[vertex_id] is not None:
+                self.key_ids[self._keys[vertex_id]] = vertex_id
+        self.nb_vertices -= 1
+        self.nb_edges -= nb_edgenodes
+        self._changed()
+
+    def set_edge_attributes(self, edge: Union[EdgeHandle, Edge], **attributes):
+        """O(1) given the handle returned by add_edge
+        O(degree of head and tail) given an edge, as remove_edge
+        sets the attributes of the edgenodes of the edge - shared by both
+        ends if undirected
+        the edge given is left untouched: the edge of a handle is replaced
+        by an updated copy
+        the edgenodes shared with a snapshot are replaced by updated copies"""
+        if isinstance(edge, EdgeHandle):
+            connections = [self._connection(*connection) for connection in edge.connections]
+        else:
+            adjacency_list = self.adjacency_lists[edge.head]
+            node = adjacency_list.find(edge.tail)
+            connections = [(adjacency_list, node)]
+            if not self.directed:
+                mate_list = self.adjacency_lists[edge.tail]
+                connections.append((mate_list, mate_list.find_mate(node.item)))
+        edgenode = connections[0][1].item
+        if self._owned is None or id(edgenode) in self._owned:
+            for name, value in attributes.items():
+                setattr(edgenode, name, value)
+        else:
+            if self.directed:
+                edgenodes = [copy.copy(edgenode)]
+            else:
+                record = copy.copy(edgenode.edge)
+                edgenodes = [type(node.item)(head=adjacency_list.head, edge=record, tail=node.item.tail)
+                             for adjacency_list, node in connections]
+            for name, value in attributes.items():
+                setattr(edgenodes[0], name, value)
+            connections = [self._own_node(*connection) for connection in connections]
+            for (adjacency_list, node), new_edgenode in zip(connections, edgenodes):
+                node.item = new_edgenode
+                self._owned.add(id(new_edgenode))
+            if isinstance(edge, EdgeHandle):
+                edge.connections = connections
+            # the columns list the former edgenodes
+            self._edge_columns = None
+        if isinstance(edge, EdgeHandle):
+            edge.edge = copy.copy(edge.edge)
+            for name, value in attributes.items():
+                setattr(edge.edge, name, value)
+
+    def vertex_id(self, vertex: Vertex) -> int:
+        """O(1)"""
+        return self.adjacency_lists.indices[vertex]
+
+    def vertex(self, vertex_id: int) -> Vertex:
+        """O(1)"""
+        return self.adjacency_lists.vertices[vertex_id]
+
+    def key_id(self, key: Hashable) -> int:
+        """O(1) - id of the vertex of given external key"""
+        return self.key_ids[key]
+
+    def reverse_adjacency(self) -> List[list]:
+        """O(n + m) at first call, then cached until the graph changes (see version)
+        for each vertex id, the (head, edgenode) of the edges entering the vertex
+        - of an undirected graph, the mates of the edgenodes of the vertex"""
+        if self._reverse is None:
+            indices = self.adjacency_lists.indices
+            self._reverse = [[] for i in range(self.nb_vertices)]
+            for vertex in self.adjacency_lists:
+                for edgenode in self.adjacency_lists[vertex].edgenodes:
+                    self._reverse[indices[edgenode.tail]].append((vertex, edgenode))
+        return self._reverse
+
+    def in_degree(self, vertex: Vertex) -> int:
+        """O(1) - of a directed graph, read from reverse_adjacency(), which
+        is built in O(n + m) at the first call after a change"""
+        if not self.directed:
+            return self.adjacency_lists[vertex].degree
+        return len(self.reverse_adjacency()[self.adjacency_lists.indices[vertex]])
+
+    def edge_columns(self) -> EdgeColumns:
+        """O(n + m) at first call, then cached until the graph changes (see version)
+        columns of the edge attributes, e.g. edge_columns()['weight'], see
+        EdgeColumns - the edges of an undirected graph are listed once"""
+        if self._edge_columns is None:
+            self._edge_columns = EdgeColumns.from_graph(self)
+        return self._edge_columns
+
+    def vertex_columns(self) -> Columns:
+        """O(n) at first call, then cached until the graph changes (see version)
+        columns of the vertex attributes, indexed by vertex id"""
+        if self._vertex_columns is None:
+            self._vertex_columns = Columns(items=list(self.adjacency_lists.vertices))
+        return self._vertex_columns
+
+    def memory_report(self) -> dict:
+        """O(n + m) - bytes held by the graph, by component:
+        - vertices: vertex objects with their attributes
+        - adjacency_nodes: adjacency lists, their list nodes and the edgenodes
+        - edge_attributes: attributes of the edges - undirected: the shared
+        edges, directed: the __dict__ of the edgenodes, which copy them
+        - nodelists: adjacency_lists and parent_edges, indices included
+        - keys: key_ids and the key of each vertex id, not the keys themselves
+        - reverse_adjacency: the cache, if built
+        - columns: the edge and vertex columns, if built
+        and total; an object is counted once, in the first component
+        referencing it - see sys.getsizeof for what is left out"""
+        sizes = _MemorySizes()
+        report = dict.fromkeys(('vertices', 'adjacency_nodes', 'edge_attributes',
+                                'nodelists', 'keys', 'reverse_adjacency', 'columns'), 0)
+        vertices = self.adjacency_lists.vertices
+        report['vertices'] = sum(sizes.item(v) for v in vertices)
+        for vertex in vertices:
+            adjacency_list = self.adjacency_lists[vertex]
+            edgenodes = adjacency_list.edgenodes
+            report['adjacency_nodes'] += sizes(adjacency_list, adjacency_list.__dict__,
+                                               edgenodes, edgenodes.__dict__, edgenodes._nil)
+            node = edgenodes.head
+            while node is not edgenodes._nil:
+                edgenode = node.item
+                report['adjacency_nodes'] += sizes(node, edgenode)
+                report['edge_attributes'] += sizes.item(getattr(edgenode, 'edge', edgenode))
+                node = node.next
+        nodelists = (self.adjacency_lists, self.parent_edges)
+        report['nodelists'] = sum(sizes(n, n.__dict__, n.indices, n.vertices, n.values) for n in nodelists)
+        report['nodelists'] += sum(sizes.item(e) for e in self.parent_edges.values if e is not None)
+        report['keys'] = sizes(self.key_ids, self._keys)
+        if self._reverse is not None:
+            report['reverse_adjacency'] = sizes(self._reverse) + sum(
+                sizes(entries) + sum(sizes(entry) for entry in entries) for entries in self._reverse)
+        for columns in (self._edge_columns, self._vertex_columns):
+            if columns is not None:
+                report['columns'] += sizes(columns, columns.__dict__, columns.items, columns._columns,
+                                           getattr(columns, 'heads', None), getattr(columns, 'tails', None))
+                report['columns'] += sum(sizes(columns[name]) for name in columns)
+        report['total'] = sum(report.values())
+        return report
+
+    @classmethod
+    def estimate_memory(cls,
+                        nb_vertices: int,
+                        nb_edges: int,
+                        directed: bool=False,
+                        schema: GraphSchema=None,
+                        vertex_attributes: dict=None,
+                        edge_attributes: dict=None,
+                        keys: bool=False) -> dict:
+        """O(1) - memory_report of a graph of nb_vertices vertices and
+        nb_edges edges, to size a process before loading the graph
+        vertex_attributes and edge_attributes give an example value of each
+        attribute, e.g. {'weight': 1.0}
+        the bytes per vertex and per edge of each component are measured on
+        small sample graphs, then scaled: the dicts and lists holding the
+        vertices grow by steps, so the estimate is off by a few percents"""
+        vertex_attributes, edge_attributes = vertex_attributes or {}, edge_attributes or {}
+        vertex_class = schema.Vertex if schema is not None else Vertex
+        edge_class = schema.Edge if schema is not None else Edge
+
+        def fresh(attributes: dict) -> dict:
+            # the attribute values of a graph are distinct objects
+            return pickle.loads(pickle.dumps(attributes))
+
+        def sample_report(nb_sample_edges: int) -> dict:
+            vertices = [vertex_class(**fresh(vertex_attributes)) for i in range(_SAMPLE_VERTICES)]
+            edges = [edge_class(vertices[i % _SAMPLE_VERTICES], vertices[(7 * i + 1) % _SAMPLE_VERTICES],
+                                **fresh(edge_attributes))
+                     for i in range(nb_sample_edges)]
+            return cls(vertices=vertices, edges=edges, directed=directed, schema=schema,
+                       keys=range(_SAMPLE_VERTICES) if keys else None).memory_report()
+
+        vertices_report = sample_report(0)
+        edges_report = sample_report(_SAMPLE_EDGES)
+        report = {name: round(vertices_report[name] * nb_vertices / _SAMPLE_VERTICES
+                              + (edges_report[name] - vertices_report[name]) * nb_edges / _SAMPLE_EDGES)
+                  for name in vertices_report if name != 'total'}
+        report['total'] = sum(report.values())
+        return report
+
+    def traversal(self, start: Vertex=None) -> Traversal:
+        """a new per-call traversal context on this graph"""
+        return Traversal(graph=self, start=start)
+
+    def shortest_unweighted_path(self, start: Vertex, end: Vertex) -> Path:
+        """bidirectional BFS: only the vertices around start and end are visited
+        returns the vertices and the edges of a path with the fewest edges
+        - for directed graphs, the backward search runs on the reverse adjacency,
+        built at first call
+        raises a PathError if end can not be reached"""
+        adjacency_lists = self.adjacency_lists
+        indices, vertices = adjacency_lists.indices, adjacency_lists.vertices
+
+        # edges are given as (head, tail, edgenode): edgenode is None for the
+        # edges of undirected graphs found backwards, i.e. from their tail
+        def successors(vertex_id: int):
+            vertex = vertices[vertex_id]
+            for edgenode in adjacency_lists[vertex].edgenodes:
+                yield indices[edgenode.tail], (vertex, edgenode.tail, edgenode)
+
+        def predecessors(vertex_id: int):
+            vertex = vertices[vertex_id]
+            if self.directed:
+                for head, edgenode in self.reverse_adjacency()[vertex_id]:
+                    yield indices[head], (head, vertex, edgenode)
+            else:
+                for edgenode in adjacency_lists[vertex].edgenodes:
+                    yield indices[edgenode.tail], (edgenode.tail, vertex, None)
+
+        def to_edge(head: Vertex, tail: Vertex, edgenode: Edgenode) -> Edge:
+            if edgenode is None:
+                edgenode = next(e for e in adjacency_lists[head].edgenodes if e.tail is tail)
+            return edgenode.to_edge(head=head)
+
+        path = bidirectional_bfs(start=indices[start], end=indices[end],
+                                 successors=successors, predecessors=predecessors)
+        if path is None:
+            raise PathError(f'No path found between {start} and {end}')
+        vertex_ids, edges = path
+        return Path(vertices=[vertices[i] for i in vertex_ids],
+                    edges=[to_edge(*edge) for edge in edges])
+
+    def find_path(self, start: Vertex, end: Vertex, traversal: Traversal=None):
+        """return the path from start to end vertices as a graph
+        parents are read from traversal if given, else from parent_edges"""
+        parent_edge = traversal.parent_edge if traversal is not None else self.parent_edges.__getitem__
         vertice_stack = Stack(implementation='linked_list')
         edge_stack = Stack(implementation='linked_list')
         for i in range(self.nb_vertices):
             vertice_stack.push(end)
             if end is start:
                 break
-            edge = self.parent_edges[end]
+            edge = parent_edge(end)
             if edge:
                 edge_stack.push(edge)
                 end = edge.head
@@ -157,7 +876,7 @@ class Graph:
             except StackEmptyError:
                 break
 
-        return Graph(vertices=vertices, edges=edges, directed=True)
+        return Graph(vertices=vertices, edges=edges, directed=True, schema=self.schema)
 
     def bfs(self,
             start: Vertex,
@@ -166,16 +885,19 @@ class Graph:
             process_edge: Callable[[Vertex, Edgenode], Any]=None,
             discovered_vertices: NodeList=None,
             processed_vertices: NodeList=None,
-            is_edge_processable: Callable[[Vertex, Edgenode], bool]=None):
+            is_edge_processable: Callable[[Vertex, Edgenode], bool]=None,
+            materialize: bool=True):
         """Breadth-First Search
-        returns the graph of processed vertices - one single connected component"""
-        process_vertex_early = process_vertex_early if process_vertex_early else lambda v: None
-        process_vertex_late = process_vertex_late if process_vertex_late else lambda v: None
-        process_edge = process_edge if process_edge else lambda v, e: None
-        is_edge_processable = is_edge_processable if is_edge_processable else lambda v, e: True
-
-        vertices = [v for v in self.adjacency_lists]
-        self.parent_edges = NodeList(vertices=vertices)  # reinit parents
+        returns the graph of processed vertices - one single connected component
+        - with materialize=False, returns a Traversal instead: parent_edges is
+        left untouched and no edge nor graph is built"""
+        vertices = self.adjacency_lists
+        indices = vertices.indices
+        traversal = self.traversal(start=start)
+        visited, parents, parent_edgenodes, order = (traversal.visited, traversal.parents,
+                                                     traversal.parent_edgenodes, traversal.order)
+        if materialize:
+            self.parent_edges = NodeList(vertices=vertices)  # reinit parents
         discovered = NodeList(vertices=vertices) if discovered_vertices is None else discovered_vertices  # added to stack
         processed = NodeList(vertices=vertices) if processed_vertices is None else processed_vertices  # processed and out of stack
         discovered[start] = True
@@ -187,28 +909,45 @@ class Graph:
                 vertex = queue.dequeue()
             except QueueEmptyError:
                 break
+            vertex_id = indices[vertex]
             processed[vertex] = True
-            process_vertex_early(vertex)
+            visited[vertex_id] = 1
+            order.append(vertex_id)
+            if process_vertex_early is not None:
+                process_vertex_early(vertex)
             adjacency_list = self.adjacency_lists[vertex]
             for edgenode in adjacency_list.edgenodes:
-                if is_edge_processable(vertex, edgenode):
+                if is_edge_processable is None or is_edge_processable(vertex, edgenode):
                     next_vertex = edgenode.tail
-                    if not processed[next_vertex] or self.directed:
+                    if process_edge is not None and (not processed[next_vertex] or self.directed):
                         process_edge(vertex, edgenode)
                     if not discovered[next_vertex]:
                         discovered[next_vertex] = True
-                        self.parent_edges[next_vertex] = edgenode.to_edge(head=vertex)
+                        next_id = indices[next_vertex]
+                        parents[next_id] = vertex_id
+                        parent_edgenodes[next_id] = edgenode
+                        if materialize:
+                            self.parent_edges[next_vertex] = edgenode.to_edge(head=vertex)
                         queue.enqueue(next_vertex)
-            process_vertex_late(vertex)
-        processed_vertices = [v for v in processed if processed[v]]
-        processed_edges = []
-        for processed_vertex in processed_vertices:
-            adjacency_list = self.adjacency_lists[processed_vertex]
-            for edgenode in adjacency_list.edgenodes:
-                processed_edges.append(edgenode.to_edge(head=processed_vertex))
-        return Graph(vertices=processed_vertices,
-                     edges=processed_edges,
-                     directed=self.directed)
+            if process_vertex_late is not None:
+                process_vertex_late(vertex)
+        if not materialize:
+            return traversal
+        if processed_vertices is None:
+            return self._subgraph(sorted(order))
+        return self._subgraph([indices[v] for v in processed if processed[v]])
+
+    def _subgraph(self, vertex_ids: Sequence[int]):
+        """graph induced by the vertices of given ids"""
+        vertices = [self.vertex(i) for i in vertex_ids]
+        return Graph(vertices=vertices,
+                     edges=_induced_edges(self, vertices),
+                     directed=self.directed,
+                     schema=self.schema)
+
+    def view(self, vertex_ids: Sequence[int]=None, is_edge_processable: Callable[[Vertex, Edgenode], bool]=None):
+        """O(1), O(k) given k vertex ids - see SubgraphView"""
+        return SubgraphView(graph=self, vertex_ids=vertex_ids, is_edge_processable=is_edge_processable)
 
     def dfs(self,
             start: Vertex,
@@ -216,21 +955,32 @@ class Graph:
             process_vertex_late: Callable[[Vertex], Any]=None,
             process_edge: Callable[[Vertex, Edgenode], Any]=None,
             discovered_vertices: NodeList=None,
-            processed_vertices: NodeList=None):
+            processed_vertices: NodeList=None,
+            traversal: Traversal=None,
+            materialize: bool=True) -> Traversal:
         """Depth-First Search
         returns entry and exit times for each vertex
         - a vertex v1 is an ancestor of vertex v2 if the time interval of v2 is
         nested in the one of v1
-        - the nb of descendants of a vertex v1 is half its time interval"""
-        process_vertex_early = process_vertex_early if process_vertex_early else lambda v: None
-        process_vertex_late = process_vertex_late if process_vertex_late else lambda v: None
-        process_edge = process_edge if process_edge else lambda v, e: None
-
-        vertices = [v for v in self.adjacency_lists]
-        self.parent_edges = NodeList(vertices=vertices)  # reinit parents
-        discovered = NodeList(vertices=vertices) if discovered_vertices is None else discovered_vertices  # added to stack
-        processed = NodeList(vertices=vertices) if processed_vertices is None else processed_vertices  # processed and out of stack
-        discovered[start] = True
+        - the nb of descendants of a vertex v1 is half its time interval
+        times, parents and edge types are kept in the returned traversal,
+        given one to share it with the callbacks or across calls
+        - with materialize=True, they are also written on the vertices,
+        on the edgenodes and in parent_edges
+        - with materialize=False, the graph is left untouched"""
+        vertices = self.adjacency_lists
+        indices = vertices.indices
+        traversal = self.traversal(start=start) if traversal is None else traversal
+        parents, parent_edgenodes, order = traversal.parents, traversal.parent_edgenodes, traversal.order
+        entry_times, exit_times = traversal.entry_times, traversal.exit_times
+        if materialize:
+            self.parent_edges = NodeList(vertices=vertices)  # reinit parents
+        discovered = _vertex_flags(discovered_vertices, indices=indices, vertices=vertices.vertices,
+                                   default=traversal.discovered)  # added to stack
+        processed = _vertex_flags(processed_vertices, indices=indices, vertices=vertices.vertices,
+                                  default=traversal.visited)  # processed and out of stack
+        discovered[indices[start]] = True
+        traversal.discovered[indices[start]] = True
 
         class StackItem:
             def __init__(self, vertex: Vertex, status=0, iter_edgenodes=None):
@@ -241,17 +991,22 @@ class Graph:
         stack = Stack(implementation='linked_list')
         stack.push(StackItem(vertex=start))
 
-        counter = 0
         while True:
             try:
                 stack_item = stack.pop()
             except StackEmptyError:
                 break
+            vertex = stack_item.vertex
+            vertex_id = indices[vertex]
             if not stack_item.status:
-                stack_item.vertex.entry_time = counter
-                counter += 1
-                stack_item.iter_edgenodes = iter(self.adjacency_lists[stack_item.vertex].edgenodes)
-                process_vertex_early(stack_item.vertex)
+                entry_times[vertex_id] = traversal.time
+                if materialize:
+                    vertex.entry_time = traversal.time
+                traversal.time += 1
+                order.append(vertex_id)
+                stack_item.iter_edgenodes = iter(self.adjacency_lists[vertex].edgenodes)
+                if process_vertex_early is not None:
+                    process_vertex_early(vertex)
                 stack_item.status = 1
             if stack_item.status == 1:
                 while True:
@@ -262,36 +1017,279 @@ class Graph:
                         stack_item.status = 2
                         stack.push(stack_item)
                         break
+                    next_id = indices[next_vertex]
                     # if undiscovered vertex: add it to stack
-                    if not discovered[next_vertex]:
-                        discovered[next_vertex] = True
+                    if not discovered[next_id]:
+                        discovered[next_id] = True
+                        traversal.discovered[next_id] = True
                         stack.push(stack_item)
                         # tree edge
-                        edgenode.edgetype = EdgeType.TREE
+                        edgetype = EdgeType.TREE
                         # the parent of the next_vertex is the head of the edge,
                         # i.e., stack_item.vertex
-                        self.parent_edges[next_vertex] = edgenode.to_edge(head=stack_item.vertex)
-                        process_edge(stack_item.vertex, edgenode)
-                        stack.push(StackItem(vertex=next_vertex))
-                        break
+                        parents[next_id] = vertex_id
+                        parent_edgenodes[next_id] = edgenode
+                        if materialize:
+                            self.parent_edges[next_vertex] = edgenode.to_edge(head=vertex)
                     # if discovered vertex, then it has been put in stack before
                     # if it is still unprocessed, then it is still in the stack, so no need to add it
                     # if it has been processed but the graph is directed, the edge has not been processed yet
                     # in both case, the edge needs to be processed
                     # but it is a "back edge", the parent of the next_vertex is already known
-                    elif not processed[next_vertex] or self.directed:
-                        # discovered but not processed
-                        if not processed[next_vertex]:
-                            edgenode.edgetype = EdgeType.BACK
-                        # discovered, processed but earlier entry time
-                        elif stack_item.vertex.entry_time < next_vertex.entry_time:
-                            edgenode.edgetype = EdgeType.FORWARD
-                        # discovered, processed but later entry time
-                        else:
-                            edgenode.edgetype = EdgeType.CROSS
-                        process_edge(stack_item.vertex, edgenode)
+                    elif not processed[next_id] or self.directed:
+                        edgetype = _edgetype(entry_times, vertex_id, next_id, processed)
+                    else:
+                        continue
+                    traversal.edgetype = edgetype
+                    # undirected: the edge back to the parent is the tree edge, whose
+                    # shared record keeps its type
+                    if materialize and (self.directed or
+                                        edgenode.edge is not getattr(parent_edgenodes[vertex_id], 'edge', None)):
+                        edgenode.edgetype = edgetype
+                    if process_edge is not None:
+                        process_edge(vertex, edgenode)
+                    if edgetype is EdgeType.TREE:
+                        stack.push(StackItem(vertex=next_vertex))
+                        break
             elif stack_item.status == 2:
-                process_vertex_late(stack_item.vertex)
-                processed[stack_item.vertex] = True
-                stack_item.vertex.exit_time = counter
-                counter += 1
+                if process_vertex_late is not None:
+                    process_vertex_late(vertex)
+                processed[vertex_id] = True
+                traversal.visited[vertex_id] = 1
+                exit_times[vertex_id] = traversal.time
+                if materialize:
+                    vertex.exit_time = traversal.time
+                traversal.time += 1
+        return traversal
+
+    def iter_bfs(self, start: Vertex, traversal: Traversal=None, edges: bool=True) -> Iterator[Event]:
+        """Breadth-First Search as a stream of events: the consumer may stop at any point
+        - DISCOVER and FINISH for each vertex, in BFS order
+        - TREE_EDGE and NON_TREE_EDGE for the edges bfs would process, unless edges=False
+        the state is only kept in traversal, as with bfs(materialize=False)"""
+        vertices = self.adjacency_lists
+        indices = vertices.indices
+        traversal = self.traversal(start=start) if traversal is None else traversal
+        discovered, processed = traversal.discovered, traversal.visited
+        parents, parent_edgenodes = traversal.parents, traversal.parent_edgenodes
+        # the queue is the processing order and a read index
+        queue = traversal.order
+        first = len(queue)
+        discovered[indices[start]] = True
+        queue.append(indices[start])
+        while first < len(queue):
+            vertex_id = queue[first]
+            first += 1
+            vertex = vertices.vertices[vertex_id]
+            processed[vertex_id] = True
+            yield Event(EventType.DISCOVER, vertex)
+            for edgenode in vertices[vertex].edgenodes:
+                next_id = indices[edgenode.tail]
+                if not discovered[next_id]:
+                    discovered[next_id] = True
+                    parents[next_id] = vertex_id
+                    parent_edgenodes[next_id] = edgenode
+                    queue.append(next_id)
+                    if edges:
+                        yield Event(EventType.TREE_EDGE, vertex, edgenode)
+                elif edges and (not processed[next_id] or self.directed):
+                    yield Event(EventType.NON_TREE_EDGE, vertex, edgenode)
+            yield Event(EventType.FINISH, vertex)
+
+    def iter_dfs(self, start: Vertex, traversal: Traversal=None, edges: bool=True) -> Iterator[Event]:
+        """Depth-First Search as a stream of events: the consumer may stop at any point
+        - DISCOVER at entry time and FINISH at exit time of each vertex
+        - TREE_EDGE, BACK_EDGE, FORWARD_EDGE and CROSS_EDGE for the edges dfs
+        would process, unless edges=False
+        the state is only kept in traversal, as with dfs(materialize=False)"""
+        vertices = self.adjacency_lists
+        indices = vertices.indices
+        traversal = self.traversal(start=start) if traversal is None else traversal
+        discovered, processed = traversal.discovered, traversal.visited
+        parents, parent_edgenodes, order = traversal.parents, traversal.parent_edgenodes, traversal.order
+        entry_times, exit_times = traversal.entry_times, traversal.exit_times
+        discovered[indices[start]] = True
+        # stack of the vertices being processed, with their edgenode iterators
+        stack = [(start, None)]
+        while stack:
+            vertex, edgenodes = stack[-1]
+            vertex_id = indices[vertex]
+            if edgenodes is None:
+                entry_times[vertex_id] = traversal.time
+                traversal.time += 1
+                order.append(vertex_id)
+                edgenodes = iter(vertices[vertex].edgenodes)
+                stack[-1] = (vertex, edgenodes)
+                yield Event(EventType.DISCOVER, vertex)
+            for edgenode in edgenodes:
+                next_id = indices[edgenode.tail]
+                if not discovered[next_id]:
+                    discovered[next_id] = True
+                    parents[next_id] = vertex_id
+                    parent_edgenodes[next_id] = edgenode
+                    traversal.edgetype = EdgeType.TREE
+                    stack.append((edgenode.tail, None))
+                    if edges:
+                        yield Event(EventType.TREE_EDGE, vertex, edgenode)
+                    break
+                elif not processed[next_id] or self.directed:
+                    traversal.edgetype = _edgetype(entry_times, vertex_id, next_id, processed)
+                    if edges:
+                        yield Event(EDGE_EVENTS[traversal.edgetype], vertex, edgenode)
+            else:
+                # all edges explored
+                stack.pop()
+                processed[vertex_id] = True
+                exit_times[vertex_id] = traversal.time
+                traversal.time += 1
+                yield Event(EventType.FINISH, vertex)
+
+
+def _read_only(graph, *args, **kwargs):
+    raise TypeError(f'{type(graph).__name__} is read-only')
+
+
+def _induced_edges(graph, vertices: Sequence[Vertex]) -> List[Edge]:
+    """edges of graph between the vertices - once each if undirected: from
+    the end of lower id, the edgenodes of the self-loops being paired"""
+    indices = {v: i for i, v in enumerate(vertices)}
+    edges = []
+    for head_id, vertex in enumerate(vertices):
+        loop = False
+        for edgenode in graph.adjacency_lists[vertex].edgenodes:
+            tail_id = indices.get(edgenode.tail)
+            if tail_id is None or (not graph.directed and tail_id < head_id):
+                continue
+            if not graph.directed and tail_id == head_id:
+                loop = not loop
+                if not loop:
+                    continue
+            edges.append(edgenode.to_edge(head=vertex))
+    return edges
+
+
+class GraphSnapshot(Graph):
+    """read-only version of a Graph, returned by Graph.snapshot
+    - traversals are read-only with materialize=False: dfs otherwise sets
+    the edgetype of the edgenodes, shared with the graph"""
+    add_vertex = add_edge = remove_edge = remove_vertex = set_edge_attributes = _read_only
+
+    def snapshot(self):
+        """O(1) - the snapshot itself"""
+        return self
+
+
+class SubgraphView(Graph):
+    """read-only view on graph - of any type - restricted to the vertices
+    of given ids, all if None, and to the edges between them for which
+    is_edge_processable(head, edgenode) holds, all if None
+    nothing is copied: the edgenodes of graph are filtered as they are
+    scanned, so bfs, dfs, paths, shortest paths and applications run on
+    the view as on a Graph - materialize() builds a standalone graph
+    - the vertices are given ids 0..k-1 in the order of vertex_ids, the
+    ids of graph if all its vertices are kept
+    - undirected: is_edge_processable should accept both edgenodes of an
+    edge, or none
+    - a view on a Graph is stale once it changes, as its NodeLists"""
+    def __init__(self, graph, vertex_ids: Sequence[int]=None,
+                 is_edge_processable: Callable[[Vertex, Edgenode], bool]=None):
+        self.graph = graph
+        self.is_edge_processable = is_edge_processable
+        self.directed = graph.directed
+        self.schema = getattr(graph, 'schema', None)
+        self.adjacency_lists = SubgraphNodeList(view=self, vertex_ids=vertex_ids)
+        self.vertex_ids = vertex_ids if vertex_ids is not None else range(graph.nb_vertices)
+        self.nb_vertices = len(self.vertex_ids)
+        self.parent_edges = NodeList(vertices=self.adjacency_lists)
+        self.key_ids = getattr(graph, 'key_ids', {}) if vertex_ids is None else {}
+        self._keys = None
+        self.version = 0
+        self._reverse = None
+        self._edge_columns = None
+        self._vertex_columns = None
+        self._owned = None
+        self._table_owned = True
+
+    @property
+    def nb_edges(self) -> int:
+        """O(n + m) - edgenodes of the view, counted at each access"""
+        return sum(self.adjacency_lists[v].degree for v in self.adjacency_lists)
+
+    def materialize(self):
+        """O(n + m) - the graph of the same type as the viewed one"""
+        return self._subgraph(range(self.nb_vertices))
+
+    def _subgraph(self, vertex_ids: Sequence[int]):
+        vertices = [self.vertex(i) for i in vertex_ids]
+        if self.is_edge_processable is None:
+            graph = self.graph
+            return graph._subgraph([graph.vertex_id(v) for v in vertices])
+        graph = self.graph
+        while isinstance(graph, SubgraphView):
+            graph = graph.graph
+        # the class of the viewed graph defining the constructor, e.g. Graph for a snapshot
+        graph_class = next(c for c in type(graph).__mro__ if '__init__' in vars(c))
+        kwargs = {'schema': self.schema} if self.schema is not None else {}
+        return graph_class(vertices=vertices, edges=_induced_edges(self, vertices), directed=self.directed, **kwargs)
+
+    def snapshot(self):
+        """O(1) - the view itself"""
+        return self
+
+    add_vertex = add_edge = remove_edge = remove_vertex = set_edge_attributes = _read_only
+
+
+class SubgraphAdjacencyList:
+    """edgenodes of the adjacency list of the viewed graph kept by the view"""
+    __slots__ = ('head', '_view', '_adjacency_list')
+
+    def __init__(self, view: SubgraphView, adjacency_list):
+        self.head = adjacency_list.head
+        self._view = view
+        self._adjacency_list = adjacency_list
+
+    @property
+    def edgenodes(self) -> Iterator:
+        head, is_edge_processable = self.head, self._view.is_edge_processable
+        # only the tails of induced views are looked up
+        indices = self._view.adjacency_lists.indices if self._view.adjacency_lists.induced else None
+        for edgenode in self._adjacency_list.edgenodes:
+            if indices is not None and edgenode.tail not in indices:
+                continue
+            if is_edge_processable is None or is_edge_processable(head, edgenode):
+                yield edgenode
+
+    @property
+    def degree(self) -> int:
+        """O(degree in the viewed graph)"""
+        if self._view.is_edge_processable is None and not self._view.adjacency_lists.induced:
+            return self._adjacency_list.degree
+        return sum(1 for edgenode in self.edgenodes)
+
+
+class SubgraphNodeList:
+    """vertex -> adjacency list of the viewed graph, restricted to the view"""
+    def __init__(self, view: SubgraphView, vertex_ids: Sequence[int]=None):
+        self._view = view
+        adjacency_lists = view.graph.adjacency_lists
+        self.induced = vertex_ids is not None
+        if self.induced:
+            self.vertices = [view.graph.vertex(i) for i in vertex_ids]
+            self.indices = {v: i for i, v in enumerate(self.vertices)}
+        else:
+            self.vertices, self.indices = adjacency_lists.vertices, adjacency_lists.indices
+
+    def __getitem__(self, key: Vertex) -> SubgraphAdjacencyList:
+        if key not in self.indices:
+            raise KeyError(key)
+        return SubgraphAdjacencyList(view=self._view, adjacency_list=self._view.graph.adjacency_lists[key])
+
+    def __contains__(self, key: Vertex) -> bool:
+        return key in self.indices
+
+    def __iter__(self):
+        for v in self.vertices:
+            yield v
+
+    def __len__(self) -> int:
+        return len(self.vertices)
@@ -4,6 +4,7 @@ from datastructures import KeyedItem, Heap, UnionFind
 from sorting import quicksort
 
 from .graph import Graph, Vertex, Edge, NodeList
+from .columns import edge_columns
 from .exceptions import GraphDirectionTypeError
 
 
@@ -71,8 +72,8 @@ def run_prim_algorithm(graph: Graph, start: Vertex) -> Graph:
                 if new_weight < weight:
                     weight = new_weight
                     edge = edgenode.to_edge(head=deleted_vertex)
-                vertex_item = KeyedItem(key=weight,
-                                        content=ItemContent(vertex=vertex, edge=edge))
+                vertex_item.key = weight
+                vertex_item.content = ItemContent(vertex=vertex, edge=edge)
                 # insert it back into the heap
                 heap.insert(vertex_item)
 
@@ -104,27 +105,27 @@ def run_kruskal_algorithm(graph: Graph) -> Graph:
     vertices = [v for v in graph.adjacency_lists]  # O(n)
     union_find = UnionFind(graph.adjacency_lists)  # O(n)
 
-    # sort edges by cost
+    # sort edges by cost, read from the weight column: the edges of the
+    # tree only are built
     # O(n + m)
-    edges = []
-    for vertex in vertices:
-        for edgenode in graph.adjacency_lists[vertex].edgenodes:
-            edges.append(KeyedItem(key=edgenode.weight,
-                                   content=edgenode.to_edge(head=vertex)))
+    columns = edge_columns(graph)
+    weights, heads, tails = columns.load('weight'), columns.heads, columns.tails
+    edges = [KeyedItem(key=weights[i], content=i) for i in range(len(columns))]
     # O(m * log m)
     quicksort(edges)
 
     mst_edges = []
     for edge_item in edges:  # m times
-        edge = edge_item.content
-        if union_find.find(edge.head) is not union_find.find(edge.tail):  # O(1)
-            mst_edges.append(edge)
+        i = edge_item.content
+        head, tail = vertices[heads[i]], vertices[tails[i]]
+        if union_find.find(head) is not union_find.find(tail):  # O(1)
+            mst_edges.append(columns.items[i].to_edge(head=head))
             # this one is tricky:
             # each of the n vertices has its union-find group updated at most log2(n)
             # since for it to be updated, it has to double in size
             # so in total, there are O(m) cycle checks
             # but there are O(n * log n) union-find group updates
-            union_find.union(edge.head, edge.tail)
+            union_find.union(head, tail)
 
     return Graph(vertices=vertices,
                  edges=mst_edges,
@@ -0,0 +1,127 @@
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from multiprocessing import Pool, cpu_count
+
+from .graph import Vertex
+from .csr_graph import CSRGraph, CSRTraversal
+from .shared import SharedArrays
+
+
+# arrays of the graph, attached once by each worker
+_shared = None
+
+
+def _attach(spec: dict):
+    global _shared
+    _shared = SharedArrays.attach(spec)
+
+
+def _expand(frontier: bytes, level: int, shared: SharedArrays=None) -> bytes:
+    """top-down step from a chunk of the frontier
+    claims the undiscovered tails: two workers may claim the same vertex
+    at the same level, then both return it and its parent is fixed once
+    the level is over"""
+    shared = _shared if shared is None else shared
+    offsets, targets = shared['offsets'], shared['targets']
+    parents, positions, distances = shared['parents'], shared['positions'], shared['distances']
+    next_frontier = array('i')
+    for index in array('i', frontier):
+        for position in range(offsets[index], offsets[index + 1]):
+            next_index = targets[position]
+            if distances[next_index] < 0:
+                distances[next_index] = level + 1
+                parents[next_index] = index
+                positions[next_index] = position
+                next_frontier.append(next_index)
+    return next_frontier.tobytes()
+
+
+class ParallelBFS:
+    """level-synchronous Breadth-First Search, each frontier being split
+    across a pool of processes
+    the graph arrays are copied once into shared memory, and are shared
+    with no copy by the workers along with the parent and distance arrays
+    - use as a context manager: the pool and the shared memory are released on exit
+    - frontiers smaller than min_chunk are expanded in this process"""
+    def __init__(self, graph: CSRGraph, processes: int=None, min_chunk: int=4096):
+        nb_vertices = graph.nb_vertices
+        self.graph = graph
+        self.min_chunk = min_chunk
+        self.shared = SharedArrays(arrays={
+            'offsets': array('q', graph.offsets),
+            'targets': array('i', graph.targets),
+            'parents': array('q', [-1]) * nb_vertices,
+            'positions': array('q', [-1]) * nb_vertices,
+            'distances': array('q', [-1]) * nb_vertices,
+        })
+        self.processes = processes if processes is not None else cpu_count()
+        self.pool = Pool(processes=self.processes, initializer=_attach, initargs=(self.shared.spec,))
+
+    def run(self, start: Vertex) -> (CSRTraversal, array):
+        """O(n + m) work in total, split across the workers
+        returns the traversal - order is a level order, parents form a BFS tree -
+        and the distance of each vertex to start, -1 if unreached
+        distances are the ones of bfs, parents may differ among the
+        vertices of the previous level"""
+        graph, shared = self.graph, self.shared
+        nb_vertices = graph.nb_vertices
+        for name in ('parents', 'positions', 'distances'):
+            shared[name][:] = array('q', [-1]) * nb_vertices
+        start_index = graph.vertex_id(start)
+        shared['distances'][start_index] = 0
+        order = array('i', [start_index])
+        frontier = order.tobytes()
+        level = 0
+        while frontier:
+            nb_chunks = min(4 * self.processes, len(frontier) // (4 * self.min_chunk))
+            if nb_chunks > 1:
+                chunk_size = -(-len(frontier) // (4 * nb_chunks)) * 4
+                chunks = [frontier[i:i + chunk_size] for i in range(0, len(frontier), chunk_size)]
+                claimed = array('i', b''.join(self.pool.starmap(_expand, [(chunk, level) for chunk in chunks])))
+                # drop the vertices claimed by several workers
+                next_frontier = array('i', dict.fromkeys(claimed))
+                if len(next_frontier) < len(claimed):
+                    self._fix_parents(claimed)
+                next_frontier = next_frontier.tobytes()
+            else:
+                next_frontier = _expand(frontier, level, shared=shared)
+            order.frombytes(next_frontier)
+            frontier = next_frontier
+            level += 1
+
+        traversal = graph.traversal(start=start)
+        traversal.parents = array('q', shared['parents'])
+        traversal.parent_edgenodes = array('q', shared['positions'])
+        traversal.order = array('q', order)
+        for index in order:
+            traversal.visited[index] = True
+        traversal.discovered[:] = traversal.visited
+        return traversal, array('q', shared['distances'])
+
+    def _fix_parents(self, claimed: array):
+        """the parent and position writes of workers claiming the same vertex
+        may interleave: the parent is recomputed from the position, which
+        is a single write"""
+        offsets, parents, positions = self.shared['offsets'], self.shared['parents'], self.shared['positions']
+        for index, count in Counter(claimed).items():
+            if count > 1:
+                parents[index] = bisect_right(offsets, positions[index]) - 1
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        self.shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def parallel_bfs(graph: CSRGraph, start: Vertex, processes: int=None) -> (CSRTraversal, array):
+    """one-off ParallelBFS run: the pool and the shared memory are set up
+    for this call only, prefer a ParallelBFS for repeated queries"""
+    with ParallelBFS(graph=graph, processes=processes) as bfs:
+        return bfs.run(start=start)
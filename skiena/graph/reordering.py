@@ -0,0 +1,137 @@
+"""vertex reordering for cache locality
+an order lists the old vertex ids in their new order; reorder relabels the
+vertices along an order and rebuilds the adjacency storage
+- 'rcm': reverse Cuthill-McKee, gives a small bandwidth: neighbours get
+close ids, so traversals read close positions of the arrays
+- 'degree': by decreasing degree, the hubs first
+- 'bfs': BFS order, component after component
+directed graphs are ordered along their out-edges"""
+from array import array
+from typing import Sequence, List, Union
+
+from .graph import Graph
+from .csr_graph import CSRGraph
+from .bitset_graph import BitsetGraph, _rows, _bit_indices
+from .compressed_graph import CompressedGraph
+
+
+def _neighbour_ids(graph) -> List[Sequence]:
+    """ids of the tails of the edges leaving each vertex id"""
+    if isinstance(graph, CSRGraph):
+        offsets, targets = graph.offsets, graph.targets
+        return [targets[offsets[i]:offsets[i + 1]] for i in range(graph.nb_vertices)]
+    if isinstance(graph, BitsetGraph):
+        return [list(_bit_indices(row)) for row in graph.rows]
+    if isinstance(graph, CompressedGraph):
+        return [graph.neighbour_ids(i) for i in range(graph.nb_vertices)]
+    indices = graph.adjacency_lists.indices
+    return [[indices[edgenode.tail] for edgenode in graph.adjacency_lists[vertex].edgenodes]
+            for vertex in graph.adjacency_lists]
+
+
+def degree_order(graph) -> array:
+    """O(n log n + m) - by decreasing degree, ties kept in id order"""
+    degrees = [len(neighbours) for neighbours in _neighbour_ids(graph)]
+    return array('q', sorted(range(graph.nb_vertices), key=lambda i: -degrees[i]))
+
+
+def bfs_order(graph) -> array:
+    """O(n + m) - BFS from the vertex of id 0, then from the first
+    unreached vertex of each other component"""
+    return _bfs_order(_neighbour_ids(graph), roots=range(graph.nb_vertices))
+
+
+def reverse_cuthill_mckee_order(graph) -> array:
+    """O(m log(max degree) + n log n) - each component is ordered by a BFS
+    from a vertex of least degree, visiting the neighbours by increasing
+    degree, then the whole order is reversed"""
+    neighbours = _neighbour_ids(graph)
+    degrees = [len(tails) for tails in neighbours]
+    sorted_neighbours = [sorted(tails, key=degrees.__getitem__) for tails in neighbours]
+    roots = sorted(range(graph.nb_vertices), key=degrees.__getitem__)
+    order = _bfs_order(sorted_neighbours, roots=roots)
+    order.reverse()
+    return order
+
+
+def _bfs_order(neighbours: List[Sequence], roots) -> array:
+    """BFS order of all the vertices, a new BFS starting from each root not reached yet"""
+    reached = bytearray(len(neighbours))
+    order = array('q')
+    for root in roots:
+        if reached[root]:
+            continue
+        reached[root] = 1
+        first = len(order)
+        order.append(root)
+        while first < len(order):
+            for tail in neighbours[order[first]]:
+                if not reached[tail]:
+                    reached[tail] = 1
+                    order.append(tail)
+            first += 1
+    return order
+
+
+ORDERS = {
+    'rcm': reverse_cuthill_mckee_order,
+    'degree': degree_order,
+    'bfs': bfs_order,
+}
+
+
+def reorder(graph: Union[Graph, CSRGraph, BitsetGraph, CompressedGraph], method: str='rcm') -> tuple:
+    """O(n + m) plus the cost of the order
+    returns a graph of the same class, whose vertex of id new_ids[i] is
+    the vertex of id i in graph, and new_ids: results indexed by the ids of
+    the new graph are mapped back with result[new_ids[i]]
+    the vertices, keys and edge attributes are kept"""
+    if method not in ORDERS:
+        raise ValueError(f'Unknown method {method}')
+    order = ORDERS[method](graph)
+    new_ids = array('q', [0]) * graph.nb_vertices
+    for new_id, vertex_id in enumerate(order):
+        new_ids[vertex_id] = new_id
+    vertices = [graph.vertex(vertex_id) for vertex_id in order]
+
+    if isinstance(graph, CSRGraph):
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        new_offsets = array('q', [0])
+        new_targets = array('i')
+        new_weights = array('d') if weights is not None else None
+        for vertex_id in order:
+            start, end = offsets[vertex_id], offsets[vertex_id + 1]
+            new_targets.extend(new_ids[target] for target in targets[start:end])
+            if weights is not None:
+                new_weights.extend(weights[start:end])
+            new_offsets.append(len(new_targets))
+        new_graph = CSRGraph.from_arrays(vertices=vertices, offsets=new_offsets, targets=new_targets,
+                                         weights=new_weights, directed=graph.directed)
+    elif isinstance(graph, BitsetGraph):
+        heads, tails = array('i'), array('i')
+        for new_id, vertex_id in enumerate(order):
+            for tail in _bit_indices(graph.rows[vertex_id]):
+                heads.append(new_id)
+                tails.append(new_ids[tail])
+        new_graph = BitsetGraph.from_rows(vertices=vertices, directed=graph.directed,
+                                          rows=_rows(graph.nb_vertices, heads, tails, directed=True))
+    elif isinstance(graph, CompressedGraph):
+        neighbours = _neighbour_ids(graph)
+        new_graph = CompressedGraph.__new__(CompressedGraph)
+        new_graph._initialize(vertices, *CompressedGraph._encode_lists(
+            [[new_ids[tail] for tail in neighbours[vertex_id]] for vertex_id in order]), graph.directed)
+    else:
+        # the edges are copied in the new order; the two edgenodes of an
+        # undirected edge share it, so it is copied once
+        edges, copied = [], set()
+        for vertex in vertices:
+            for edgenode in graph.adjacency_lists[vertex].edgenodes:
+                if graph.directed or id(edgenode.edge) not in copied:
+                    if not graph.directed:
+                        copied.add(id(edgenode.edge))
+                    edges.append(edgenode.to_edge(head=vertex))
+        new_graph = Graph(vertices=vertices, edges=edges, directed=graph.directed, schema=graph.schema)
+        if graph._keys is not None:
+            new_graph._keys = [graph._keys[vertex_id] for vertex_id in order]
+    new_graph.key_ids = {key: new_ids[vertex_id] for key, vertex_id in graph.key_ids.items()}
+    return new_graph, new_ids
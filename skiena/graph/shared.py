@@ -0,0 +1,61 @@
+from array import array
+from multiprocessing import shared_memory
+from typing import Dict
+
+
+class SharedArrays:
+    """typed arrays stored in multiprocessing shared memory blocks
+    - created from arrays: their content is copied once, the creator owns
+    the blocks and unlinks them on close
+    - attached from the spec of the creator, in any process: no copy
+    arrays are accessed by name as memoryviews of their typecode"""
+    def __init__(self, arrays: Dict[str, array]=None, spec: dict=None):
+        self._blocks = {}
+        self._views = {}
+        self._owner = spec is None
+        if spec is None:
+            spec = {}
+            for name, values in arrays.items():
+                # a block can not be empty
+                block = shared_memory.SharedMemory(create=True, size=max(1, len(values) * values.itemsize))
+                spec[name] = (block.name, values.typecode, len(values))
+                self._blocks[name] = block
+                self._attach(name, values.typecode, len(values))[:] = values
+        else:
+            for name, (block_name, typecode, length) in spec.items():
+                self._blocks[name] = shared_memory.SharedMemory(name=block_name)
+                self._attach(name, typecode, length)
+        self.spec = spec
+
+    def _attach(self, name: str, typecode: str, length: int) -> memoryview:
+        itemsize = array(typecode).itemsize
+        self._views[name] = self._blocks[name].buf[:length * itemsize].cast(typecode)
+        return self._views[name]
+
+    @classmethod
+    def attach(cls, spec: dict):
+        """attach the arrays of given spec, created in another process"""
+        return cls(spec=spec)
+
+    def __getitem__(self, name: str) -> memoryview:
+        return self._views[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._views
+
+    def close(self):
+        """release the views and the blocks - unlink them if created here"""
+        for view in self._views.values():
+            view.release()
+        self._views = {}
+        for block in self._blocks.values():
+            block.close()
+            if self._owner:
+                block.unlink()
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
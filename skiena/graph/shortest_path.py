@@ -1,8 +1,10 @@
 from math import inf
 
-from datastructures import KeyedItem, Heap, Stack, StackEmptyError
+from datastructures import KeyedItem, Heap
 
 from .graph import Graph, Vertex, Edge, NodeList, Edgenode
+from .columns import edge_columns
+from .traversal import Traversal
 from .exceptions import *
 
 
@@ -126,12 +128,18 @@ def run_floyd_warshall_algorithm(graph: Graph) -> NodeList:
         distances[vertex] = NodeList(vertices=graph.adjacency_lists,
                                      default=inf)
         distances[vertex][vertex] = 0
-        for edgenode in graph.adjacency_lists[vertex].edgenodes:
-            tail = edgenode.tail
-            if edgenode.weight < 0:
-                raise GraphTypeError
-            if edgenode.weight < distances[vertex][tail]:
-                distances[vertex][tail] = edgenode.weight 
+    # the weights are read from the weight column, by vertex ids
+    columns = edge_columns(graph)
+    weights, heads, tails = columns.load('weight'), columns.heads, columns.tails
+    rows = [row.values for row in distances.values]
+    for i in range(len(columns)):
+        weight = weights[i]
+        if weight < 0:
+            raise GraphTypeError
+        ends = ((heads[i], tails[i]),) if columns.directed else ((heads[i], tails[i]), (tails[i], heads[i]))
+        for head, tail in ends:
+            if weight < rows[head][tail]:
+                rows[head][tail] = weight
 
     for v_k in distances:
         for v_i in distances:
@@ -148,90 +156,65 @@ def find_network_flow(graph: Graph,
                       source: Vertex,
                       sink: Vertex) -> [float, Graph]:
     # initialize by creating residual graph
-    edges = []
+    # residual edges are plain Edges: the edges of graph may not accept these attributes
+    residual_graph = Graph(vertices=[v for v in graph.adjacency_lists],
+                           edges=[],
+                           directed=True)
     for vertex in graph.adjacency_lists:
         for edgenode in graph.adjacency_lists[vertex].edgenodes:
-            edge = edgenode.to_edge(head=vertex)
-            edge.flow = 0
-            edge.residual = edgenode.weight
-            edge.opposite = None
-            edges.append(edge)
-            opposite_edge = edgenode.to_edge(head=vertex)
-            opposite_edge.head, opposite_edge.tail = opposite_edge.tail, opposite_edge.head
-            opposite_edge.flow = 0
-            opposite_edge.residual = 0
-            opposite_edge.opposite = edge
-            edge.opposite = opposite_edge
-            edges.append(opposite_edge)
-    graph = Graph(vertices=[v for v in graph.adjacency_lists],
-                  edges=edges,
-                  directed=True)
+            edge = Edge(head=vertex, tail=edgenode.tail, weight=edgenode.weight, flow=0, residual=edgenode.weight)
+            opposite_edge = Edge(head=edgenode.tail, tail=vertex, weight=edgenode.weight, flow=0, residual=0)
+            # the opposites are the edgenodes of the residual graph, which
+            # copy the attributes of the edges: augment_path updates them
+            (adjacency_list, node), = residual_graph.add_edge(edge).connections
+            (opposite_adjacency_list, opposite_node), = residual_graph.add_edge(opposite_edge).connections
+            node.item.opposite = opposite_node.item
+            opposite_node.item.opposite = node.item
+    graph = residual_graph
 
     def is_edge_processable(head: Vertex, edgenode: Edgenode):
         return True if edgenode.residual > 0 else False
 
-    def calculate_path_volume(graph: Graph,
+    def calculate_path_volume(traversal: Traversal,
                               start: Vertex,
                               end: Vertex) -> float:
-        stack = Stack(implementation='linked_list')
-        parent_edges = graph.parent_edges
-        while True:
-            edge = parent_edges[end]
-            if edge:
-                stack.push(edge)
-                end = edge.head
-                if end is start:
-                    break
-            else:
-                return 0
+        if end not in traversal:
+            return 0
         volume = inf
-        while True:
-            try:
-                volume = min(volume, stack.pop().residual)
-            except StackEmptyError:
-                break
+        while end is not start:
+            volume = min(volume, traversal.parent_edgenode(end).residual)
+            end = traversal.parent(end)
         return volume
 
-    def augment_path(graph: Graph,
+    def augment_path(traversal: Traversal,
                      start: Vertex,
                      end: Vertex,
                      volume: float):
-        stack = Stack(implementation='linked_list')
-        parent_edges = graph.parent_edges
-        while True:
-            edge = parent_edges[end]
-            if edge:
-                stack.push(edge)
-                end = edge.head
-                if end is start:
-                    break
-            else:
-                break
-        while True:
-            try:
-                edge = stack.pop()
-            except StackEmptyError:
-                break
-            else:
-                edge.edgenode.flow += volume
-                edge.edgenode.residual -= volume
-                edge.edgenode.opposite.residual += volume
-
-    graph.bfs(start=source,
-              is_edge_processable=is_edge_processable)  # get parent_edges at each BFS
+        while end is not start:
+            edgenode = traversal.parent_edgenode(end)
+            edgenode.flow += volume
+            edgenode.residual -= volume
+            edgenode.opposite.residual += volume
+            end = traversal.parent(end)
+
+    # the parents of each BFS are read from its traversal: no subgraph is built
+    traversal = graph.bfs(start=source,
+                          is_edge_processable=is_edge_processable,
+                          materialize=False)
     volume = 0
-    new_volume = calculate_path_volume(graph=graph,
+    new_volume = calculate_path_volume(traversal=traversal,
                                        start=source,
                                        end=sink)
     while new_volume > 0:
         volume += new_volume
-        augment_path(graph=graph,
+        augment_path(traversal=traversal,
                      start=source,
                      end=sink,
                      volume=new_volume)
-        graph.bfs(start=source,
-                  is_edge_processable=is_edge_processable)  # get parent_edges at each BFS
-        new_volume = calculate_path_volume(graph=graph,
+        traversal = graph.bfs(start=source,
+                              is_edge_processable=is_edge_processable,
+                              materialize=False)
+        new_volume = calculate_path_volume(traversal=traversal,
                                            start=source,
                                            end=sink)
 
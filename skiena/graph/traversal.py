@@ -0,0 +1,151 @@
+from array import array
+from enum import Enum
+from typing import NamedTuple, Any, Callable, Iterator, List, Tuple
+
+
+class EventType(Enum):
+    DISCOVER = 1  # processing of the vertex starts
+    TREE_EDGE = 2  # the edge discovers its tail
+    BACK_EDGE = 3
+    FORWARD_EDGE = 4
+    CROSS_EDGE = 5
+    NON_TREE_EDGE = 6  # BFS edge to an already discovered vertex
+    FINISH = 7  # all the edges of the vertex are processed
+
+
+class Event(NamedTuple):
+    """vertex is the head of the edge for edge events"""
+    eventtype: EventType
+    vertex: Any
+    edgenode: Any = None
+
+
+class Path(NamedTuple):
+    """vertices from start to end, and the edges between them"""
+    vertices: List[Any]
+    edges: List[Any]
+
+
+def bidirectional_bfs(start: int,
+                      end: int,
+                      successors: Callable[[int], Iterator[Tuple[int, Any]]],
+                      predecessors: Callable[[int], Iterator[Tuple[int, Any]]]) -> (List[int], List[Any]):
+    """searches from both ends, expanding one BFS level of the smaller
+    frontier at a time, until the frontiers meet
+    - successors(id) yields (id, edge) for the edges leaving the vertex
+    - predecessors(id) yields (id, edge) for the edges entering the vertex
+    only the vertices around start and end are visited, in dicts
+    returns the vertex ids and the edges of a path with the fewest edges,
+    None if end can not be reached"""
+    if start == end:
+        return [start], []
+    # id -> (parent id, edge from the parent, distance) from start
+    forward = {start: (None, None, 0)}
+    # id -> (child id, edge to the child, distance) to end
+    backward = {end: (None, None, 0)}
+    forward_frontier, backward_frontier = [start], [end]
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting = _bfs_level(forward_frontier, forward, backward, successors)
+            if meeting is not None:
+                head, tail, edge = meeting
+        else:
+            backward_frontier, meeting = _bfs_level(backward_frontier, backward, forward, predecessors)
+            if meeting is not None:
+                tail, head, edge = meeting
+        if meeting is not None:
+            vertex_ids, edges = [], []
+            vertex_id = head
+            while vertex_id is not None:
+                vertex_ids.append(vertex_id)
+                vertex_id, parent_edge, distance = forward[vertex_id]
+                if parent_edge is not None:
+                    edges.append(parent_edge)
+            vertex_ids.reverse()
+            edges.reverse()
+            edges.append(edge)
+            vertex_id = tail
+            while vertex_id is not None:
+                vertex_ids.append(vertex_id)
+                vertex_id, child_edge, distance = backward[vertex_id]
+                if child_edge is not None:
+                    edges.append(child_edge)
+            return vertex_ids, edges
+    return None
+
+
+def _bfs_level(frontier: List[int], seen: dict, other_seen: dict, neighbours) -> (List[int], tuple):
+    """expands a whole level, so that the meeting vertex closest to the
+    other end is found: the path through it is a shortest one
+    returns the next frontier and the meeting edge, if any"""
+    next_frontier = []
+    meeting, meeting_distance = None, None
+    for vertex_id in frontier:
+        distance = seen[vertex_id][2] + 1
+        for next_id, edge in neighbours(vertex_id):
+            if next_id in other_seen:
+                if meeting is None or other_seen[next_id][2] < meeting_distance:
+                    meeting, meeting_distance = (vertex_id, next_id, edge), other_seen[next_id][2]
+            elif next_id not in seen:
+                seen[next_id] = (vertex_id, edge, distance)
+                next_frontier.append(next_id)
+    return next_frontier, meeting
+
+
+class Traversal:
+    """state and result of a traversal from start, with no edge nor graph built
+    it is the per-call context of a traversal: several traversals can run on
+    the same graph at once, nothing is written on its vertices or edgenodes
+    arrays are indexed by the vertex ids of the graph
+    - visited: 1 for the vertices processed by the traversal
+    - discovered: 1 for the vertices reached by the traversal
+    - parents: id of the parent of each vertex, -1 if none
+    - parent_edgenodes: edgenode leading from the parent to each vertex
+    - order: ids of the processed vertices, in processing order
+    - entry_times, exit_times: DFS times, -1 if none
+    - edgetype: DFS type of the edge being processed
+    a DFS given an existing traversal goes on with its state and its clock"""
+    def __init__(self, graph, start=None):
+        nb_vertices = graph.nb_vertices
+        self.graph = graph
+        self.start = start
+        self.visited = bytearray(nb_vertices)
+        self.discovered = bytearray(nb_vertices)
+        self.parents = array('q', [-1]) * nb_vertices
+        self.parent_edgenodes = [None] * nb_vertices
+        self.order = array('q')
+        self.entry_times = array('q', [-1]) * nb_vertices
+        self.exit_times = array('q', [-1]) * nb_vertices
+        self.time = 0
+        self.edgetype = None
+        self._subgraph = None
+
+    def __contains__(self, vertex) -> bool:
+        return bool(self.visited[self.graph.vertex_id(vertex)])
+
+    def entry_time(self, vertex) -> int:
+        return self.entry_times[self.graph.vertex_id(vertex)]
+
+    def exit_time(self, vertex) -> int:
+        return self.exit_times[self.graph.vertex_id(vertex)]
+
+    def parent(self, vertex):
+        """O(1) - None for the start vertex or an unreached vertex"""
+        parent_id = self.parents[self.graph.vertex_id(vertex)]
+        return self.graph.vertex(parent_id) if parent_id >= 0 else None
+
+    def parent_edgenode(self, vertex):
+        """O(1) - the edgenode of the graph itself, not a copy"""
+        return self.parent_edgenodes[self.graph.vertex_id(vertex)]
+
+    def parent_edge(self, vertex):
+        """O(1) - builds the edge, as found in graph.parent_edges"""
+        parent = self.parent(vertex)
+        return self.parent_edgenode(vertex).to_edge(head=parent) if parent is not None else None
+
+    @property
+    def subgraph(self):
+        """view on the processed vertices, built at first access (see SubgraphView)"""
+        if self._subgraph is None:
+            self._subgraph = self.graph.view(vertex_ids=sorted(self.order))
+        return self._subgraph
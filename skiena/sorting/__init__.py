@@ -2,4 +2,4 @@ from .n_square import insertion_sort
 from .heapsort import heapsort
 from .mergesort import mergesort
 from .quicksort import quicksort
-from .non_comparison_based import radixsort, countsort, bucketsort
+from .non_comparison_based import radixsort, countsort, countsort_order, bucketsort
@@ -1,4 +1,5 @@
-from typing import List
+from array import array
+from typing import List, Sequence
 
 from datastructures import KeyedItem, LinkedList
 from .n_square import insertion_sort
@@ -78,6 +79,26 @@ def countsort(items: List[KeyedItem], order=None) -> List[KeyedItem]:
     return sorted_items
 
 
+def countsort_order(keys: Sequence[int], nb_values: int, positions: Sequence[int]=None) -> array:
+    """Stable counting sort of positions, with no item built
+    O(k+n) where each key is in 0..k-1 (k=nb_values)
+    returns the positions 0..n-1 sorted by keys[position]
+    - positions: the order to start from, e.g. the result of a previous
+    pass: passes from the least significant key to the most significant
+    one make a radix sort on composite keys"""
+    counter = array('q', [0]) * (nb_values + 1)
+    for key in keys:
+        counter[key + 1] += 1
+    for i in range(nb_values):
+        counter[i + 1] += counter[i]
+    sorted_positions = array('q', [0]) * len(keys)
+    for position in positions if positions is not None else range(len(keys)):
+        key = keys[position]
+        sorted_positions[counter[key]] = position
+        counter[key] += 1
+    return sorted_positions
+
+
 def bucketsort(items: List[KeyedItem], order=None) -> List[KeyedItem]:
     """Non-comparison-based sorting algorithm
     average is theta(n) when the distribution is uniform"""
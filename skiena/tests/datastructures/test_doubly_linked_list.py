@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from datastructures import DoublyLinkedList
@@ -72,3 +74,25 @@ def test_delete_fail():
         doubly_linked_list.insert(i)
     with pytest.raises(FileNotFoundError):
         doubly_linked_list.delete('d')
+
+
+def test_delete_node():
+    doubly_linked_list = DoublyLinkedList()
+    nodes = [doubly_linked_list.insert(i) for i in 'abc']
+    doubly_linked_list.delete_node(nodes[1])
+    assert [i for i in doubly_linked_list] == ['c', 'a']
+    with pytest.raises(ValueError):
+        doubly_linked_list.delete_node(nodes[1])
+    doubly_linked_list.delete_node(nodes[0])
+    doubly_linked_list.delete_node(nodes[2])
+    assert [i for i in doubly_linked_list] == []
+    assert doubly_linked_list.head.item is None
+
+
+def test_pickle():
+    doubly_linked_list = DoublyLinkedList()
+    for i in range(5000):
+        doubly_linked_list.insert(i)
+    unpickled_list = pickle.loads(pickle.dumps(doubly_linked_list))
+    assert [i for i in unpickled_list] == [i for i in doubly_linked_list]
+    assert unpickled_list.tail.item == 0
@@ -1,3 +1,4 @@
+import pickle
 import pytest
 
 from datastructures import LinkedList
@@ -81,3 +82,12 @@ def test_iterate():
     for i in linked_list:
         j += 1
         assert i == 'abc'[::-1][j]
+
+
+def test_pickle():
+    linked_list = LinkedList()
+    for i in range(5000):
+        linked_list.insert(i)
+    unpickled_list = pickle.loads(pickle.dumps(linked_list))
+    assert [i for i in unpickled_list] == [i for i in linked_list]
+    assert unpickled_list.tail.item == 0
@@ -0,0 +1,75 @@
+import sys
+from array import array
+
+import pytest
+
+from graph import Vertex, Edge, CSRGraph
+from graph import binary_format
+from graph.shortest_path import *
+
+
+def weighted_graph(directed):
+    vertices = [Vertex() for i in range(4)]
+    edges = [
+        Edge(head=vertices[0], tail=vertices[1], weight=4),
+        Edge(head=vertices[0], tail=vertices[2], weight=1),
+        Edge(head=vertices[2], tail=vertices[1], weight=2),
+        Edge(head=vertices[1], tail=vertices[3], weight=1),
+    ]
+    return CSRGraph(vertices=vertices, edges=edges, directed=directed)
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+@pytest.mark.parametrize('directed', [False, True])
+def test_save_and_load(tmp_path, use_mmap, directed):
+    graph = weighted_graph(directed)
+    path = str(tmp_path / 'graph.bin')
+    graph.save(path)
+    loaded = CSRGraph.load(path, use_mmap=use_mmap)
+    assert loaded.directed == directed
+    assert (loaded.nb_vertices, loaded.nb_edges) == (graph.nb_vertices, graph.nb_edges)
+    assert list(loaded.offsets) == list(graph.offsets)
+    assert list(loaded.targets) == list(graph.targets)
+    assert list(loaded.weights) == list(graph.weights)
+    assert isinstance(loaded.targets, memoryview) == use_mmap
+
+    vertices = [loaded.vertex(i) for i in range(loaded.nb_vertices)]
+    traversal = loaded.bfs(start=vertices[0], materialize=False)
+    assert sorted(traversal.order) == [0, 1, 2, 3]
+    shortest_paths = run_dijkstra_algorithm(graph=loaded, source=vertices[0])
+    assert [shortest_paths[v].distance for v in vertices] == [0, 3, 1, 4]
+
+
+def test_load_given_vertices_and_keys(tmp_path):
+    path = str(tmp_path / 'graph.bin')
+    vertices = [Vertex() for i in range(3)]
+    CSRGraph(vertices=vertices, edges=[Edge(vertices[0], vertices[2])], directed=True).save(path)
+    loaded = CSRGraph.load(path, vertices=vertices, keys=['a', 'b', 'c'])
+    assert loaded.weights is None
+    assert loaded.vertex(loaded.key_id('c')) is vertices[2]
+    assert [e.tail for e in loaded.adjacency_lists[vertices[0]].edgenodes] == [vertices[2]]
+    with pytest.raises(ValueError):
+        CSRGraph.load(path, vertices=vertices[:2])
+
+
+def test_load_other_byte_order(tmp_path):
+    path = str(tmp_path / 'graph.bin')
+    offsets, targets, weights = array('q', [0, 1, 1]), array('i', [1]), array('d', [2.5])
+    for values in (offsets, targets, weights):
+        values.byteswap()
+    flags = binary_format.DIRECTED | binary_format.WEIGHTED | binary_format.BIG_ENDIAN * (sys.byteorder == 'little')
+    with open(path, 'wb') as f:
+        f.write(binary_format.HEADER.pack(binary_format.MAGIC, binary_format.VERSION, flags, 2, 1))
+        f.write(offsets.tobytes() + targets.tobytes() + bytes(4) + weights.tobytes())
+    loaded = CSRGraph.load(path)
+    assert list(loaded.offsets) == [0, 1, 1]
+    assert list(loaded.targets) == [1]
+    assert list(loaded.weights) == [2.5]
+
+
+def test_load_invalid_file(tmp_path):
+    path = str(tmp_path / 'graph.bin')
+    with open(path, 'wb') as f:
+        f.write(bytes(binary_format.HEADER.size))
+    with pytest.raises(ValueError):
+        CSRGraph.load(path)
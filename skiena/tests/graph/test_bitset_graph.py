@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from graph import Vertex, Edge, Graph, CSRGraph, BitsetGraph, GraphBuilder
+from graph.applications import *
+
+
+def test_bitset_rows():
+    vertices = [Vertex() for i in range(4)]
+    edges = [
+        Edge(vertices[0], vertices[1]),
+        Edge(vertices[0], vertices[2]),
+        Edge(vertices[0], vertices[2]),
+        Edge(vertices[2], vertices[3]),
+    ]
+    graph = BitsetGraph(vertices=vertices, edges=edges, directed=True)
+    assert graph.rows == [0b0110, 0, 0b1000, 0]
+    # parallel edges merge
+    assert graph.nb_edges == 3
+    assert graph.has_edge(vertices[0], vertices[2]) and not graph.has_edge(vertices[2], vertices[0])
+    assert graph.adjacency_lists[vertices[0]].degree == graph.degree(vertices[0]) == 2
+    assert [e.tail for e in graph.adjacency_lists[vertices[0]].edgenodes] == vertices[1:3]
+    undirected_graph = BitsetGraph(vertices=vertices, edges=edges, directed=False)
+    assert undirected_graph.rows == [0b0110, 0b0001, 0b1001, 0b0100]
+
+
+def test_bitset_common_neighbours():
+    vertices = [Vertex() for i in range(5)]
+    graph = BitsetGraph.from_rows(vertices=vertices,
+                                  rows=[0b11110, 0b10101, 0b00011, 0b00001, 0b00011])
+    assert graph.nb_common_neighbours(vertices[0], vertices[1]) == 2
+    assert graph.common_neighbours(vertices[0], vertices[1]) == [vertices[2], vertices[4]]
+    with pytest.raises(ValueError):
+        BitsetGraph.from_rows(vertices=vertices[:2], rows=[0b100, 0])
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_bitset_bfs(directed):
+    rand = random.Random(2)
+    vertices = [Vertex() for i in range(80)]
+    edges = [Edge(vertices[rand.randrange(80)], vertices[rand.randrange(80)]) for i in range(150)]
+    graph = BitsetGraph(vertices=vertices, edges=edges, directed=directed)
+    csr_graph = CSRGraph(vertices=vertices, edges=edges, directed=directed)
+    traversal = graph.bfs(start=vertices[0], materialize=False)
+    expected = csr_graph.bfs(start=vertices[0], materialize=False)
+    assert traversal.visited == expected.visited
+
+    def depths(traversal):
+        depths = {}
+        for vertex_id in traversal.order:
+            parent_id = traversal.parents[vertex_id]
+            depths[vertex_id] = depths[parent_id] + 1 if parent_id >= 0 else 0
+        return depths
+    assert depths(traversal) == depths(expected)
+    for vertex_id in traversal.order[1:]:
+        edge = traversal.parent_edge(vertices[vertex_id])
+        assert graph.has_edge(edge.head, edge.tail) and edge.tail is vertices[vertex_id]
+
+    subgraph = graph.bfs(start=vertices[0])
+    assert sorted(graph.vertex_id(v) for v in subgraph.adjacency_lists) == sorted(traversal.order)
+    assert all(subgraph.has_edge(edge.head, edge.tail) for edge in edges
+               if edge.head in subgraph.adjacency_lists and edge.tail in subgraph.adjacency_lists)
+    assert graph.parent_edges[vertices[traversal.order[1]]].head is vertices[0]
+
+
+def test_bitset_connected_components():
+    vertices = [Vertex() for i in range(5)]
+    edges = [Edge(vertices[0], vertices[1]), Edge(vertices[2], vertices[3])]
+    graph = BitsetGraph(vertices=vertices, edges=edges)
+    components = find_connected_components(graph=graph)
+    assert sorted(len(list(c.adjacency_lists)) for c in components) == [1, 2, 2]
+
+
+def test_bitset_from_graph_and_builder():
+    vertices = [Vertex() for i in range(3)]
+    edges = [Edge(vertices[0], vertices[1], weight=1), Edge(vertices[1], vertices[2], weight=2)]
+    graph = BitsetGraph.from_graph(Graph(vertices=vertices, edges=edges, directed=False))
+    assert not graph.directed and graph.rows == [0b010, 0b101, 0b010]
+    builder = GraphBuilder(directed=False)
+    builder.add_edges([('a', 'b', 1.0), ('b', 'c', 2.0)])
+    built = builder.build(implementation='bitset')
+    assert built.rows == [0b010, 0b101, 0b010]
+    assert built.key_id('c') == 2
@@ -0,0 +1,89 @@
+import operator
+
+import pytest
+
+from graph import Graph, CSRGraph, GraphBuilder
+
+
+def edge_stream():
+    yield ('a', 'b', 1.0)
+    yield ('b', 'c', 2.0)
+    yield ('c', 'a')
+    yield ('b', 'a', 4.0)
+    yield ('a', 'b', 5.0)
+
+
+def neighbours(graph, key):
+    vertex = graph.vertex(graph.key_id(key))
+    keys = {v: k for k, v in ((k, graph.vertex(graph.key_id(k))) for k in 'abc')}
+    return sorted((keys[e.tail], getattr(e, 'weight', None)) for e in graph.adjacency_lists[vertex].edgenodes)
+
+
+@pytest.mark.parametrize('implementation,graph_class', [('csr', CSRGraph), ('adjacency_list', Graph)])
+def test_builder(implementation, graph_class):
+    builder = GraphBuilder(directed=True, chunk_size=2)
+    builder.add_edges(edge_stream())
+    assert builder.nb_edges == 5
+    graph = builder.build(implementation=implementation)
+    assert isinstance(graph, graph_class)
+    assert builder.nb_edges == 0
+    assert graph.nb_vertices == 3
+    assert graph.nb_edges == 5
+    assert neighbours(graph, 'a') == [('b', 1.0), ('b', 5.0)]
+    assert neighbours(graph, 'c') == [('a', None)]
+
+
+@pytest.mark.parametrize('implementation', ['csr', 'adjacency_list'])
+def test_builder_deduplicate(implementation):
+    builder = GraphBuilder(directed=True, deduplicate=True)
+    builder.add_edges(edge_stream())
+    graph = builder.build(implementation=implementation)
+    assert neighbours(graph, 'a') == [('b', 1.0)]
+    assert neighbours(graph, 'b') == [('a', 4.0), ('c', 2.0)]
+
+    builder = GraphBuilder(directed=False, deduplicate=True)
+    builder.add_edges(edge_stream())
+    graph = builder.build(implementation=implementation)
+    # a-b, b-a and a-b are the same undirected edge
+    assert neighbours(graph, 'a') == [('b', 1.0), ('c', None)]
+    assert neighbours(graph, 'b') == [('a', 1.0), ('c', 2.0)]
+    assert graph.nb_edges == 6
+
+
+
+@pytest.mark.parametrize('implementation', ['csr', 'adjacency_list'])
+def test_builder_reducer(implementation):
+    edges = [('a', 'b', 3.0), ('a', 'a', 1.0), ('c', 'a'), ('a', 'b', 2.0), ('b', 'a', 4.0), ('a', 'c', 6.0)]
+    builder = GraphBuilder(directed=True, deduplicate=True, reducer=min, drop_self_loops=True)
+    builder.add_edges(edges)
+    graph = builder.build(implementation=implementation)
+    assert neighbours(graph, 'a') == [('b', 2.0), ('c', 6.0)]
+    assert neighbours(graph, 'c') == [('a', None)]
+    assert graph.nb_edges == 4
+
+    builder = GraphBuilder(directed=False, deduplicate=True, reducer=operator.add)
+    builder.add_edges(edges)
+    graph = builder.build(implementation=implementation)
+    # the edge without weight is left out of the sum
+    assert neighbours(graph, 'a') == [('a', 1.0), ('a', 1.0), ('b', 9.0), ('c', 6.0)]
+    assert neighbours(graph, 'b') == [('a', 9.0)]
+
+
+def test_builder_drop_self_loops():
+    builder = GraphBuilder(directed=True, drop_self_loops=True)
+    builder.extend(heads=[], tails=[])
+    for key in 'abcd':
+        builder.add_vertex(key)
+    builder.extend(heads=[3, 0, 2, 0, 0, 1], tails=[0, 3, 2, 1, 3, 1])
+    graph = builder.build()
+    # parallel edges are kept, the targets are sorted
+    assert list(graph.offsets) == [0, 3, 3, 3, 4]
+    assert list(graph.targets) == [1, 3, 3, 0]
+
+def test_builder_unweighted():
+    builder = GraphBuilder()
+    builder.add_edges((i, i + 1) for i in range(10))
+    graph = builder.build()
+    assert graph.weights is None
+    assert graph.nb_edges == 20
+    assert [graph.vertex_id(v) for v in graph.adjacency_lists] == list(range(11))
@@ -0,0 +1,90 @@
+from math import isnan
+
+import pytest
+
+from graph import Vertex, Edge, Graph, CSRGraph, GraphSchema
+from graph.columns import Columns, EdgeColumns
+from graph.minimum_spanning_tree import run_kruskal_algorithm
+from graph.shortest_path import run_floyd_warshall_algorithm
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_edge_columns(directed):
+    vertices = [Vertex() for i in range(3)]
+    edges = [Edge(vertices[0], vertices[1], weight=1),
+             Edge(vertices[1], vertices[2], weight=2, capacity=5),
+             Edge(vertices[2], vertices[2], weight=3)]
+    graph = Graph(vertices=vertices, edges=edges, directed=directed)
+    columns = graph.edge_columns()
+    assert graph.edge_columns() is columns
+    # the edges of an undirected graph are listed once, self-loops included
+    assert len(columns) == 3 and columns.directed == directed
+    expected = sorted([(0, 1, 1.0), (1, 2, 2.0), (2, 2, 3.0)])
+    triples = list(zip(columns.heads, columns.tails, columns['weight']))
+    if not directed:
+        triples = [(min(h, t), max(h, t), w) for h, t, w in triples]
+    assert sorted(triples) == expected
+    capacities = columns['capacity']
+    assert sum(isnan(c) for c in capacities) == 2 and 5.0 in capacities
+    graph.add_edge(Edge(vertices[0], vertices[2]))
+    assert graph.edge_columns() is not columns
+
+
+def test_columns_bulk_updates():
+    vertices = [Vertex() for i in range(4)]
+    edges = [Edge(vertices[i], vertices[i + 1], weight=i + 1, flow=3) for i in range(3)]
+    graph = Graph(vertices=vertices, edges=edges)
+    columns = graph.edge_columns()
+    weights = columns['weight']
+    columns.scale('weight', 2)
+    # in place: the arrays handed out see the updates
+    assert sorted(weights) == [2.0, 4.0, 6.0]
+    # the edgenodes are only written by store
+    edgenodes = columns.items
+    assert sorted(e.weight for e in edgenodes) == [1, 2, 3]
+    columns.store('weight')
+    assert sorted(e.weight for e in edgenodes) == [2.0, 4.0, 6.0]
+    columns.fill('flow', 0)
+    columns.store('flow')
+    assert all(e.flow == 0 for e in edgenodes)
+    # the graph has its own copy of the attributes of the edges
+    assert all(e.flow == 3 for e in edges)
+    # and reloaded from the edgenodes
+    edgenodes[0].weight = 10
+    assert max(columns['weight']) == 6.0 and max(columns.load('weight')) == 10.0
+    with pytest.raises(ValueError):
+        columns['weight'] = [1, 2]
+    columns['weight'] = [1, 2, 3]
+    assert list(weights) == [1.0, 2.0, 3.0]
+
+
+def test_vertex_columns_and_schema():
+    schema = GraphSchema(vertex_attributes=['rank'], edge_attributes=['weight'])
+    vertices = [schema.Vertex(rank=i) for i in range(3)]
+    vertices.append(schema.Vertex())
+    graph = Graph(vertices=vertices, schema=schema,
+                  edges=[schema.Edge(vertices[0], vertices[1], weight=0.5)])
+    columns = graph.vertex_columns()
+    assert list(columns['rank'])[:3] == [0.0, 1.0, 2.0] and isnan(columns['rank'][3])
+    columns.scale('rank', 10)
+    columns.store('rank')
+    assert vertices[2].rank == 20.0 and not hasattr(vertices[3], 'rank')
+    assert list(graph.edge_columns()['weight']) == [0.5]
+    assert Columns(items=[]).load('rank') == Columns(items=[]).load('weight')
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+def test_algorithms_read_columns(graph_class):
+    vertices = [Vertex() for i in range(4)]
+    edges = [Edge(vertices[0], vertices[1], weight=1), Edge(vertices[1], vertices[2], weight=5),
+             Edge(vertices[0], vertices[2], weight=2), Edge(vertices[2], vertices[3], weight=1)]
+    graph = graph_class(vertices=vertices, edges=edges)
+    mst = run_kruskal_algorithm(graph=graph)
+    assert sorted(e.weight for v in vertices for e in mst.adjacency_lists[v].edgenodes) == [1, 1, 1, 1, 2, 2]
+    assert run_floyd_warshall_algorithm(graph=graph)[vertices[1]][vertices[3]] == 4
+    if graph_class is Graph:
+        # the weights changed in the graph are read again
+        graph.edge_columns()
+        graph.set_edge_attributes(edges[0], weight=10)
+        assert run_floyd_warshall_algorithm(graph=graph)[vertices[1]][vertices[3]] == 6
+    assert len(EdgeColumns.from_graph(graph)) == (4 if graph_class is Graph else 8)
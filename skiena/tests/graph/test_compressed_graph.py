@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from graph import Vertex, Edge, Graph, CSRGraph, CompressedGraph, GraphBuilder
+from graph.graph import EdgeType
+from graph.compressed_graph import _encode, _decode
+from graph.applications import *
+from graph.reordering import reorder
+
+
+def random_graph(nb_vertices, nb_edges, directed, seed=0):
+    rand = random.Random(seed)
+    vertices = [Vertex() for i in range(nb_vertices)]
+    edges = [Edge(vertices[rand.randrange(nb_vertices)], vertices[rand.randrange(nb_vertices)])
+             for i in range(nb_edges)]
+    return vertices, edges
+
+
+def test_varint_gaps():
+    data = bytearray()
+    # before and after the head, gaps of 0 (parallel edges) and of several bytes
+    tails = [3, 3, 10, 200, 70000, 2 ** 40]
+    _encode(data, 50, tails)
+    _encode(data, 5, [6, 7, 8])
+    assert len(data) == 1 + 1 + 1 + 2 + 3 + 6 + 3
+    assert _decode(bytes(data), 0, 14, 50) == tails
+    assert _decode(bytes(data), 14, 17, 5) == [6, 7, 8]
+    assert _decode(bytes(data), 17, 17, 5) == []
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_compressed_adjacency(directed):
+    vertices, edges = random_graph(200, 800, directed)
+    graph = CompressedGraph(vertices=vertices, edges=edges, directed=directed)
+    csr_graph = CSRGraph(vertices=vertices, edges=edges, directed=directed)
+    assert graph.nb_edges == csr_graph.nb_edges
+    for vertex in vertices:
+        expected = sorted(csr_graph.vertex_id(e.tail) for e in csr_graph.adjacency_lists[vertex].edgenodes)
+        assert graph.neighbour_ids(graph.vertex_id(vertex)) == expected
+        assert graph.degree(vertex) == len(expected)
+        assert [e.tail for e in graph.adjacency_lists[vertex].edgenodes] == [vertices[i] for i in expected]
+    assert CompressedGraph.from_graph(csr_graph).data == graph.data
+    assert CompressedGraph.from_graph(Graph(vertices=vertices, edges=edges, directed=directed)).data == graph.data
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_compressed_traversals(directed):
+    vertices, edges = random_graph(200, 300, directed, seed=1)
+    graph = CompressedGraph(vertices=vertices, edges=edges, directed=directed)
+    csr_graph = CSRGraph(vertices=vertices, edges=edges, directed=directed)
+    traversal = graph.bfs(start=vertices[0], materialize=False)
+    expected = csr_graph.bfs(start=vertices[0], materialize=False)
+    assert sorted(traversal.order) == sorted(expected.order)
+    for vertex_id in traversal.order[1:]:
+        edge = traversal.parent_edge(vertices[vertex_id])
+        assert edge.tail is vertices[vertex_id]
+        assert vertex_id in graph.neighbour_ids(graph.vertex_id(edge.head))
+    subgraph = graph.bfs(start=vertices[0])
+    assert isinstance(subgraph, CompressedGraph)
+    assert sorted(graph.vertex_id(v) for v in subgraph.adjacency_lists) == sorted(traversal.order)
+    assert graph.parent_edges[vertices[traversal.order[1]]].head is vertices[0]
+
+    edgetypes = []
+    dfs = graph.dfs(start=vertices[0], process_edge=lambda v, e: edgetypes.append(e.edgetype),
+                    materialize=False)
+    assert sorted(dfs.order) == sorted(traversal.order)
+    assert edgetypes.count(EdgeType.TREE) == len(dfs.order) - 1
+    assert all(dfs.entry_times[i] < dfs.exit_times[i] for i in dfs.order)
+
+
+def test_compressed_applications():
+    vertices = [Vertex() for i in range(5)]
+    edges = [Edge(vertices[0], vertices[1]), Edge(vertices[2], vertices[3])]
+    graph = CompressedGraph(vertices=vertices, edges=edges)
+    components = find_connected_components(graph=graph)
+    assert sorted(len(list(c.adjacency_lists)) for c in components) == [1, 2, 2]
+    dag = CompressedGraph(vertices=vertices, directed=True, edges=[
+        Edge(vertices[3], vertices[1]), Edge(vertices[1], vertices[0]), Edge(vertices[4], vertices[3])])
+    order = topological_sort(dag)
+    assert order.index(vertices[4]) < order.index(vertices[3]) < order.index(vertices[1]) < order.index(vertices[0])
+    cycle = CompressedGraph(vertices=vertices[:3], directed=True, edges=[
+        Edge(vertices[0], vertices[1]), Edge(vertices[1], vertices[2]), Edge(vertices[2], vertices[0])])
+    assert len(find_strongly_connected_components(cycle)) == 1
+
+
+def test_compressed_builder_and_reordering():
+    builder = GraphBuilder(directed=False)
+    builder.add_edges([('a', 'b', 1.0), ('b', 'c', 2.0), ('c', 'a')])
+    graph = builder.build(implementation='compressed')
+    assert graph.neighbour_ids(graph.key_id('b')) == [0, 2]
+    # neighbours with close ids take fewer bytes
+    side = 30
+    vertices = [Vertex() for i in range(side * side)]
+    edges = [Edge(vertices[i], vertices[i + 1]) for i in range(side * side - 1) if (i + 1) % side] + \
+        [Edge(vertices[i], vertices[i + side]) for i in range(side * (side - 1))]
+    shuffled = list(vertices)
+    random.Random(0).shuffle(shuffled)
+    graph = CompressedGraph(vertices=shuffled, edges=edges)
+    reordered, new_ids = reorder(graph, method='rcm')
+    assert type(reordered) is CompressedGraph and reordered.nb_edges == graph.nb_edges
+    assert len(reordered.data) < len(graph.data) < 4 * graph.nb_edges
+    assert len(reordered.data) == graph.nb_edges
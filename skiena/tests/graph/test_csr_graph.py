@@ -0,0 +1,215 @@
+import pytest
+
+from graph import Vertex, Edge, Graph, CSRGraph
+from graph.applications import *
+from graph.shortest_path import *
+from graph.minimum_spanning_tree import *
+from graph.exceptions import *
+
+
+def test_csr_arrays():
+    vertices = [Vertex() for i in range(4)]
+    edges = [
+        Edge(vertices[0], vertices[1], weight=1),
+        Edge(vertices[0], vertices[2], weight=2),
+        Edge(vertices[2], vertices[3], weight=3),
+    ]
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=True)
+    assert list(graph.offsets) == [0, 2, 2, 3, 3]
+    assert list(graph.targets) == [1, 2, 3]
+    assert list(graph.weights) == [1, 2, 3]
+    assert graph.nb_edges == 3
+    assert graph.adjacency_lists[vertices[0]].degree == 2
+    assert [e.tail for e in graph.adjacency_lists[vertices[0]].edgenodes] == vertices[1:3]
+
+
+def test_undirected_csr_arrays():
+    vertices = [Vertex() for i in range(3)]
+    edges = [
+        Edge(vertices[0], vertices[1]),
+        Edge(vertices[1], vertices[2]),
+    ]
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=False)
+    assert list(graph.offsets) == [0, 1, 3, 4]
+    assert list(graph.targets) == [1, 0, 2, 1]
+    assert graph.weights is None
+    assert graph.nb_edges == 4
+
+
+def test_csr_vertex_ids():
+    vertices = [Vertex() for i in range(3)]
+    graph = CSRGraph(vertices=vertices, edges=[], keys=['a', 'b', 'c'])
+    assert [graph.vertex_id(v) for v in vertices] == [0, 1, 2]
+    assert graph.vertex(graph.key_id('c')) is vertices[2]
+
+
+def test_from_graph():
+    vertices = [Vertex() for i in range(4)]
+    edges = [
+        Edge(vertices[0], vertices[1], weight=1),
+        Edge(vertices[1], vertices[2], weight=2),
+        Edge(vertices[2], vertices[3], weight=3),
+    ]
+    graph = Graph(vertices=vertices, edges=edges, directed=False)
+    csr_graph = CSRGraph.from_graph(graph)
+    assert csr_graph.nb_edges == graph.nb_edges
+    for v in vertices:
+        assert ({(e.tail, e.weight) for e in csr_graph.adjacency_lists[v].edgenodes}
+                == {(e.tail, e.weight) for e in graph.adjacency_lists[v].edgenodes})
+
+
+def test_csr_bfs():
+    vertices = [Vertex() for i in range(7)]
+    edges = [
+        Edge(vertices[0], vertices[1]),
+        Edge(vertices[0], vertices[4]),
+        Edge(vertices[0], vertices[5]),
+        Edge(vertices[1], vertices[2]),
+        Edge(vertices[1], vertices[4]),
+        Edge(vertices[2], vertices[3]),
+        Edge(vertices[3], vertices[4]),
+    ]
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=False)
+    component = graph.bfs(start=vertices[0])
+    assert graph.parent_edges[vertices[0]] is None
+    assert graph.parent_edges[vertices[1]].head is vertices[0]
+    assert graph.parent_edges[vertices[2]].head is vertices[1]
+    assert graph.parent_edges[vertices[3]].head is vertices[4]
+    assert graph.parent_edges[vertices[4]].head is vertices[0]
+    assert graph.parent_edges[vertices[5]].head is vertices[0]
+    assert graph.parent_edges[vertices[6]] is None
+    assert [v for v in component.adjacency_lists] == vertices[:6]
+    # one edgenode per direction, as Graph.bfs
+    assert component.nb_edges == 14
+    graph_component = Graph(vertices=vertices, edges=edges, directed=False).bfs(start=vertices[0])
+    assert graph_component.nb_edges == component.nb_edges
+
+
+def test_csr_dfs():
+    vertices = [Vertex() for i in range(6)]
+    edges = [
+        Edge(vertices[0], vertices[1]),
+        Edge(vertices[0], vertices[2]),
+        Edge(vertices[1], vertices[3]),
+        Edge(vertices[2], vertices[3]),
+        Edge(vertices[3], vertices[4]),
+        Edge(vertices[3], vertices[5]),
+    ]
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=True)
+    graph.dfs(start=vertices[0])
+    assert graph.parent_edges[vertices[0]] is None
+    assert (vertices[0].entry_time, vertices[0].exit_time) == (0, 11)
+    assert (vertices[1].entry_time, vertices[1].exit_time) == (1, 8)
+    assert (vertices[3].entry_time, vertices[3].exit_time) == (2, 7)
+    assert (vertices[2].entry_time, vertices[2].exit_time) == (9, 10)
+    assert graph.parent_edges[vertices[3]].head is vertices[1]
+    assert graph.parent_edges[vertices[5]].head is vertices[3]
+
+
+def test_csr_path_finder():
+    vertices = [Vertex() for i in range(6)]
+    edges = [
+        Edge(vertices[0], vertices[1]),
+        Edge(vertices[0], vertices[4]),
+        Edge(vertices[1], vertices[2]),
+        Edge(vertices[2], vertices[3]),
+        Edge(vertices[3], vertices[4]),
+    ]
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=True)
+    graph.bfs(start=vertices[0])
+    path = graph.find_path(start=vertices[0], end=vertices[3])
+    assert [v for v in path.adjacency_lists] == vertices[:4]
+    with pytest.raises(Exception):
+        graph.find_path(start=vertices[0], end=vertices[5])
+
+
+def test_csr_applications():
+    vertices = [Vertex() for i in range(9)]
+    edges = [
+        Edge(head=vertices[0], tail=vertices[6]),
+        Edge(head=vertices[6], tail=vertices[3]),
+        Edge(head=vertices[3], tail=vertices[0]),
+        Edge(head=vertices[6], tail=vertices[8]),
+        Edge(head=vertices[8], tail=vertices[5]),
+        Edge(head=vertices[5], tail=vertices[2]),
+        Edge(head=vertices[2], tail=vertices[8]),
+        Edge(head=vertices[5], tail=vertices[7]),
+        Edge(head=vertices[7], tail=vertices[1]),
+        Edge(head=vertices[1], tail=vertices[4]),
+        Edge(head=vertices[4], tail=vertices[7]),
+    ]
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=True)
+    ssc_list = find_strongly_connected_components(graph)
+    assert sorted(len(ssc) for ssc in ssc_list) == [3, 3, 3]
+    with pytest.raises(CycleInGraphError):
+        topological_sort(graph)
+
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=False)
+    assert len(find_connected_components(graph)) == 1
+    assert find_cycles(graph) is not None
+
+
+def test_csr_shortest_path_and_spanning_tree():
+    vertices = [Vertex() for i in range(6)]
+    edges = [
+        Edge(head=vertices[0], tail=vertices[1], weight=4),
+        Edge(head=vertices[0], tail=vertices[2], weight=2),
+        Edge(head=vertices[1], tail=vertices[2], weight=1),
+        Edge(head=vertices[1], tail=vertices[3], weight=5),
+        Edge(head=vertices[2], tail=vertices[3], weight=8),
+        Edge(head=vertices[2], tail=vertices[4], weight=10),
+        Edge(head=vertices[3], tail=vertices[4], weight=2),
+        Edge(head=vertices[3], tail=vertices[5], weight=6),
+        Edge(head=vertices[4], tail=vertices[5], weight=5),
+    ]
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=False)
+    shortest_paths = run_dijkstra_algorithm(graph=graph, source=vertices[0])
+    assert [shortest_paths[v].distance for v in vertices] == [0, 3, 2, 8, 10, 14]
+    assert shortest_paths[vertices[3]].last_hop.head is vertices[1]
+    assert run_floyd_warshall_algorithm(graph=graph)[vertices[1]][vertices[5]] == 11
+    for mst in (run_prim_algorithm(graph=graph, start=vertices[0]),
+                run_kruskal_algorithm(graph=graph)):
+        weight = sum(e.weight for v in vertices for e in mst.adjacency_lists[v].edgenodes) / 2
+        assert weight == 15
+
+
+def bfs_depths(graph, traversal):
+    depths = {}
+    for vertex_id in traversal.order:
+        parent_id = traversal.parents[vertex_id]
+        depths[vertex_id] = depths[parent_id] + 1 if parent_id >= 0 else 0
+    return depths
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('alpha,beta', [(14, 24), (1e9, 1e9), (1e-9, 1e-9)])
+def test_direction_optimizing_bfs(directed, alpha, beta):
+    import random
+    rand = random.Random(1)
+    vertices = [Vertex() for i in range(60)]
+    edges = [Edge(vertices[rand.randrange(60)], vertices[rand.randrange(60)]) for i in range(150)]
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=directed)
+    expected = graph.bfs(start=vertices[0], materialize=False)
+    traversal = graph.direction_optimizing_bfs(start=vertices[0], alpha=alpha, beta=beta)
+    assert traversal.visited == expected.visited
+    assert bfs_depths(graph, traversal) == bfs_depths(graph, expected)
+    for vertex_id in traversal.order[1:]:
+        vertex = graph.vertex(vertex_id)
+        edge = traversal.parent_edge(vertex)
+        assert (edge.head, edge.tail) == (graph.vertex(traversal.parents[vertex_id]), vertex)
+
+
+def test_reverse_arrays():
+    vertices = [Vertex() for i in range(4)]
+    edges = [
+        Edge(vertices[0], vertices[1]),
+        Edge(vertices[0], vertices[2]),
+        Edge(vertices[2], vertices[1]),
+    ]
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=True)
+    offsets, sources, positions = graph.reverse_arrays()
+    assert list(offsets) == [0, 0, 2, 3, 3]
+    assert list(sources) == [0, 2, 0]
+    assert [graph.targets[p] for p in positions] == [1, 1, 2]
+    assert graph.reverse_arrays()[0] is offsets
+    assert [graph.in_degree(v) for v in vertices] == [0, 2, 1, 0]
@@ -0,0 +1,162 @@
+import pytest
+
+from graph import Vertex, Edge, Graph, CSRGraph
+from graph import formats
+from graph.formats import *
+from graph.shortest_path import *
+from graph.exceptions import *
+
+
+@pytest.fixture(params=[formats.CHUNK_SIZE, 5])
+def chunk_size(request, monkeypatch):
+    """small chunks cut the lines of the files"""
+    monkeypatch.setattr(formats, 'CHUNK_SIZE', request.param)
+    return request.param
+
+
+def write_text(tmp_path, text):
+    path = str(tmp_path / 'graph.txt')
+    with open(path, 'w') as f:
+        f.write(text)
+    return path
+
+
+def edge_set(graph):
+    return {(graph.vertex_id(v), graph.vertex_id(e.tail), getattr(e, 'weight', None))
+            for v in graph.adjacency_lists for e in graph.adjacency_lists[v].edgenodes}
+
+
+@pytest.mark.parametrize('implementation', ['csr', 'adjacency_list'])
+def test_read_dimacs_shortest_path(tmp_path, chunk_size, implementation):
+    path = write_text(tmp_path, 'c shortest path\n'
+                                'p sp 4 5\n'
+                                'a 1 2 4\n'
+                                'a 1 3 1\n'
+                                'c arcs\n'
+                                'a 3 2 2\n'
+                                'a 2 4 1\n'
+                                'a 4 1 7\n')
+    dimacs = read_dimacs(path, implementation=implementation)
+    assert dimacs.problem == 'sp' and dimacs.source is None
+    graph = dimacs.graph
+    assert graph.directed and graph.nb_edges == 5
+    vertices = [graph.vertex(graph.key_id(key)) for key in range(1, 5)]
+    shortest_paths = run_dijkstra_algorithm(graph=graph, source=vertices[0])
+    assert [shortest_paths[v].distance for v in vertices] == [0, 3, 1, 4]
+
+
+def test_read_dimacs_max_flow(tmp_path, chunk_size):
+    path = write_text(tmp_path, 'p max 4 5\n'
+                                'n 1 s\n'
+                                'n 4 t\n'
+                                'a 1 2 3\n'
+                                'a 1 3 2\n'
+                                'a 2 3 1\n'
+                                'a 2 4 2\n'
+                                'a 3 4 3\n')
+    dimacs = read_dimacs(path)
+    assert dimacs.problem == 'max'
+    assert dimacs.graph.vertex_id(dimacs.source) == 0
+    flow, residual_graph = find_network_flow(graph=dimacs.graph, source=dimacs.source, sink=dimacs.sink)
+    assert flow == 5
+
+
+@pytest.mark.parametrize('text', [
+    'a 1 2 3\n',
+    'p sp 2 2\na 1 2 3\n',
+    'p sp 2 1\na 1 3 3\n',
+    'p max 2 1\nn 1 s\na 1 2 3\n',
+    'p sp 2 1\nx 1\n',
+])
+def test_read_invalid_dimacs(tmp_path, text):
+    with pytest.raises(ValueError):
+        read_dimacs(write_text(tmp_path, text))
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+def test_write_dimacs(tmp_path, graph_class):
+    vertices = [Vertex() for i in range(3)]
+    edges = [Edge(vertices[0], vertices[1], weight=2), Edge(vertices[1], vertices[2], weight=0.5)]
+    graph = graph_class(vertices=vertices, edges=edges, directed=False)
+    path = str(tmp_path / 'graph.max')
+    write_dimacs(path, graph, problem='max', source=vertices[0], sink=vertices[2])
+    dimacs = read_dimacs(path)
+    assert dimacs.graph.nb_edges == 4
+    assert edge_set(dimacs.graph) == edge_set(graph)
+    assert dimacs.graph.vertex_id(dimacs.sink) == 2
+    with pytest.raises(ValueError):
+        write_dimacs(path, graph_class(vertices=vertices, edges=[Edge(vertices[0], vertices[1])]))
+
+
+def test_read_metis(tmp_path, chunk_size):
+    # vertex 4 is isolated, vertex 5 has its line omitted
+    path = write_text(tmp_path, '% weighted\n'
+                                '5 3 011\n'
+                                '1 2 7 3 1\n'
+                                '% comment\n'
+                                '2 1 7 3 2\n'
+                                '3 1 1 2 2\n'
+                                '4\n')
+    graph = read_metis(path)
+    assert not graph.directed and graph.nb_vertices == 5
+    assert edge_set(graph) == {(0, 1, 7), (1, 0, 7), (0, 2, 1), (2, 0, 1), (1, 2, 2), (2, 1, 2)}
+    assert [graph.vertex(i).weights for i in range(4)] == [[1], [2], [3], [4]]
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+@pytest.mark.parametrize('weight', [None, 3])
+def test_write_metis(tmp_path, graph_class, weight):
+    vertices = [Vertex() for i in range(4)]
+    edges = [Edge(vertices[0], vertices[1], weight=weight), Edge(vertices[3], vertices[1], weight=weight)]
+    graph = graph_class(vertices=vertices, edges=edges, directed=False)
+    path = str(tmp_path / 'graph.metis')
+    write_metis(path, graph)
+    assert edge_set(read_metis(path)) == edge_set(graph)
+    with pytest.raises(GraphDirectionTypeError):
+        write_metis(path, graph_class(vertices=vertices, edges=edges, directed=True))
+
+
+def test_read_matrix_market(tmp_path, chunk_size):
+    path = write_text(tmp_path, '%%MatrixMarket matrix coordinate real general\n'
+                                '% comment\n'
+                                '3 3 3\n'
+                                '1 2 0.5\n'
+                                '2 3 -1\n'
+                                '3 3 2e1\n')
+    graph = read_matrix_market(path)
+    assert graph.directed
+    assert edge_set(graph) == {(0, 1, 0.5), (1, 2, -1), (2, 2, 20)}
+    path = write_text(tmp_path, '%%MatrixMarket matrix coordinate pattern symmetric\n'
+                                '3 3 2\n'
+                                '2 1\n'
+                                '3 3\n')
+    graph = read_matrix_market(path, implementation='adjacency_list')
+    assert not graph.directed
+    assert edge_set(graph) == {(0, 1, None), (1, 0, None), (2, 2, None)}
+
+
+@pytest.mark.parametrize('text', [
+    '%%MatrixMarket matrix array real general\n2 2\n1\n2\n3\n4\n',
+    '%%MatrixMarket matrix coordinate real general\n2 3 1\n1 2 1\n',
+    '%%MatrixMarket matrix coordinate real general\n2 2 2\n1 2 1\n',
+    '%%MatrixMarket matrix coordinate pattern general\n2 2 1\n1 2 1\n',
+])
+def test_read_invalid_matrix_market(tmp_path, text):
+    with pytest.raises(ValueError):
+        read_matrix_market(write_text(tmp_path, text))
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+@pytest.mark.parametrize('directed', [False, True])
+def test_write_matrix_market(tmp_path, graph_class, directed):
+    vertices = [Vertex() for i in range(3)]
+    edges = [Edge(vertices[0], vertices[1], weight=1.5),
+             Edge(vertices[2], vertices[1], weight=2),
+             Edge(vertices[2], vertices[2], weight=3)]
+    graph = graph_class(vertices=vertices, edges=edges, directed=directed)
+    path = str(tmp_path / 'graph.mtx')
+    write_matrix_market(path, graph)
+    read_graph = read_matrix_market(path)
+    assert read_graph.directed == directed
+    assert read_graph.nb_edges == graph.nb_edges
+    assert edge_set(read_graph) == edge_set(graph)
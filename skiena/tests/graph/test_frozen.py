@@ -0,0 +1,57 @@
+import random
+from multiprocessing import Pool
+
+import pytest
+
+from graph import Vertex, Edge, Graph, FrozenGraph
+from graph.applications import find_connected_components, find_strongly_connected_components
+from graph.shortest_path import run_dijkstra_algorithm
+
+
+def random_graph(nb_vertices, nb_edges, directed, seed=0):
+    rand = random.Random(seed)
+    vertices = [Vertex() for i in range(nb_vertices)]
+    # a cycle through all the vertices: all are reachable
+    edges = [Edge(vertices[i], vertices[(i + 1) % nb_vertices], weight=20.0) for i in range(nb_vertices)] + \
+        [Edge(vertices[rand.randrange(nb_vertices)], vertices[rand.randrange(nb_vertices)],
+              weight=float(rand.randrange(1, 10))) for i in range(nb_edges)]
+    return Graph(vertices=vertices, edges=edges, directed=directed, keys=range(nb_vertices))
+
+
+def distances(graph, source_key) -> list:
+    paths = run_dijkstra_algorithm(graph=graph, source=graph.vertex(graph.key_id(source_key)))
+    return [paths[graph.vertex(i)].distance for i in range(graph.nb_vertices)]
+
+
+def attached_distances(spec: dict, source_key) -> list:
+    with FrozenGraph.attach(spec) as graph:
+        return distances(graph, source_key)
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_freeze_and_attach(directed):
+    graph = random_graph(60, 150, directed)
+    with FrozenGraph.freeze(graph) as frozen:
+        assert frozen.vertex(0) is graph.vertex(0)
+        assert frozen.nb_edges == graph.nb_edges
+        assert distances(frozen, 7) == distances(graph, 7)
+        attached = FrozenGraph.attach(frozen.spec)
+        assert isinstance(attached.targets, memoryview)
+        assert attached.key_id(7) == graph.key_id(7)
+        assert distances(attached, 7) == distances(graph, 7)
+        traversal = attached.bfs(start=attached.vertex(0), materialize=False)
+        assert len(traversal.order) == graph.nb_vertices
+        if directed:
+            assert len(find_strongly_connected_components(attached)) == 1
+        else:
+            assert len(find_connected_components(graph=attached)) == 1
+        attached.close()
+        with pytest.raises(ValueError):
+            FrozenGraph.attach(frozen.spec, vertices=[Vertex()])
+
+
+def test_frozen_process_pool():
+    graph = random_graph(100, 300, directed=True, seed=1)
+    with FrozenGraph.freeze(graph) as frozen, Pool(processes=2) as pool:
+        results = pool.starmap(attached_distances, [(frozen.spec, source) for source in (0, 50, 99)])
+    assert results == [distances(graph, source) for source in (0, 50, 99)]
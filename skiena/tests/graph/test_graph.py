@@ -1,8 +1,12 @@
+import pickle
+import sys
 import re
+import threading
 import pytest
 
-from graph import Vertex, Edge, Graph
-from graph.graph import Edgenode, AdjacencyList, NodeList
+from graph import Vertex, Edge, Graph, GraphSchema
+from graph.graph import EdgeType, Edgenode, AdjacencyList, NodeList, EdgeHandle, GraphSnapshot
+from graph.shortest_path import run_dijkstra_algorithm
 
 
 def test_repr_vertex():
@@ -47,6 +51,101 @@ def test_wrong_node_for_edgenode():
         Edgenode(head=v3, edge=e)
 
 
+def test_schema_classes_have_no_dict():
+    schema = GraphSchema(vertex_attributes=['name'], edge_attributes=['weight', 'capacity'])
+    v1, v2 = schema.Vertex(name='a'), schema.Vertex(name='b')
+    e = schema.Edge(v1, v2, weight=1, capacity=3)
+    edgenode = schema.Edgenode(head=v1, edge=e)
+    for item in (v1, e, edgenode):
+        assert not hasattr(item, '__dict__')
+    assert (edgenode.tail, edgenode.weight, edgenode.capacity) == (v2, 1, 3)
+    assert re.match(r'^V#\d+\sname=a\s->\sV#\d+\sname=b\s-\sweight=1\scapacity=3$', repr(e))
+    edge = edgenode.to_edge(head=v1)
+    assert type(edge) is schema.Edge
+    assert (edge.head, edge.tail, edge.edgenode) == (v1, v2, edgenode)
+
+
+def test_schema_rejects_undeclared_attributes():
+    schema = GraphSchema(edge_attributes=['weight'])
+    v1, v2 = schema.Vertex(), schema.Vertex()
+    with pytest.raises(AttributeError):
+        schema.Vertex(name='a')
+    with pytest.raises(AttributeError):
+        schema.Edge(v1, v2, capacity=3)
+
+
+def test_schema_graph():
+    schema = GraphSchema(edge_attributes=['weight'])
+    vertices = [schema.Vertex() for i in range(4)]
+    edges = [
+        schema.Edge(vertices[0], vertices[1], weight=1),
+        schema.Edge(vertices[1], vertices[2], weight=2),
+        schema.Edge(vertices[2], vertices[3], weight=3),
+    ]
+    graph = Graph(vertices=vertices, edges=edges, directed=False, schema=schema)
+    # undirected edgenodes share the schema edges
+    for edgenode in graph.adjacency_lists[vertices[1]].edgenodes:
+        assert type(edgenode) is schema.SharedEdgenode and type(edgenode.edge) is schema.Edge
+        assert edgenode.weight == edgenode.edge.weight
+    directed_graph = Graph(vertices=vertices, edges=edges, directed=True, schema=schema)
+    for edgenode in directed_graph.adjacency_lists[vertices[1]].edgenodes:
+        assert type(edgenode) is schema.Edgenode
+    component = graph.bfs(start=vertices[0])
+    assert component.schema is schema
+    assert graph.parent_edges[vertices[3]].head is vertices[2]
+    graph.dfs(start=vertices[0])
+    assert (vertices[0].entry_time, vertices[0].exit_time) == (0, 7)
+
+
+def test_undirected_edgenodes_share_edge():
+    vertices = [Vertex() for i in range(3)]
+    edges = [Edge(vertices[0], vertices[1], weight=1), Edge(vertices[1], vertices[2], weight=2)]
+    graph = Graph(vertices=vertices, edges=edges, directed=False)
+    edgenode, = graph.adjacency_lists[vertices[0]].edgenodes
+    mate = next(e for e in graph.adjacency_lists[vertices[1]].edgenodes if e.tail is vertices[0])
+    # a copy of the edge, private to the graph
+    assert edgenode.edge is mate.edge and edgenode.edge is not edges[0]
+    assert (edgenode.tail, mate.tail, mate.weight) == (vertices[1], vertices[0], 1)
+    # the ends of the edge are not seen through the shared attributes
+    for shared in (edgenode, mate):
+        with pytest.raises(AttributeError):
+            shared.head
+    edgenode.flow = 3
+    assert mate.flow == 3 and not hasattr(edges[0], 'flow')
+    edge = mate.to_edge(head=vertices[1])
+    assert (edge.head, edge.tail, edge.weight, edge.edgenode) == (vertices[1], vertices[0], 1, mate)
+    # the tree edge keeps its type though it is seen back from its tail
+    graph.dfs(start=vertices[0])
+    assert all(e.edgetype is EdgeType.TREE for v in vertices for e in graph.adjacency_lists[v].edgenodes)
+    with pytest.raises(AttributeError):
+        edgenode.capacity
+    # still shared once unpickled
+    graph = pickle.loads(pickle.dumps(graph))
+    edgenode, = graph.adjacency_lists[graph.vertex(0)].edgenodes
+    mate = next(e for e in graph.adjacency_lists[graph.vertex(1)].edgenodes if e.tail is graph.vertex(0))
+    edgenode.flow = 4
+    assert mate.flow == 4 and mate.edge.flow == 4 and mate.tail is graph.vertex(0)
+
+
+@pytest.mark.parametrize('schema', [None, GraphSchema(edge_attributes=['weight', 'flow'])])
+def test_graphs_of_same_edges_are_independent(schema):
+    vertex_class, edge_class = (Vertex, Edge) if schema is None else (schema.Vertex, schema.Edge)
+    vertices = [vertex_class() for i in range(3)]
+    edges = [edge_class(vertices[0], vertices[1], weight=1), edge_class(vertices[1], vertices[2], weight=2)]
+    graph = Graph(vertices=vertices, edges=edges, schema=schema)
+    graph.dfs(start=vertices[0])
+    graph.set_edge_attributes(edges[0], flow=5)
+    handle = graph.add_edge(edge_class(vertices[2], vertices[0], weight=3))
+    graph.set_edge_attributes(handle, weight=30)
+    assert all(not hasattr(e, 'edgetype') and not hasattr(e, 'flow') for e in edges)
+    assert handle.edge.weight == 30
+    other = Graph(vertices=vertices, edges=edges, schema=schema)
+    for vertex in vertices:
+        for edgenode in other.adjacency_lists[vertex].edgenodes:
+            assert getattr(edgenode, 'edgetype', None) is None
+            assert getattr(edgenode, 'flow', None) is None
+
+
 def test_adjacency_list():
     v = Vertex()
     vertices = [Vertex() for i in range(4)]
@@ -95,6 +194,244 @@ def test_iter_nodelist():
     assert set_of_vertices == set_of_iterated_vertices
 
 
+def test_nodelist_dense_indices():
+    vertices = [Vertex() for i in range(4)]
+    nodelist = NodeList(vertices, default=0)
+    assert [nodelist.index(v) for v in vertices] == [0, 1, 2, 3]
+    nodelist[vertices[2]] = 5
+    assert nodelist.values == [0, 0, 5, 0]
+    assert len(nodelist) == 4
+
+
+def test_nodelist_shares_graph_indices():
+    vertices = [Vertex() for i in range(4)]
+    graph = Graph(vertices=vertices, edges=[Edge(vertices[0], vertices[1])])
+    nodelist = NodeList(graph.adjacency_lists, default=False)
+    assert nodelist.indices is graph.adjacency_lists.indices
+    assert nodelist.indices is graph.parent_edges.indices
+    assert [v for v in nodelist] == vertices
+
+
+def test_graph_local_vertex_ids():
+    vertices = [Vertex() for i in range(3)]
+    graph = Graph(vertices=vertices, edges=[Edge(vertices[0], vertices[1])])
+    subgraph = Graph(vertices=vertices[1:], edges=[])
+    assert [graph.vertex_id(v) for v in vertices] == [0, 1, 2]
+    assert [subgraph.vertex_id(v) for v in vertices[1:]] == [0, 1]
+    assert graph.vertex(2) is vertices[2]
+
+
+def test_graph_external_keys():
+    vertices = [Vertex() for i in range(3)]
+    graph = Graph(vertices=vertices, edges=[], keys=['a', 'b', 'c'])
+    assert graph.vertex(graph.key_id('b')) is vertices[1]
+    with pytest.raises(ValueError):
+        Graph(vertices=vertices, edges=[], keys=['a'])
+
+
+def test_pickle_graph():
+    vertices = [Vertex() for i in range(2001)]
+    edges = [Edge(vertices[0], vertices[i]) for i in range(1, 2001)]
+    graph = pickle.loads(pickle.dumps(Graph(vertices=vertices, edges=edges, keys=range(2001))))
+    start = graph.vertex(graph.key_id(0))
+    graph.bfs(start=start)
+    assert graph.parent_edges[graph.vertex(2000)].head is start
+    assert graph.adjacency_lists[start].degree == 2000
+
+
+def test_add_vertex_and_edge():
+    vertices = [Vertex() for i in range(2)]
+    graph = Graph(vertices=vertices, edges=[], directed=False, keys=['a', 'b'])
+    v = Vertex()
+    assert graph.add_vertex(v, key='c') == 2
+    assert graph.key_id('c') == 2 and graph.vertex(2) is v
+    with pytest.raises(ValueError):
+        graph.add_vertex(v)
+    handle = graph.add_edge(Edge(head=vertices[0], tail=v, weight=3))
+    assert isinstance(handle, EdgeHandle)
+    assert graph.nb_vertices == 3
+    assert graph.nb_edges == 2
+    assert graph.version == 2
+    assert [(e.tail, e.weight) for e in graph.adjacency_lists[v].edgenodes] == [(vertices[0], 3)]
+    assert graph.parent_edges[v] is None
+    component = graph.bfs(start=v)
+    assert {u for u in component.adjacency_lists} == {vertices[0], v}
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_remove_edge(directed):
+    vertices = [Vertex() for i in range(3)]
+    edges = [Edge(head=vertices[0], tail=vertices[1])]
+    graph = Graph(vertices=vertices, edges=edges, directed=directed)
+    handle = graph.add_edge(Edge(head=vertices[1], tail=vertices[2]))
+    graph.remove_edge(handle)
+    assert graph.adjacency_lists[vertices[1]].degree == (0 if directed else 1)
+    assert graph.adjacency_lists[vertices[2]].degree == 0
+    with pytest.raises(ValueError):
+        graph.remove_edge(handle)
+    graph.remove_edge(edges[0])
+    assert graph.nb_edges == 0
+    assert all(graph.adjacency_lists[v].degree == 0 for v in vertices)
+    with pytest.raises(KeyError):
+        graph.remove_edge(edges[0])
+    assert graph.version == 3
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_remove_vertex(directed):
+    vertices = [Vertex() for i in range(4)]
+    edges = [
+        Edge(head=vertices[0], tail=vertices[1]),
+        Edge(head=vertices[1], tail=vertices[2]),
+        Edge(head=vertices[2], tail=vertices[3]),
+        Edge(head=vertices[3], tail=vertices[1]),
+    ]
+    graph = Graph(vertices=vertices, edges=edges, directed=directed, keys='abcd')
+    handle = graph.add_edge(Edge(head=vertices[0], tail=vertices[1]))
+    graph.remove_vertex(vertices[1])
+    # the last vertex takes the id of the removed one
+    assert graph.vertex_id(vertices[3]) == 1
+    assert graph.key_id('d') == 1
+    assert 'b' not in graph.key_ids
+    assert vertices[1] not in graph.adjacency_lists
+    assert [v for v in graph.adjacency_lists] == [vertices[0], vertices[3], vertices[2]]
+    assert graph.nb_vertices == 3
+    assert graph.nb_edges == (1 if directed else 2)
+    assert all(e.tail is not vertices[1] for v in graph.adjacency_lists
+               for e in graph.adjacency_lists[v].edgenodes)
+    # the edge is gone with the vertex: its handle is stale
+    with pytest.raises((KeyError, ValueError)):
+        graph.remove_edge(handle)
+    assert graph.find_path(start=vertices[2], end=vertices[3],
+                           traversal=graph.bfs(start=vertices[2], materialize=False)) is not None
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_reverse_adjacency(directed):
+    vertices = [Vertex() for i in range(3)]
+    edges = [
+        Edge(head=vertices[0], tail=vertices[1]),
+        Edge(head=vertices[2], tail=vertices[1]),
+    ]
+    graph = Graph(vertices=vertices, edges=edges, directed=directed)
+    reverse = graph.reverse_adjacency()
+    assert sorted(graph.vertex_id(head) for head, edgenode in reverse[1]) == [0, 2]
+    assert all(edgenode.tail is vertices[1] for head, edgenode in reverse[1])
+    assert graph.reverse_adjacency() is reverse
+    assert [graph.in_degree(v) for v in vertices] == ([0, 2, 0] if directed else [1, 2, 1])
+    # the cache is dropped by changes
+    handle = graph.add_edge(Edge(head=vertices[1], tail=vertices[0]))
+    assert graph.reverse_adjacency() is not reverse
+    assert [graph.in_degree(v) for v in vertices] == ([1, 2, 0] if directed else [2, 3, 1])
+    graph.remove_edge(handle)
+    graph.remove_vertex(vertices[0])
+    assert [graph.in_degree(v) for v in vertices[1:]] == ([1, 0] if directed else [1, 1])
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_memory_report(directed):
+    vertices = [Vertex() for i in range(50)]
+    edges = [Edge(vertices[i % 50], vertices[(3 * i + 1) % 50], weight=i + 0.5) for i in range(200)]
+    graph = Graph(vertices=vertices, edges=edges, directed=directed)
+    report = graph.memory_report()
+    assert report['total'] == sum(size for name, size in report.items() if name != 'total')
+    assert report['reverse_adjacency'] == 0
+    # weight floats, and the shared edges if undirected
+    assert report['edge_attributes'] >= 200 * sys.getsizeof(0.5)
+    # the undirected edgenodes share their edge: its attributes count once
+    assert report['adjacency_nodes'] > report['edge_attributes'] > report['vertices']
+    graph.reverse_adjacency()
+    assert graph.memory_report()['reverse_adjacency'] > 0
+    estimate = Graph.estimate_memory(nb_vertices=50, nb_edges=200, directed=directed,
+                                     edge_attributes={'weight': 0.5})
+    for name in ('vertices', 'adjacency_nodes', 'edge_attributes'):
+        assert estimate[name] == report[name]
+    assert abs(estimate['total'] - report['total']) < 0.1 * report['total']
+
+
+def test_memory_report_schema():
+    schema = GraphSchema(edge_attributes=['weight'])
+    vertices = [schema.Vertex() for i in range(50)]
+    edges = [schema.Edge(vertices[i % 50], vertices[(3 * i + 1) % 50], weight=i + 0.5) for i in range(200)]
+    schema_report = Graph(vertices=vertices, edges=edges, schema=schema).memory_report()
+    report = Graph.estimate_memory(nb_vertices=50, nb_edges=200, edge_attributes={'weight': 0.5})
+    assert schema_report['total'] < report['total']
+    assert schema_report['vertices'] < report['vertices']
+
+
+def adjacency(graph) -> list:
+    return sorted((graph.vertex_id(v), graph.vertex_id(e.tail), e.weight)
+                  for v in graph.adjacency_lists for e in graph.adjacency_lists[v].edgenodes)
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_snapshot(directed):
+    vertices = [Vertex() for i in range(4)]
+    edges = [Edge(vertices[0], vertices[1], weight=1.0), Edge(vertices[1], vertices[2], weight=2.0)]
+    graph = Graph(vertices=vertices, edges=edges, directed=directed, keys='abcd')
+    handle = graph.add_edge(Edge(vertices[2], vertices[3], weight=3.0))
+    snapshot = graph.snapshot()
+    assert isinstance(snapshot, GraphSnapshot) and snapshot.snapshot() is snapshot
+    expected = adjacency(snapshot)
+    # the handle taken before the snapshot updates the graph only
+    graph.set_edge_attributes(handle, weight=30.0)
+    assert handle.edge.weight == 30.0
+    graph.set_edge_attributes(edges[0], weight=10.0)
+    assert edges[0].weight == 1.0
+    graph.remove_edge(edges[1])
+    graph.add_vertex(Vertex(), key='e')
+    graph.remove_vertex(vertices[0])
+    assert adjacency(snapshot) == expected
+    assert snapshot.nb_vertices == 4 and snapshot.nb_edges == (3 if directed else 6)
+    assert snapshot.key_id('a') == 0 and 'e' not in snapshot.key_ids
+    assert adjacency(graph) == ([(2, 3, 30.0)] if directed else [(2, 3, 30.0), (3, 2, 30.0)])
+    # once copied, the lists and edgenodes are updated in place
+    node = handle.connections[0][1]
+    graph.set_edge_attributes(handle, weight=40.0)
+    assert handle.connections[0][1] is node and node.item.weight == 40.0
+    graph.remove_edge(handle)
+    with pytest.raises(ValueError):
+        graph.remove_edge(handle)
+    assert graph.nb_edges == 0 and adjacency(snapshot) == expected
+    for change in (lambda: snapshot.add_vertex(Vertex()), lambda: snapshot.remove_edge(edges[0])):
+        with pytest.raises(TypeError):
+            change()
+
+
+def test_snapshot_schema():
+    schema = GraphSchema(edge_attributes=['weight'])
+    vertices = [schema.Vertex() for i in range(3)]
+    edges = [schema.Edge(vertices[0], vertices[1], weight=1.0), schema.Edge(vertices[1], vertices[2], weight=2.0)]
+    for directed in (False, True):
+        graph = Graph(vertices=vertices, edges=edges, directed=directed, schema=schema)
+        snapshot = graph.snapshot()
+        graph.set_edge_attributes(edges[1], weight=20.0)
+        assert {e.tail: e.weight for e in graph.adjacency_lists[vertices[1]].edgenodes}[vertices[2]] == 20.0
+        assert 20.0 not in [w for h, t, w in adjacency(snapshot)]
+
+
+def test_snapshot_reader_thread():
+    vertices = [Vertex() for i in range(100)]
+    edges = [Edge(vertices[i], vertices[i + 1], weight=1.0) for i in range(99)]
+    graph = Graph(vertices=vertices, edges=edges)
+    snapshot = graph.snapshot()
+    distances = []
+
+    def read():
+        for i in range(5):
+            paths = run_dijkstra_algorithm(graph=snapshot, source=vertices[0])
+            distances.append(paths[vertices[-1]].distance)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(99):
+        graph.set_edge_attributes(edges[i], weight=2.0)
+        graph.add_edge(Edge(vertices[0], vertices[i + 1], weight=0.5))
+    reader.join()
+    assert distances == [99.0] * 5
+    assert run_dijkstra_algorithm(graph=graph, source=vertices[0])[vertices[-1]].distance == 0.5
+
+
 def test_undirected_bfs():
     vertices = [Vertex() for i in range(6)]
     edges = [
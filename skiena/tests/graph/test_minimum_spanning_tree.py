@@ -89,6 +89,33 @@ def test_prim_algorithm_with_parallel_edges():
     assert tails[8] == {vertices[2]}
 
 
+def test_prim_algorithm_with_updated_heap_items():
+    vertices = [Vertex() for i in range(6)]
+    edges = [
+        Edge(head=vertices[0], tail=vertices[1], weight=4),
+        Edge(head=vertices[0], tail=vertices[2], weight=2),
+        Edge(head=vertices[1], tail=vertices[2], weight=1),
+        Edge(head=vertices[1], tail=vertices[3], weight=5),
+        Edge(head=vertices[2], tail=vertices[3], weight=8),
+        Edge(head=vertices[2], tail=vertices[4], weight=10),
+        Edge(head=vertices[3], tail=vertices[4], weight=2),
+        Edge(head=vertices[3], tail=vertices[5], weight=6),
+        Edge(head=vertices[4], tail=vertices[5], weight=5),
+    ]
+    graph = Graph(vertices=vertices, edges=edges, directed=False)
+    mst = run_prim_algorithm(graph=graph, start=vertices[0])
+    tails = [set() for i in range(6)]
+    for i in range(6):
+        for edgenode in mst.adjacency_lists[vertices[i]].edgenodes:
+            tails[i].add(edgenode.tail)
+    assert tails[0] == {vertices[2]}
+    assert tails[1] == {vertices[2], vertices[3]}
+    assert tails[2] == {vertices[0], vertices[1]}
+    assert tails[3] == {vertices[1], vertices[4]}
+    assert tails[4] == {vertices[3], vertices[5]}
+    assert tails[5] == {vertices[4]}
+
+
 def test_prim_algorithm_fail_on_directed_graph():
     vertices = [Vertex() for i in range(6)]
     edges = [
@@ -0,0 +1,42 @@
+import random
+from array import array
+
+from graph import Vertex, Edge, CSRGraph
+from graph.parallel import ParallelBFS, parallel_bfs
+from graph.shared import SharedArrays
+
+
+def test_shared_arrays():
+    with SharedArrays(arrays={'a': array('q', [1, 2, 3]), 'b': array('d')}) as shared:
+        attached = SharedArrays.attach(shared.spec)
+        attached['a'][1] = 5
+        assert list(shared['a']) == [1, 5, 3]
+        assert len(attached['b']) == 0
+        attached.close()
+
+
+def test_parallel_bfs():
+    rand = random.Random(0)
+    vertices = [Vertex() for i in range(300)]
+    edges = [Edge(vertices[rand.randrange(300)], vertices[rand.randrange(300)]) for i in range(900)]
+    graph = CSRGraph(vertices=vertices, edges=edges, directed=True)
+    expected = graph.bfs(start=vertices[0], materialize=False)
+    expected_distances = {}
+    for index in expected.order:
+        parent = expected.parents[index]
+        expected_distances[index] = expected_distances[parent] + 1 if parent >= 0 else 0
+
+    # min_chunk=1 sends every frontier to the pool
+    with ParallelBFS(graph=graph, processes=2, min_chunk=1) as bfs:
+        for start in (vertices[0], vertices[0]):
+            traversal, distances = bfs.run(start=start)
+            assert traversal.visited == expected.visited
+            assert {i: distances[i] for i in traversal.order} == expected_distances
+            assert all(distances[i] == -1 for i in range(300) if not expected.visited[i])
+            for index in traversal.order[1:]:
+                edge = traversal.parent_edge(graph.vertex(index))
+                assert edge.tail is graph.vertex(index)
+                assert distances[graph.vertex_id(edge.head)] == distances[index] - 1
+
+    traversal, distances = parallel_bfs(graph=graph, start=vertices[0], processes=1)
+    assert traversal.visited == expected.visited
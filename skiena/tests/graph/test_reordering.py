@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from graph import Vertex, Edge, Graph, CSRGraph, BitsetGraph, GraphSchema
+from graph.reordering import *
+from graph.shortest_path import *
+
+
+def path_graph(graph_class, nb_vertices=6, directed=False):
+    """path 0 - 1 - ... whose ids are shuffled"""
+    vertices = [Vertex() for i in range(nb_vertices)]
+    shuffled = list(vertices)
+    random.Random(0).shuffle(shuffled)
+    edges = [Edge(vertices[i], vertices[i + 1], weight=i + 1) for i in range(nb_vertices - 1)]
+    return graph_class(vertices=shuffled, edges=edges, directed=directed), vertices
+
+
+def edge_set(graph):
+    return {(v, e.tail) for v in graph.adjacency_lists for e in graph.adjacency_lists[v].edgenodes}
+
+
+def bandwidth(graph):
+    return max(abs(graph.vertex_id(v) - graph.vertex_id(e.tail))
+               for v in graph.adjacency_lists for e in graph.adjacency_lists[v].edgenodes)
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph, BitsetGraph])
+@pytest.mark.parametrize('method', ['rcm', 'degree', 'bfs'])
+def test_reorder_keeps_edges(graph_class, method):
+    rand = random.Random(1)
+    vertices = [Vertex() for i in range(30)]
+    edges = [Edge(vertices[rand.randrange(30)], vertices[rand.randrange(30)]) for i in range(60)]
+    for directed in (False, True):
+        graph = graph_class(vertices=vertices, edges=edges, directed=directed)
+        new_graph, new_ids = reorder(graph, method=method)
+        assert type(new_graph) is graph_class and new_graph.directed == directed
+        assert sorted(new_ids) == list(range(30))
+        assert all(new_graph.vertex(new_ids[i]) is graph.vertex(i) for i in range(30))
+        assert edge_set(new_graph) == edge_set(graph)
+        assert new_graph.nb_edges == graph.nb_edges
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph, BitsetGraph])
+def test_reverse_cuthill_mckee_bandwidth(graph_class):
+    graph, vertices = path_graph(graph_class)
+    assert bandwidth(graph) > 1
+    new_graph, new_ids = reorder(graph)
+    assert bandwidth(new_graph) == 1
+    # starts from an end of the path, reversed
+    assert new_graph.vertex(new_graph.nb_vertices - 1) in (vertices[0], vertices[-1])
+
+
+def test_orders():
+    vertices = [Vertex() for i in range(5)]
+    # star 3 - {0, 1, 4}, and 2 alone
+    edges = [Edge(vertices[3], vertices[i]) for i in (0, 1, 4)]
+    graph = CSRGraph(vertices=vertices, edges=edges)
+    assert list(degree_order(graph)) == [3, 0, 1, 4, 2]
+    assert list(bfs_order(graph)) == [0, 3, 1, 4, 2]
+    # the isolated vertex has the least degree: first visited, last once reversed
+    assert list(reverse_cuthill_mckee_order(graph)) == [4, 1, 3, 0, 2]
+    with pytest.raises(ValueError):
+        reorder(graph, method='random')
+
+
+def test_reorder_keeps_attributes_and_keys():
+    schema = GraphSchema(edge_attributes=('weight', 'capacity'))
+    vertices = [Vertex() for i in range(6)]
+    keyed = Graph(vertices=vertices, directed=False, keys=list('abcdef'), schema=schema,
+                  edges=[schema.Edge(vertices[i], vertices[i + 1], weight=i + 1, capacity=10 * i)
+                         for i in range(5)])
+    new_graph, new_ids = reorder(keyed, method='degree')
+    assert new_graph.schema is schema
+    assert new_graph.vertex(new_graph.key_id('c')) is vertices[2]
+    edgenode = next(e for e in new_graph.adjacency_lists[vertices[2]].edgenodes if e.tail is vertices[3])
+    assert (edgenode.weight, edgenode.capacity) == (3, 20)
+    # the edges are copies
+    edgenode.weight = 0
+    assert next(e for e in keyed.adjacency_lists[vertices[2]].edgenodes if e.tail is vertices[3]).weight == 3
+    new_graph.remove_vertex(new_graph.vertex(0))
+    assert new_graph.vertex(new_graph.key_id('c')) is vertices[2]
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+def test_reorder_shortest_paths(graph_class):
+    graph, vertices = path_graph(graph_class)
+    new_graph, new_ids = reorder(graph, method='rcm')
+    shortest_paths = run_dijkstra_algorithm(graph=new_graph, source=vertices[0])
+    assert [shortest_paths[v].distance for v in vertices] == [0, 1, 3, 6, 10, 15]
+    traversal = new_graph.bfs(start=vertices[0], materialize=False)
+    # results by new id map back to the old ids
+    old_order = [graph.vertex_id(new_graph.vertex(i)) for i in traversal.order]
+    assert [new_ids[i] for i in old_order] == list(traversal.order)
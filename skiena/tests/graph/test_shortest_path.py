@@ -216,3 +216,20 @@ def test_network_flow():
     graph = Graph(vertices=vertices, edges=edges, directed=False)
     flow, graph = find_network_flow(graph=graph, source=vertices[0], sink=vertices[6])
     assert flow == 7
+
+
+def test_network_flow_cancelling_flow():
+    # the first augmenting path s-a-b-t has to be partly cancelled
+    s, a, b, c, d, t = vertices = [Vertex() for i in range(6)]
+    edges = [
+        Edge(head=c, tail=b, weight=1),
+        Edge(head=d, tail=t, weight=1),
+        Edge(head=b, tail=t, weight=1),
+        Edge(head=a, tail=b, weight=1),
+        Edge(head=a, tail=d, weight=1),
+        Edge(head=s, tail=a, weight=1),
+        Edge(head=s, tail=c, weight=1),
+    ]
+    graph = Graph(vertices=vertices, edges=edges, directed=True)
+    flow, graph = find_network_flow(graph=graph, source=s, sink=t)
+    assert flow == 2
@@ -0,0 +1,261 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from graph import Vertex, Edge, Graph, CSRGraph, CompressedGraph
+from graph.applications import find_connected_components
+from graph.graph import EdgeType
+from graph.graph import SubgraphView
+from graph.traversal import Traversal, EventType, Path
+from graph.exceptions import PathError
+from graph.shortest_path import run_dijkstra_algorithm
+
+
+def build_edges(vertices):
+    return [
+        Edge(vertices[0], vertices[1]),
+        Edge(vertices[0], vertices[4]),
+        Edge(vertices[1], vertices[2]),
+        Edge(vertices[2], vertices[3]),
+        Edge(vertices[3], vertices[4]),
+    ]
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+def test_traversal(graph_class):
+    vertices = [Vertex() for i in range(6)]
+    graph = graph_class(vertices=vertices, edges=build_edges(vertices), directed=False)
+    parent_edges = graph.parent_edges
+    traversal = graph.bfs(start=vertices[0], materialize=False)
+    assert isinstance(traversal, Traversal)
+    assert graph.parent_edges is parent_edges
+    # neighbours come in adjacency list order, which depends on the graph class
+    assert traversal.order[0] == 0
+    assert set(traversal.order[1:3]) == {1, 4}
+    assert set(traversal.order[3:]) == {2, 3}
+    assert list(traversal.visited) == [1, 1, 1, 1, 1, 0]
+    assert vertices[3] in traversal
+    assert vertices[5] not in traversal
+    assert traversal.parent(vertices[0]) is None
+    assert traversal.parent(vertices[1]) is vertices[0]
+    assert traversal.parent_edgenode(vertices[1]).tail is vertices[1]
+    edge = traversal.parent_edge(vertices[2])
+    assert (edge.head, edge.tail) == (vertices[1], vertices[2])
+    assert traversal.parent_edge(vertices[5]) is None
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+def test_subgraph_view(graph_class):
+    vertices = [Vertex() for i in range(6)]
+    graph = graph_class(vertices=vertices, edges=build_edges(vertices), directed=False)
+    view = graph.bfs(start=vertices[0], materialize=False).subgraph
+    assert isinstance(view, SubgraphView)
+    assert view.nb_vertices == 5
+    assert [v for v in view.adjacency_lists] == vertices[:5]
+    assert vertices[4] in view.adjacency_lists
+    assert vertices[5] not in view.adjacency_lists
+    assert view.adjacency_lists[vertices[0]].degree == 2
+    with pytest.raises(KeyError):
+        view.adjacency_lists[vertices[5]]
+    subgraph = view.materialize()
+    assert isinstance(subgraph, graph_class)
+    assert [v for v in subgraph.adjacency_lists] == vertices[:5]
+    assert subgraph.nb_edges == graph.bfs(start=vertices[0]).nb_edges
+
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph, CompressedGraph])
+def test_induced_view(graph_class):
+    vertices = [Vertex() for i in range(6)]
+    graph = graph_class(vertices=vertices, edges=build_edges(vertices), directed=False)
+    # the cycle 0-1-2-3-4 without 2
+    view = graph.view(vertex_ids=[4, 3, 0, 1])
+    assert [v for v in view.adjacency_lists] == [vertices[4], vertices[3], vertices[0], vertices[1]]
+    assert view.vertex_id(vertices[0]) == 2 and view.vertex(0) is vertices[4]
+    assert view.adjacency_lists[vertices[1]].degree == 1
+    assert view.nb_edges == 6
+    traversal = view.bfs(start=vertices[3], materialize=False)
+    assert [view.vertex(i) for i in traversal.order] == [vertices[3], vertices[4], vertices[0], vertices[1]]
+    assert len(find_connected_components(graph=view)) == 1
+    path = view.find_path(start=vertices[3], end=vertices[1], traversal=traversal)
+    assert path.nb_vertices == 4
+    subgraph = view.materialize()
+    assert type(subgraph) is graph_class
+    assert subgraph.nb_vertices == 4 and subgraph.nb_edges == 6
+    with pytest.raises(TypeError):
+        view.add_edge(Edge(vertices[0], vertices[3]))
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+@pytest.mark.parametrize('directed', [False, True])
+def test_filtered_view(graph_class, directed):
+    vertices = [Vertex() for i in range(5)]
+    edges = [Edge(vertices[i], vertices[(i + 1) % 5], weight=1.0) for i in range(5)] + \
+        [Edge(vertices[0], vertices[2], weight=10.0), Edge(vertices[2], vertices[4], weight=10.0)]
+    graph = graph_class(vertices=vertices, edges=edges, directed=directed)
+    light = graph.view(is_edge_processable=lambda head, edgenode: edgenode.weight < 5)
+    assert light.vertex_id(vertices[3]) == graph.vertex_id(vertices[3])
+    assert light.nb_edges == graph.nb_edges - (2 if directed else 4)
+    assert run_dijkstra_algorithm(graph=light, source=vertices[0])[vertices[4]].distance == (4.0 if directed else 1.0)
+    assert run_dijkstra_algorithm(graph=graph, source=vertices[0])[vertices[4]].distance == (4.0 if directed else 1.0)
+    assert run_dijkstra_algorithm(graph=light, source=vertices[0])[vertices[3]].distance == (3.0 if directed else 2.0)
+    # views of views, materialized with the class of the viewed graph
+    without_4 = light.view(vertex_ids=[0, 1, 2, 3])
+    assert without_4.adjacency_lists[vertices[3]].degree == (0 if directed else 1)
+    subgraph = without_4.materialize()
+    assert type(subgraph) is graph_class
+    assert subgraph.nb_edges == (3 if directed else 6)
+    assert all(e.weight == 1.0 for v in subgraph.adjacency_lists for e in subgraph.adjacency_lists[v].edgenodes)
+    component = light.bfs(start=vertices[1])
+    assert type(component) is graph_class and component.nb_vertices == 5
+    assert component.nb_edges == light.nb_edges
+
+
+def test_snapshot_view():
+    vertices = [Vertex() for i in range(3)]
+    graph = Graph(vertices=vertices, edges=[Edge(vertices[0], vertices[1]), Edge(vertices[1], vertices[1])])
+    view = graph.snapshot().view(is_edge_processable=lambda head, edgenode: True)
+    graph.add_edge(Edge(vertices[1], vertices[2]))
+    subgraph = view.materialize()
+    # the self-loop is kept once
+    assert type(subgraph) is Graph and subgraph.nb_edges == 4
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+def test_dfs_context(graph_class):
+    vertices = [Vertex() for i in range(4)]
+    edges = [
+        Edge(vertices[0], vertices[1]),
+        Edge(vertices[1], vertices[2]),
+        Edge(vertices[2], vertices[0]),
+        Edge(vertices[0], vertices[3]),
+    ]
+    graph = graph_class(vertices=vertices, edges=edges, directed=True)
+    parent_edges = graph.parent_edges
+    edgetypes = []
+    traversal = graph.traversal()
+
+    def process_edge(head, edgenode):
+        edgetypes.append((head, edgenode.tail, traversal.edgetype))
+
+    assert graph.dfs(start=vertices[0], process_edge=process_edge,
+                     traversal=traversal, materialize=False) is traversal
+    # nothing is written on the graph
+    assert graph.parent_edges is parent_edges
+    assert not any(hasattr(v, 'entry_time') for v in vertices)
+    assert (vertices[2], vertices[0], EdgeType.BACK) in edgetypes
+    assert (vertices[0], vertices[1], EdgeType.TREE) in edgetypes
+    assert traversal.entry_time(vertices[0]) == 0
+    assert traversal.exit_time(vertices[0]) == 7
+    assert traversal.parent(vertices[2]) is vertices[1]
+    path = graph.find_path(start=vertices[0], end=vertices[2], traversal=traversal)
+    assert [v for v in path.adjacency_lists] == vertices[:3]
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+def test_concurrent_traversals(graph_class):
+    nb_vertices = 200
+    vertices = [Vertex() for i in range(nb_vertices)]
+    edges = [Edge(vertices[i], vertices[i + 1]) for i in range(nb_vertices - 1)]
+    graph = graph_class(vertices=vertices, edges=edges, directed=False)
+
+    def run(i):
+        start = vertices[i]
+        if i % 2:
+            traversal = graph.dfs(start=start, materialize=False)
+        else:
+            traversal = graph.bfs(start=start, materialize=False)
+        return [traversal.parent(v) for v in vertices]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(run, range(nb_vertices)))
+    # on a path, the parent of each vertex is its neighbour towards the start
+    for i, parents in enumerate(results):
+        assert parents == vertices[1:i + 1] + [None] + vertices[i:nb_vertices - 1]
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+def test_nested_traversals(graph_class):
+    vertices = [Vertex() for i in range(3)]
+    edges = [Edge(vertices[0], vertices[1]), Edge(vertices[1], vertices[2])]
+    graph = graph_class(vertices=vertices, edges=edges, directed=False)
+    inner = []
+
+    def process_vertex_early(vertex):
+        inner.append(graph.dfs(start=vertex, materialize=False).entry_time(vertices[2]))
+
+    outer = graph.dfs(start=vertices[0], process_vertex_early=process_vertex_early, materialize=False)
+    assert [outer.entry_time(v) for v in vertices] == [0, 1, 2]
+    assert inner == [graph.dfs(start=v, materialize=False).entry_time(vertices[2]) for v in vertices]
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+def test_iter_dfs(graph_class):
+    vertices = [Vertex() for i in range(3)]
+    edges = [
+        Edge(vertices[0], vertices[1]),
+        Edge(vertices[1], vertices[2]),
+        Edge(vertices[2], vertices[0]),
+    ]
+    graph = graph_class(vertices=vertices, edges=edges, directed=True)
+    events = [(e.eventtype, e.vertex, e.edgenode.tail if e.edgenode else None)
+              for e in graph.iter_dfs(start=vertices[0])]
+    assert events == [
+        (EventType.DISCOVER, vertices[0], None),
+        (EventType.TREE_EDGE, vertices[0], vertices[1]),
+        (EventType.DISCOVER, vertices[1], None),
+        (EventType.TREE_EDGE, vertices[1], vertices[2]),
+        (EventType.DISCOVER, vertices[2], None),
+        (EventType.BACK_EDGE, vertices[2], vertices[0]),
+        (EventType.FINISH, vertices[2], None),
+        (EventType.FINISH, vertices[1], None),
+        (EventType.FINISH, vertices[0], None),
+    ]
+    assert [e.eventtype for e in graph.iter_dfs(start=vertices[0], edges=False)] == (
+        [EventType.DISCOVER] * 3 + [EventType.FINISH] * 3)
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+def test_iter_bfs_early_termination(graph_class):
+    vertices = [Vertex() for i in range(5)]
+    edges = [Edge(vertices[i], vertices[i + 1]) for i in range(4)]
+    graph = graph_class(vertices=vertices, edges=edges, directed=False)
+    parent_edges = graph.parent_edges
+    traversal = graph.traversal()
+    for event in graph.iter_bfs(start=vertices[0], traversal=traversal):
+        if event.eventtype is EventType.TREE_EDGE and event.edgenode.tail is vertices[2]:
+            break
+    assert graph.parent_edges is parent_edges
+    assert traversal.parent(vertices[2]) is vertices[1]
+    assert vertices[2] not in traversal
+    assert not traversal.discovered[graph.vertex_id(vertices[3])]
+    events = [e.eventtype for e in graph.iter_bfs(start=vertices[0])]
+    assert events.count(EventType.TREE_EDGE) == 4
+    assert events.count(EventType.NON_TREE_EDGE) == 0
+
+
+@pytest.mark.parametrize('graph_class', [Graph, CSRGraph])
+@pytest.mark.parametrize('directed', [False, True])
+def test_shortest_unweighted_path(graph_class, directed):
+    import random
+    rand = random.Random(2)
+    vertices = [Vertex() for i in range(80)]
+    edges = [Edge(vertices[rand.randrange(80)], vertices[rand.randrange(80)], weight=i) for i in range(160)]
+    graph = graph_class(vertices=vertices, edges=edges, directed=directed)
+    for start in vertices[:10]:
+        traversal = graph.bfs(start=start, materialize=False)
+        depths = {}
+        for vertex_id in traversal.order:
+            parent_id = traversal.parents[vertex_id]
+            depths[vertex_id] = depths[parent_id] + 1 if parent_id >= 0 else 0
+        for end in vertices:
+            if end not in traversal:
+                with pytest.raises(PathError):
+                    graph.shortest_unweighted_path(start=start, end=end)
+                continue
+            path = graph.shortest_unweighted_path(start=start, end=end)
+            assert isinstance(path, Path)
+            assert path.vertices[0] is start and path.vertices[-1] is end
+            assert len(path.edges) == depths[graph.vertex_id(end)]
+            for head, tail, edge in zip(path.vertices, path.vertices[1:], path.edges):
+                assert (edge.head, edge.tail) == (head, tail)
+                assert edge.weight is not None
@@ -1,6 +1,6 @@
 import random
 
-from sorting import radixsort, countsort, bucketsort
+from sorting import radixsort, countsort, countsort_order, bucketsort
 from datastructures import KeyedItem
 
 
@@ -32,6 +32,17 @@ def test_min_countsort():
     assert countsort(items) == sorted_items
 
 
+def test_countsort_order():
+    keys = [3, 1, 3, 0, 1]
+    assert list(countsort_order(keys, nb_values=4)) == [3, 1, 4, 0, 2]
+    # radix sort of (major, minor) pairs: minor pass first, then a stable major pass
+    pairs = [(random.randrange(5), random.randrange(5)) for i in range(100)]
+    order = countsort_order([minor for major, minor in pairs], nb_values=5)
+    order = countsort_order([major for major, minor in pairs], nb_values=5, positions=order)
+    assert [pairs[i] for i in order] == sorted(pairs)
+    assert len(countsort_order([], nb_values=0)) == 0
+
+
 def test_max_countsort():
     sorted_items = [KeyedItem(key=i) for i in range(99, -1, -1)]
     items = [item for item in sorted_items]